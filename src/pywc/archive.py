@@ -0,0 +1,115 @@
+"""Streaming members of tar and zip archives, without extracting them."""
+
+import gzip
+import lzma
+import tarfile
+import zipfile
+import zlib
+from typing import TYPE_CHECKING
+
+from pywc.reader import DEFAULT_BUFFER_SIZE, ReadStrategy
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterator
+    from pathlib import Path
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ZIP_SUFFIXES = (".zip",)
+MEMBER_SEPARATOR = "!/"  # archive.tar!/path/in/archive
+
+# raised by tarfile, zipfile and decompressors for files that are not archives, or are truncated or corrupted
+_FORMAT_ERRORS = (tarfile.TarError, zipfile.BadZipFile, EOFError, zlib.error, lzma.LZMAError, gzip.BadGzipFile)
+
+
+class ArchiveError(Exception):
+    """Raised when a file with an archive name is not a valid archive, or is truncated or corrupted."""
+
+
+def is_archive(file: Path) -> bool:
+    """True if file is a tar or zip archive, judging by its name.
+
+    Args:
+        file (Path): Path of a regular file.
+
+    Returns:
+        bool: True if members of the file can be listed with `iter_members`.
+    """
+    return file.name.lower().endswith(TAR_SUFFIXES + ZIP_SUFFIXES)
+
+
+def member_name(archive: Path, member: str) -> str:
+    """Name reported for a member of an archive, like `archive.tar!/path/in/archive`.
+
+    Args:
+        archive (Path): Path of the archive.
+        member (str): Path of the member inside the archive.
+
+    Returns:
+        str: Archive path and member path joined by `MEMBER_SEPARATOR`.
+    """
+    return f"{archive}{MEMBER_SEPARATOR}{member.lstrip('/')}"
+
+
+def iter_members(
+    archive: Path, *, reader: ReadStrategy | None = None
+) -> Generator[tuple[str, Generator[bytes | memoryview, None, None]], None, None]:
+    """Yield regular file members of an archive with chunks of their decompressed contents.
+
+    Tar archives, compressed or not, are read once from start to end as a stream, so chunks of a member
+    are only valid until the next member is requested. Zip members are read in the order they are stored.
+    Errors of an invalid archive are raised as `ArchiveError`, also while chunks of a member are read.
+
+    Args:
+        archive (Path): Path of a tar or zip archive, see `is_archive`.
+        reader (ReadStrategy | None): How member streams are read, default `ReadStrategy` if None.
+
+    Yields:
+        tuple[str, Generator[bytes | memoryview, None, None]]: Name of the member from `member_name`, and its chunks.
+
+    Raises:
+        ArchiveError: Archive is not a valid tar or zip archive, as its name says, or it is truncated.
+    """
+    reader = reader or ReadStrategy()
+    buffer_size = reader.buffer_size or DEFAULT_BUFFER_SIZE
+    try:
+        if archive.name.lower().endswith(ZIP_SUFFIXES):
+            with zipfile.ZipFile(archive) as zf:
+                for info in sorted(zf.infolist(), key=lambda i: i.header_offset):
+                    if info.is_dir():
+                        continue
+                    with zf.open(info) as stream:
+                        chunks = reader.stream_chunks(stream, buffer_size)
+                        yield member_name(archive, info.filename), _checked(archive, chunks)
+        else:
+            # "r|*" reads a stream with any compression, without seeking back
+            with tarfile.open(archive, mode="r|*", bufsize=buffer_size) as tf:
+                for member in tf:
+                    stream = tf.extractfile(member) if member.isfile() else None
+                    if stream is None:
+                        continue
+                    with stream:
+                        chunks = reader.stream_chunks(stream, buffer_size)
+                        yield member_name(archive, member.name), _checked(archive, chunks)
+    except _FORMAT_ERRORS as e:
+        msg = f"{archive} is not a valid archive: {e}"
+        raise ArchiveError(msg) from e
+
+
+def _checked(archive: Path, chunks: Iterator[bytes | memoryview]) -> Generator[bytes | memoryview, None, None]:
+    """Pass chunks of a member through, raising errors of the archive as `ArchiveError`.
+
+    Args:
+        archive (Path): Archive containing the member.
+        chunks (Iterator[bytes | memoryview]): Chunks of the member.
+
+    Yields:
+        bytes | memoryview: Same chunks.
+
+    Raises:
+        ArchiveError: Member cannot be decompressed, or the archive ends within it.
+    """
+    try:
+        yield from chunks
+    except _FORMAT_ERRORS as e:
+        msg = f"{archive} is not a valid archive: {e}"
+        raise ArchiveError(msg) from e
@@ -0,0 +1,150 @@
+"""Saving progress of long runs, so that an interrupted run can be resumed."""
+
+import json
+import os
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pywc.data import FileStats
+
+if TYPE_CHECKING:
+    from typing import Self
+
+CHECKPOINT_VERSION = 1
+DEFAULT_INTERVAL = 30.0  # seconds between saves
+
+
+class Checkpoint:
+    """Completed-path frontier and running totals of a run, saved to a file periodically.
+
+    Paths are marked done in traversal order. Once a directory is done, its descendants are replaced
+    by the directory itself, so the frontier only holds the completed parts of directories being traversed,
+    and a resumed run skips finished subtrees without listing them.
+    Paths are stored as given on the command line, so a run has to be resumed from the same working directory.
+    A new checkpoint is empty, and nothing is saved until the first save.
+
+    Args:
+        file (Path): File the checkpoint is saved to.
+        interval (float): Minimum time between periodic saves, in seconds, `DEFAULT_INTERVAL` by default.
+
+    Attributes:
+        file (Path): File the checkpoint is saved to.
+        interval (float): Minimum time between periodic saves, in seconds.
+        total (FileStats): Aggregated statistics of every file marked done.
+        groups (dict[str, FileStats]): Group totals of files marked done, kept up to date by whoever groups them.
+        done (dict[Path, None]): Completed paths, in the order they were marked done.
+    """
+
+    file: Path
+    interval: float
+    total: FileStats
+    groups: dict[str, FileStats]
+    done: dict[Path, None]
+
+    def __init__(self, file: Path, *, interval: float = DEFAULT_INTERVAL) -> None:  # noqa: D107
+        self.file = file
+        self.interval = interval
+        self.total = FileStats()
+        self.groups = {}
+        self.done = {}
+        # loaded paths by each of their ancestors, they are not necessarily at the end of `done`
+        self._resumed: dict[Path, list[Path]] = {}
+        self._saved_at = time.monotonic()
+
+    @classmethod
+    def load(cls, file: Path, *, interval: float = DEFAULT_INTERVAL) -> Self:
+        """Load checkpoint saved by a previous run, or start an empty one if the file does not exist.
+
+        Args:
+            file (Path): File the checkpoint was saved to.
+            interval (float): Minimum time between periodic saves, in seconds, `DEFAULT_INTERVAL` by default.
+
+        Returns:
+            Self: Checkpoint continuing the previous run.
+
+        Raises:
+            ValueError: File is not a checkpoint of a compatible version.
+        """
+        checkpoint = cls(file, interval=interval)
+        try:
+            data = json.loads(file.read_bytes())
+        except FileNotFoundError:
+            return checkpoint
+        except ValueError as e:  # JSONDecodeError and UnicodeDecodeError
+            msg = f"{file} is not a valid checkpoint."
+            raise ValueError(msg) from e
+
+        if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+            msg = f"{file} is not a checkpoint of version {CHECKPOINT_VERSION}."
+            raise ValueError(msg)
+        try:
+            checkpoint.total = FileStats(**data["total"])
+            checkpoint.done = dict.fromkeys(Path(p) for p in data["done"])
+            checkpoint.groups = {name: FileStats(**stats) for name, stats in data.get("groups", {}).items()}
+        except (KeyError, TypeError, AttributeError) as e:
+            msg = f"{file} is not a valid checkpoint."
+            raise ValueError(msg) from e
+        for p in checkpoint.done:
+            for parent in p.parents:
+                checkpoint._resumed.setdefault(parent, []).append(p)
+        return checkpoint
+
+    def is_done(self, path: Path) -> bool:
+        """True if the file or whole directory was already counted.
+
+        Args:
+            path (Path): Path of file or directory.
+
+        Returns:
+            bool: True if the path can be skipped.
+        """
+        return path in self.done
+
+    def file_done(self, path: Path, stats: FileStats) -> None:
+        """Add statistics of a counted file to totals and mark it done, saving if the interval has passed.
+
+        Args:
+            path (Path): Path of the counted file.
+            stats (FileStats): Statistics of the file.
+        """
+        self.total += stats
+        self.done[path] = None
+        self._save_periodically()
+
+    def directory_done(self, path: Path) -> None:
+        """Replace descendants of a completely traversed directory with the directory itself.
+
+        Args:
+            path (Path): Path of the directory, after all its files were marked done.
+        """
+        # descendants marked done in this run are at the end, because traversal is depth-first
+        while self.done and next(reversed(self.done)).is_relative_to(path):
+            self.done.popitem()
+        for p in self._resumed.pop(path, []):  # lists of its descendants go stale, but it is not traversed again
+            self.done.pop(p, None)
+
+        self.done[path] = None
+        self._save_periodically()
+
+    def save(self) -> None:
+        """Write checkpoint atomically, so that an interruption leaves either the old or the new checkpoint."""
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "total": asdict(self.total),
+            "done": [str(p) for p in self.done],
+            "groups": {name: asdict(stats) for name, stats in self.groups.items()},
+        }
+        tmp = self.file.with_name(f".{self.file.name}.tmp")
+        with tmp.open("w") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        tmp.replace(self.file)
+        self._saved_at = time.monotonic()
+
+    def _save_periodically(self) -> None:
+        """Save if the interval has passed since the last save."""
+        if time.monotonic() - self._saved_at >= self.interval:
+            self.save()
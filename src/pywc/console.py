@@ -1,25 +1,136 @@
 """Command-lines interface."""
 
+import contextlib
+import sys
 from importlib.metadata import version
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import click
 
+from pywc.checkpoint import DEFAULT_INTERVAL, Checkpoint
 from pywc.data import CounterFlags, FileStats
-from pywc.format import format_automatic, formatter_wrapper_print
+from pywc.estimate import estimate_paths
+from pywc.format import (
+    format_automatic,
+    format_estimate,
+    format_histogram,
+    format_margins,
+    format_table,
+    formatter_wrapper_print,
+)
+from pywc.group import GROUP_BY, GroupTotals, group_key
+from pywc.limits import LimitExceededError, Limits
+from pywc.metrics import RunMetrics
 from pywc.navigation import process_path
+from pywc.parallel import effective_workers, gil_enabled
+from pywc.reader import DEFAULT_BUFFER_SIZE, ReadStrategy
+from pywc.shard import Partial, PartialWriter, Shard, check_shards, merge_records
+from pywc.store import COLUMNS, ResultStore
+from pywc.tokenizer import ENGINES, AsciiTokenizer, tokenizer_factory
+from pywc.watch import Watcher
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
+    from pywc.archive import ArchiveError
+    from pywc.format import FormatterT
+    from pywc.tokenizer import TokenizerFactoryT
+
+_SUBCOMMAND = "pywc.subcommand"  # context meta key of the subcommand chosen instead of counting
+
+
+class _CommandWithSubcommands(click.Command):
+    """Command that runs one of its subcommands instead, when the first argument is a subcommand name.
+
+    Unlike `click.Group`, the command itself takes arguments, so `pywc PATHS` keeps working next to `pywc merge`.
+
+    Args:
+        *args (Any): Positional arguments of `click.Command`.
+        subcommands (dict[str, click.Command]): Subcommands by name.
+        **kwargs (Any): Keyword arguments of `click.Command`.
+    """
+
+    def __init__(self, *args: Any, subcommands: dict[str, click.Command], **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        self.subcommands = subcommands
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if args and args[0] in self.subcommands:
+            ctx.meta[_SUBCOMMAND] = args[0], args[1:]
+            return []
+        return super().parse_args(ctx, args)
+
+    def invoke(self, ctx: click.Context) -> Any:  # noqa: ANN401
+        if _SUBCOMMAND not in ctx.meta:
+            return super().invoke(ctx)
+        name, args = ctx.meta[_SUBCOMMAND]
+        command = self.subcommands[name]
+        with command.make_context(f"{ctx.info_name} {name}", args, parent=ctx) as sub_ctx:
+            return command.invoke(sub_ctx)
+
 
 @click.command()
+@click.option("-c", "--bytes", "byte_count", is_flag=True, help="Count bytes")
+@click.option("-m", "--characters", "chars", is_flag=True, help="Count characters")
+@click.option("-w", "--words", "words", is_flag=True, help="Count words")
+@click.option("-l", "--lines", "lines", is_flag=True, help="Count lines")
+@click.option("-L", "--max-line-length", "max_line_length", is_flag=True, help="Print length of the longest line")
+@click.option("--line-histogram", "histogram", is_flag=True, help="Print histogram of line lengths of the total")
+@click.option("-q", "--quiet", "quiet", is_flag=True, help="Print only the total, without a line per file")
+@click.argument(
+    "partials",
+    nargs=-1,
+    required=True,
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+def merge(  # noqa: PLR0913
+    partials: Iterable[Path],
+    *,
+    byte_count: bool,
+    chars: bool,
+    words: bool,
+    lines: bool,
+    max_line_length: bool,
+    histogram: bool,
+    quiet: bool,
+) -> None:
+    """Combine partial results of sharded runs into the output of a single run.
+
+    PARTIALS are files written with --emit-partial, one for every shard of the run.
+    """  # noqa: DOC101, DOC103, DOC501, DOC503
+    flags = _counter_flags(
+        byte_count=byte_count,
+        lines=lines,
+        chars=chars,
+        words=words,
+        max_line_length=max_line_length,
+        histogram=histogram,
+    )
+    try:
+        loaded = [Partial.load(file) for file in partials]
+        check_shards(loaded)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="PARTIALS") from e
+
+    formatter = formatter_wrapper_print(format_automatic)
+    if not quiet:
+        for name, stats in merge_records(loaded):
+            formatter(stats, flags, name)
+    total = sum((partial.total for partial in loaded), FileStats())
+    complete = all(partial.complete for partial in loaded)
+    _print_totals(total, flags, formatter, complete=complete, groups=None)
+
+
+@click.command(cls=_CommandWithSubcommands, subcommands={"merge": merge})
 @click.version_option(version=version("pywc_hypermodern"))
 @click.option("-c", "--bytes", "byte_count", is_flag=True, help="Count bytes")
 @click.option("-m", "--characters", "chars", is_flag=True, help="Count characters")
 @click.option("-w", "--words", "words", is_flag=True, help="Count words")
 @click.option("-l", "--lines", "lines", is_flag=True, help="Count lines")
+@click.option("-L", "--max-line-length", "max_line_length", is_flag=True, help="Print length of the longest line")
+@click.option("--line-histogram", "histogram", is_flag=True, help="Print histogram of line lengths of the total")
+@click.option("-q", "--quiet", "quiet", is_flag=True, help="Print only totals, without a line per file")
 @click.option(
     "--ignore-extension",
     "ignored_extensions",
@@ -41,53 +152,726 @@ if TYPE_CHECKING:
     type=str,
     help="List of regexps to ignore",
 )
+@click.option(
+    "--respect-gitignore",
+    "respect_gitignore",
+    is_flag=True,
+    help="Skip files and directories ignored by .gitignore and .ignore files, and .git directories",
+)
+@click.option(
+    "--archives",
+    "archives",
+    is_flag=True,
+    help="Count members of tar and zip archives without extracting them, reported as archive.tar!/member",
+)
+@click.option(
+    "--estimate",
+    "estimate",
+    is_flag=True,
+    help="Estimate totals with confidence intervals from a random sample of byte ranges",
+)
+@click.option(
+    "--budget-seconds",
+    "time_budget",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Time budget for --estimate sampling, in seconds",
+)
+@click.option(
+    "--budget-bytes",
+    "byte_budget",
+    type=click.IntRange(min=0),
+    default=None,
+    help="I/O budget for --estimate sampling, in bytes",
+)
+@click.option(
+    "--confidence",
+    "confidence",
+    type=click.FloatRange(0, 1, min_open=True, max_open=True),
+    default=0.95,
+    show_default=True,
+    help="Confidence level of --estimate intervals",
+)
+@click.option(
+    "--seed",
+    "seed",
+    type=int,
+    default=None,
+    help="Random seed for reproducible --estimate results",
+)
+@click.option(
+    "--buffer-size",
+    "buffer_size",
+    type=str,
+    default=str(DEFAULT_BUFFER_SIZE),
+    show_default=True,
+    callback=lambda _ctx, _param, value: _parse_buffer_size(value),
+    help="Size of a single read in bytes, or 'auto' to tune it from file system block size",
+)
+@click.option(
+    "--buffer-reuse/--no-buffer-reuse",
+    "reuse_buffer",
+    default=True,
+    show_default=True,
+    help="Read into one preallocated buffer instead of allocating new bytes per read",
+)
+@click.option(
+    "--fadvise-sequential",
+    "sequential",
+    is_flag=True,
+    help="Advise the kernel that files are read sequentially",
+)
+@click.option(
+    "--direct-io",
+    "direct",
+    is_flag=True,
+    help="Bypass the page cache with O_DIRECT where supported",
+)
+@click.option(
+    "--tokenizer",
+    "engine",
+    type=click.Choice(ENGINES),
+    default=None,
+    help="Word boundary engine: 'ascii' splits UTF-8 on ASCII whitespace, 'unicode' decodes text "
+    "and splits on Unicode whitespace  [default: ascii for UTF-8, unicode otherwise]",
+)
+@click.option(
+    "--encoding",
+    "encoding",
+    type=str,
+    default="utf-8",
+    show_default=True,
+    help="Text encoding of counted files",
+)
+@click.option(
+    "--watch",
+    "watch",
+    is_flag=True,
+    help="Keep running, re-count changed files and print updated totals until interrupted",
+)
+@click.option(
+    "--interval",
+    "interval",
+    type=click.FloatRange(min=0),
+    default=2.0,
+    show_default=True,
+    help="Pause between --watch polls, in seconds",
+)
+@click.option(
+    "--max-files",
+    "max_files",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Stop after counting this many files, printing partial totals",
+)
+@click.option(
+    "--max-bytes",
+    "max_bytes",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Stop before reading more than this many bytes, printing partial totals",
+)
+@click.option(
+    "--timeout",
+    "timeout",
+    type=click.FloatRange(min=0),
+    default=None,
+    help="Stop after this many seconds, printing partial totals",
+)
+@click.option(
+    "--max-open-files",
+    "max_open_files",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Maximum number of files open at once",
+)
+@click.option(
+    "--checkpoint",
+    "checkpoint_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Periodically save completed paths and running totals to this file",
+)
+@click.option(
+    "--resume",
+    "resume",
+    is_flag=True,
+    help="Continue the run saved in --checkpoint, skipping paths it completed",
+)
+@click.option(
+    "--checkpoint-interval",
+    "checkpoint_interval",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_INTERVAL,
+    show_default=True,
+    help="Minimum time between checkpoint saves, in seconds",
+)
+@click.option(
+    "--group-by",
+    "group_by",
+    type=click.Choice(GROUP_BY),
+    default=None,
+    help="Print totals per extension, top-level directory or glob pattern group, counted in the same pass",
+)
+@click.option(
+    "--group-map",
+    "group_map",
+    multiple=True,
+    type=str,
+    callback=lambda _ctx, _param, value: _parse_group_map(value),
+    help="PATTERN=GROUP entry of --group-by glob-map, first matching pattern wins  [default: common languages]",
+)
+@click.option(
+    "--shard",
+    "shard",
+    type=str,
+    default=None,
+    callback=lambda _ctx, _param, value: _parse_shard(value),
+    help="Count only shard K of N, files are split between shards by a hash of their path",
+)
+@click.option(
+    "--emit-partial",
+    "partial_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write totals and per-file records of this run to a file for 'pywc merge'",
+)
+@click.option(
+    "--sort-by",
+    "sort_by",
+    type=click.Choice(COLUMNS),
+    default=None,
+    help="Print files after counting all of them, largest first by this count",
+)
+@click.option(
+    "--top",
+    "top",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Print only this many files, largest by --sort-by  [default: bytes]",
+)
+@click.option(
+    "--metrics-file",
+    "metrics_file",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write OpenMetrics counters and timings of the run to this file when it ends, e.g. for the node exporter "
+    "textfile collector",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    "workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of threads counting files, used only on free-threaded Python builds with the GIL disabled",
+)
 @click.argument(
     "paths",
     nargs=-1,
     type=click.Path(exists=True),
 )
 def main(  # noqa: PLR0913
-    paths: Iterable[Path],
+    paths: Iterable[str],
     *,
     byte_count: bool,
     chars: bool,
     words: bool,
     lines: bool,
+    max_line_length: bool,
+    histogram: bool,
+    quiet: bool,
     ignored_extensions: Iterable[str],
     ignored_names: Iterable[str],
     ignored_regexps: Iterable[str],
+    respect_gitignore: bool,
+    archives: bool,
+    estimate: bool,
+    time_budget: float | None,
+    byte_budget: int | None,
+    confidence: float,
+    seed: int | None,
+    buffer_size: int | None,
+    reuse_buffer: bool,
+    sequential: bool,
+    direct: bool,
+    engine: str | None,
+    encoding: str,
+    watch: bool,
+    interval: float,
+    max_files: int | None,
+    max_bytes: int | None,
+    timeout: float | None,
+    max_open_files: int | None,
+    checkpoint_file: Path | None,
+    resume: bool,
+    checkpoint_interval: float,
+    group_by: str | None,
+    group_map: dict[str, str] | None,
+    shard: Shard | None,
+    partial_file: Path | None,
+    sort_by: str | None,
+    top: int | None,
+    metrics_file: Path | None,
+    workers: int,
 ) -> None:
     """Python version of wc command with limited functionality.
 
     Prints wc information of files and directories (recursively) specified in PATHS.
-    """  # noqa: DOC101, DOC103
-    # default mode when no flags are chosen
-    if not (byte_count or lines or chars or words):
-        chars = words = lines = True
-    flags = CounterFlags(bytes=byte_count, lines=lines, chars=chars, words=words)
+    Partial results of sharded runs are combined with 'pywc merge PARTIALS'.
+    """  # noqa: DOC101, DOC103, DOC501, DOC503
+    flags = _counter_flags(
+        byte_count=byte_count,
+        lines=lines,
+        chars=chars,
+        words=words,
+        max_line_length=max_line_length,
+        histogram=histogram,
+    )
 
+    reader = ReadStrategy(buffer_size=buffer_size, reuse_buffer=reuse_buffer, sequential=sequential, direct=direct)
+    try:
+        tokenizer = tokenizer_factory(engine, encoding)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--tokenizer' / '--encoding'") from e
     formatter = formatter_wrapper_print(format_automatic)
+    ignored_regexps = [*ignored_names, *_reform_extensions(ignored_extensions), *ignored_regexps]
+    _check_compatible(
+        estimate=estimate,
+        watch=watch,
+        resume=resume,
+        partial_file=partial_file,
+        group_by=group_by,
+        counting_only={
+            "'--metrics-file'": metrics_file,
+            "'--max-files'": max_files,
+            "'--max-bytes'": max_bytes,
+            "'--timeout'": timeout,
+            "'--max-open-files'": max_open_files,
+            "'--group-by'": group_by,
+            "'--archives'": archives,
+            "'--shard'": shard,
+            "'--emit-partial'": partial_file,
+            "'--checkpoint'": checkpoint_file,
+            "'--resume'": resume,
+            "'--sort-by'": sort_by,
+            "'--top'": top,
+        },
+    )
+
+    if estimate:
+        _print_estimate(
+            paths,
+            flags,
+            confidence=confidence,
+            tokenizer=tokenizer,
+            ignored_regexps=ignored_regexps,
+            time_budget=time_budget,
+            byte_budget=byte_budget,
+            seed=seed,
+            respect_gitignore=respect_gitignore,
+        )
+        return
+
+    if watch:
+        watcher = Watcher(
+            [Path(p) for p in paths],
+            ignored_regexps=ignored_regexps,
+            reader=reader,
+            tokenizer=tokenizer,
+            respect_gitignore=respect_gitignore,
+            line_lengths=flags.line_lengths,
+            on_error=_print_unreadable,
+        )
+        with contextlib.suppress(KeyboardInterrupt):
+            for updated, _removed in watcher.watch(interval):
+                if not quiet:
+                    for file, stats in updated:
+                        formatter(stats, flags, str(file))
+                formatter(watcher.total, flags, "TOTAL:")
+        return
+
+    checkpoint = _open_checkpoint(checkpoint_file, resume=resume, interval=checkpoint_interval)
+    if workers > 1 and gil_enabled():
+        print("GIL is enabled, counting files on a single thread.", file=sys.stderr)  # noqa: T201
+    groups = None
+    if group_by is not None:
+        groups = GroupTotals(key=group_key(group_by, group_map))
+        if checkpoint:  # shared, so that group totals are saved and resumed with the checkpoint
+            groups.totals = checkpoint.groups
+    _count_paths(
+        paths,
+        flags,
+        formatter,
+        quiet=quiet,
+        checkpoint=checkpoint,
+        groups=groups,
+        partial_file=partial_file,
+        shard=shard,
+        store=ResultStore() if (sort_by or top) and not quiet else None,
+        sort_by=sort_by or "bytes",
+        top=top,
+        metrics_file=metrics_file,
+        ignored_regexps=ignored_regexps,
+        respect_gitignore=respect_gitignore,
+        archives=archives,
+        workers=workers,
+        reader=reader,
+        tokenizer=tokenizer,
+        limits=Limits(max_files=max_files, max_bytes=max_bytes, timeout=timeout, max_open_files=max_open_files),
+    )
+
+
+def _check_compatible(  # noqa: PLR0913
+    *,
+    estimate: bool,
+    watch: bool,
+    resume: bool,
+    partial_file: Path | None,
+    group_by: str | None,
+    counting_only: dict[str, object],
+) -> None:
+    """Reject options that cannot be used together, instead of ignoring some of them.
+
+    Args:
+        estimate (bool): Totals are estimated from samples.
+        watch (bool): Files are watched until interrupted.
+        resume (bool): Interrupted run is resumed from its checkpoint.
+        partial_file (Path | None): File of partial results of a shard.
+        group_by (str | None): Kind of groups totals are printed for.
+        counting_only (dict[str, object]): Options supported only by runs counting every file once, like limits
+            and metrics, by their parameter hint, with values None or False if not given.
+
+    Raises:
+        click.BadParameter: Options cannot be used together.
+    """
+    mode = "'--estimate'" if estimate else "'--watch'" if watch else None
+    given = [hint for hint, value in counting_only.items() if value is not None and value is not False]
+    if mode and given:
+        msg = f"supported only by runs counting every file once, not with {mode}."
+        raise click.BadParameter(msg, param_hint=given[0])
+    if resume and partial_file is not None:
+        msg = "records of a resumed run would not continue the records of the interrupted one."
+        raise click.BadParameter(msg, param_hint="'--emit-partial' / '--resume'")
+    if group_by is not None and partial_file is not None:
+        msg = "group totals are not recorded in partial results, so 'pywc merge' could not print them."
+        raise click.BadParameter(msg, param_hint="'--emit-partial' / '--group-by'")
+
+
+def _counter_flags(  # noqa: PLR0913
+    *,
+    byte_count: bool,
+    lines: bool,
+    chars: bool,
+    words: bool,
+    max_line_length: bool = False,
+    histogram: bool = False,
+) -> CounterFlags:
+    """Flags of chosen counts, lines, words and characters when none are chosen.
+
+    Args:
+        byte_count (bool): Count bytes.
+        lines (bool): Count lines.
+        chars (bool): Count characters.
+        words (bool): Count words.
+        max_line_length (bool): Print length of the longest line.
+        histogram (bool): Print histogram of line lengths of the total.
+
+    Returns:
+        CounterFlags: Flags of the run.
+    """
+    # default mode when no flags are chosen, the longest line alone is printed alone like in GNU wc
+    if not (byte_count or lines or chars or words or max_line_length):
+        chars = words = lines = True
+    return CounterFlags(
+        bytes=byte_count,
+        lines=lines,
+        chars=chars,
+        words=words,
+        max_line_length=max_line_length,
+        histogram=histogram,
+    )
+
+
+def _reform_extensions(ignored_extensions: Iterable[str]) -> list[str]:
+    """Extensions are reformed to *.ext form.
+
+    Args:
+        ignored_extensions (Iterable[str]): Extensions given as ext, .ext or *.ext.
+
+    Returns:
+        list[str]: Glob patterns of the extensions.
+    """
+    ignored_extensions = list(ignored_extensions)
+    return (
+        [f"{ext}" for ext in ignored_extensions if ext.startswith("*.")]
+        + [f"*{ext}" for ext in ignored_extensions if ext.startswith(".")]
+        + [f"*.{ext}" for ext in ignored_extensions if not ext.startswith("*.") and not ext.startswith(".")]
+    )
+
+
+def _print_estimate(
+    paths: Iterable[str],
+    flags: CounterFlags,
+    *,
+    confidence: float,
+    tokenizer: TokenizerFactoryT,
+    **options: Any,  # noqa: ANN401
+) -> None:
+    """Print estimated totals with their margins, as the total if every block was read.
+
+    Args:
+        paths (Iterable[str]): Files and directories to estimate, as given on the command line.
+        flags (CounterFlags): Counts to print.
+        confidence (float): Confidence level of the printed margins.
+        tokenizer (TokenizerFactoryT): Tokenizer chosen on the command line, only the ASCII engine is supported.
+        **options (Any): Passed to `estimate_paths`.
+
+    Raises:
+        click.BadParameter: Line lengths or a tokenizer other than the ASCII engine are requested,
+            as sampled byte ranges do not add up for them.
+    """
+    if flags.line_lengths:
+        msg = "line lengths cannot be estimated from samples."
+        raise click.BadParameter(msg, param_hint="'--estimate'")
+    if tokenizer is not AsciiTokenizer:
+        msg = "only the 'ascii' tokenizer engine with UTF-8 encoding can be estimated from samples."
+        raise click.BadParameter(msg, param_hint="'--estimate' / '--tokenizer' / '--encoding'")
+    result = estimate_paths([Path(p) for p in paths], confidence=confidence, **options)
+    print(format_estimate(result, flags, "TOTAL:" if result.exact else "ESTIMATE:"))  # noqa: T201
+    print(format_margins(result, flags, f"±{confidence * 100:g}%:"))  # noqa: T201
+
+
+def _print_unreadable(file: Path, error: OSError) -> None:
+    """Print a file that could not be read, like `_count_paths` does.
+
+    Args:
+        file (Path): Unreadable file.
+        error (OSError): Error raised by reading it.
+    """
+    reason = "Permission denied" if isinstance(error, PermissionError) else error.strerror or str(error)
+    print(f"{file} - {reason}")  # noqa: T201
+
+
+def _print_invalid_archive(_file: Path, error: ArchiveError) -> None:
+    """Report on stderr a file with an archive name that is counted as a plain file.
+
+    Args:
+        _file (Path): File that is not a valid archive, also named by the error.
+        error (ArchiveError): Error raised by reading it as an archive.
+    """
+    print(f"{error}, counted as a plain file", file=sys.stderr)  # noqa: T201
+
+
+def _count_paths(  # noqa: PLR0913
+    paths: Iterable[str],
+    flags: CounterFlags,
+    formatter: FormatterT,
+    *,
+    quiet: bool,
+    checkpoint: Checkpoint | None,
+    groups: GroupTotals | None,
+    partial_file: Path | None,
+    shard: Shard | None,
+    store: ResultStore | None,
+    sort_by: str,
+    top: int | None,
+    metrics_file: Path | None,
+    workers: int,
+    **options: Any,  # noqa: ANN401
+) -> None:
+    """Print statistics of every file unless quiet, group totals and the total, and write metrics of the run.
+
+    Files are printed as they are counted, or collected in `store` and printed sorted once all are counted.
+    With several counting threads, their utilization is printed to stderr.
+
+    Args:
+        paths (Iterable[str]): Files and directories given on the command line.
+        flags (CounterFlags): Counts to print.
+        formatter (FormatterT): Prints one line of statistics.
+        quiet (bool): Print only totals.
+        checkpoint (Checkpoint | None): Checkpoint saved during the run and at its end, resumed if loaded.
+        groups (GroupTotals | None): Group totals to print, if grouping is chosen.
+        partial_file (Path | None): Partial result of the shard is written to this file, if given.
+        shard (Shard | None): Shard of the run, every file if None.
+        store (ResultStore | None): Collects statistics of files to print them sorted, printed as counted if None.
+        sort_by (str): Column of `store` to sort by.
+        top (int | None): Number of largest files printed from `store`, all of them if None.
+        metrics_file (Path | None): Metrics of the run are written to this file, if given.
+        workers (int): Number of counting threads.
+        **options (Any): Passed to `process_path`.
+    """
+    paths = list(paths)
+    metrics = RunMetrics(workers=effective_workers(workers))
+    # resumed run starts from totals of the interrupted one
+    total = checkpoint.total if checkpoint else FileStats(lines=0, chars=0, words=0, bytes=0)
+    complete = True
+    with contextlib.ExitStack() as stack:
+        partial = None
+        if partial_file is not None:
+            stream = stack.enter_context(partial_file.open("w", encoding="utf-8"))
+            partial = PartialWriter(stream, shard=shard or Shard(1, 1), paths=paths)
+        if checkpoint:  # also on Ctrl-C, so that the run can be resumed
+            stack.callback(checkpoint.save)
+
+        # compute stats for all file(s) / dir(s) passed as input
+        for index, file_or_directory in enumerate(paths):
+            try:
+                total += process_path(
+                    Path(file_or_directory),
+                    flags,
+                    formatter=None if quiet or store is not None else formatter,
+                    checkpoint=checkpoint,
+                    groups=groups,
+                    shard=shard,
+                    record=partial.recorder(index) if partial else None,
+                    store=store,
+                    metrics=metrics,
+                    workers=workers,
+                    on_archive_error=_print_invalid_archive,
+                    **options,
+                )
+            except PermissionError:
+                metrics.permission_errors += 1
+                print(f"{file_or_directory} - Permission denied")  # noqa: T201
+            except LimitExceededError as e:
+                print(f"Stopped early: {e.reason}", file=sys.stderr)  # noqa: T201
+                total += e.partial
+                complete = False
+                break
+
+        if partial:
+            partial.finish(total, complete=complete)
+    with metrics.phase("report"):
+        if store is not None:
+            for index in store.top(sort_by, top) if top else store.argsort(sort_by, reverse=True):
+                formatter(store.stats(index), flags, store.name(index))
+        _print_totals(total, flags, formatter, complete=complete, groups=groups)
+    _finish_metrics(metrics, metrics_file, total, complete=complete)
+
+
+def _finish_metrics(metrics: RunMetrics, metrics_file: Path | None, total: FileStats, *, complete: bool) -> None:
+    """Print utilization of several counting threads to stderr, and write metrics of the run if requested.
+
+    Args:
+        metrics (RunMetrics): Metrics of the run.
+        metrics_file (Path | None): Metrics are written to this file, if given.
+        total (FileStats): Total of the run.
+        complete (bool): False if the run stopped early on a limit.
+    """
+    if metrics.workers > 1:
+        print(f"Worker utilization: {metrics.utilization():.0%} of {metrics.workers} threads", file=sys.stderr)  # noqa: T201
+    if metrics_file is not None:
+        metrics.write(metrics_file, total, complete=complete)
+
+
+def _print_totals(
+    total: FileStats, flags: CounterFlags, formatter: FormatterT, *, complete: bool, groups: GroupTotals | None
+) -> None:
+    """Print group totals, the total and the histogram of line lengths, as chosen in flags.
+
+    Args:
+        total (FileStats): Total of the run.
+        flags (CounterFlags): Counts to print.
+        formatter (FormatterT): Prints one line of statistics.
+        complete (bool): False if the run stopped early, which is marked in the total line.
+        groups (GroupTotals | None): Group totals printed as a table before the total, if given.
+    """
+    if groups is not None:
+        print(format_table(groups.rows(), flags))  # noqa: T201
+    formatter(total, flags, "TOTAL:" if complete else "TOTAL (incomplete):")
+    if flags.histogram:
+        print(format_histogram(total))  # noqa: T201
+
+
+def _open_checkpoint(file: Path | None, *, resume: bool, interval: float) -> Checkpoint | None:
+    """New checkpoint, or the saved one when resuming.
+
+    Args:
+        file (Path | None): Checkpoint file, no checkpoint if None.
+        resume (bool): Load the checkpoint saved by an interrupted run.
+        interval (float): Minimum time between periodic saves, in seconds.
+
+    Returns:
+        Checkpoint | None: Checkpoint of the run, None without a checkpoint file.
+
+    Raises:
+        click.BadParameter: Resuming without a checkpoint file, or the file is not a valid checkpoint.
+    """
+    if file is None:
+        if resume:
+            msg = "--resume requires --checkpoint."
+            raise click.BadParameter(msg, param_hint="'--resume'")
+        return None
+    if not resume:
+        return Checkpoint(file, interval=interval)
+    try:
+        return Checkpoint.load(file, interval=interval)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--checkpoint'") from e
+
+
+def _parse_group_map(entries: Iterable[str]) -> dict[str, str] | None:
+    """Parse the glob map of --group-by glob-map.
+
+    Args:
+        entries (Iterable[str]): Entries in PATTERN=GROUP form.
+
+    Returns:
+        dict[str, str] | None: Group of every pattern, in order, None if there are no entries.
+
+    Raises:
+        click.BadParameter: Entry is not in PATTERN=GROUP form.
+    """
+    glob_map = {}
+    for entry in entries:
+        pattern, sep, group = entry.partition("=")
+        if not (pattern and sep and group):
+            msg = f"{entry!r} is not in PATTERN=GROUP form."
+            raise click.BadParameter(msg)
+        glob_map[pattern] = group
+    return glob_map or None
+
+
+def _parse_shard(value: str | None) -> Shard | None:
+    """Shard is given as K/N, None if not given.
+
+    Args:
+        value (str | None): Value of --shard.
+
+    Returns:
+        Shard | None: Parsed shard.
+
+    Raises:
+        click.BadParameter: Value is not a valid shard.
+    """
+    if value is None:
+        return None
+    try:
+        return Shard.parse(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+def _parse_buffer_size(value: str) -> int | None:
+    """Buffer size is a positive number of bytes, or None for 'auto'.
+
+    Args:
+        value (str): Value of --buffer-size.
+
+    Returns:
+        int | None: Buffer size in bytes, None to auto-tune it for every file.
 
-    total = FileStats(lines=0, chars=0, words=0, bytes=0)
-    # compute stats for all file(s) / dir(s) passed as input
-    for file_or_directory in paths:
-        try:
-            # extensions are reformed to *.ext form
-            ignored_extensions = (
-                [f"{ext}" for ext in ignored_extensions if ext.startswith("*.")]
-                + [f"*{ext}" for ext in ignored_extensions if ext.startswith(".")]
-                + [f"*.{ext}" for ext in ignored_extensions if not ext.startswith("*.") and not ext.startswith(".")]
-            )
-
-            total += process_path(
-                Path(file_or_directory),
-                flags,
-                ignored_regexps=[*ignored_names, *ignored_extensions, *ignored_regexps],
-                formatter=formatter,
-            )
-        except PermissionError:
-            print(f"{file_or_directory} - Permission denied")  # noqa: T201
-    formatter(total, flags, "TOTAL:")
+    Raises:
+        click.BadParameter: Value is neither a positive integer nor 'auto'.
+    """
+    if value == "auto":
+        return None
+    if not value.isdigit() or int(value) <= 0:
+        msg = f"{value!r} is neither a positive integer nor 'auto'."
+        raise click.BadParameter(msg)
+    return int(value)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -1,12 +1,20 @@
 """Counting data in files without path manipulation."""
 
-from dataclasses import dataclass
+import builtins  # noqa: TC003 - `bytes` fields shadow the builtin in annotations of methods, also at runtime
+from dataclasses import dataclass, field
+from itertools import zip_longest
 from typing import TYPE_CHECKING
 
+from pywc.reader import ReadStrategy
+from pywc.tokenizer import AsciiTokenizer, Tokenizer
+
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from pathlib import Path
     from typing import Self
 
+    from pywc.tokenizer import TokenizerFactoryT
+
 
 @dataclass(slots=True, kw_only=True)
 class CounterFlags:
@@ -17,18 +25,29 @@ class CounterFlags:
         words (bool, default=True): If true, words statistics are among the statistics used.
         chars (bool, default=True): If true, characters statistics are among the statistics used.
         bytes (bool, default=True): If true, bytes statistics are among the statistics used.
+        max_line_length (bool, default=False): If true, length of the longest line is among the statistics used.
+        histogram (bool, default=False): If true, histogram of line lengths is among the statistics used.
 
     Attributes:
         lines (bool): If true, lines statistics are among the statistics used.
         words (bool): If true, words statistics are among the statistics used.
         chars (bool): If true, characters statistics are among the statistics used.
         bytes (bool): If true, bytes statistics are among the statistics used.
+        max_line_length (bool): If true, length of the longest line is among the statistics used.
+        histogram (bool): If true, histogram of line lengths is among the statistics used.
     """
 
     lines: bool = True
     words: bool = True
     chars: bool = True
     bytes: bool = True
+    max_line_length: bool = False
+    histogram: bool = False
+
+    @property
+    def line_lengths(self) -> bool:
+        """True if line lengths have to be measured while counting."""
+        return self.max_line_length or self.histogram
 
 
 @dataclass(kw_only=True, slots=True, eq=True)
@@ -40,6 +59,10 @@ class FileStats:
         words (int): Number of words in the file.
         chars (int): Number of characters in the file.
         bytes (int): Number of bytes in the file.
+        max_line_length (int): Length of the longest line in bytes, without the newline, 0 if not measured.
+        histogram (tuple[int, ...]): Number of lines per length bucket, bucket `i` holds lines whose length
+            has `i` bits, that is 0, 1, 2-3, 4-7 and so on, empty if not measured. A last line without newline
+            is included, unlike in `lines`.
 
     Raises:
         ValueError: Some of the arguments are negative or are in descending order.
@@ -49,11 +72,17 @@ class FileStats:
     words: int = 0
     chars: int = 0
     bytes: int = 0
+    max_line_length: int = 0
+    histogram: tuple[int, ...] = ()
 
     def __post_init__(self) -> None:  # noqa: D105
+        self.histogram = tuple(self.histogram)  # list when loaded from JSON
         if self.lines < 0 or self.words < 0 or self.chars < 0 or self.bytes < 0:
             msg = "File statistics must be non-negative."
             raise ValueError(msg)
+        if self.max_line_length < 0 or any(n < 0 for n in self.histogram):
+            msg = "File statistics must be non-negative."
+            raise ValueError(msg)
         if not (self.lines <= self.words <= self.chars <= self.bytes):
             msg = "File statistics must be non-descending order."
             raise ValueError(msg)
@@ -61,6 +90,8 @@ class FileStats:
     def __add__(self, other: Self) -> Self:
         """Calculate total of 2 FileStats objects by adding respective fields.
 
+        The longest line is the longer of the two, histograms are added bucket by bucket.
+
         Args:
             other (Self): FileStats instance to add.
 
@@ -72,49 +103,194 @@ class FileStats:
             words=self.words + other.words,
             chars=self.chars + other.chars,
             bytes=self.bytes + other.bytes,
+            max_line_length=max(self.max_line_length, other.max_line_length),
+            histogram=tuple(a + b for a, b in zip_longest(self.histogram, other.histogram, fillvalue=0)),
+        )
+
+    def __sub__(self, other: Self) -> Self:
+        """Calculate difference of 2 FileStats objects by subtracting respective fields.
+
+        The longest line cannot be subtracted, so it is kept as an upper bound.
+
+        Args:
+            other (Self): FileStats instance to subtract, usually a part of this total.
+
+        Returns:
+            Self: new FileStats instance.
+        """
+        histogram = [a - b for a, b in zip_longest(self.histogram, other.histogram, fillvalue=0)]
+        while histogram and not histogram[-1]:
+            histogram.pop()
+        return type(self)(
+            lines=self.lines - other.lines,
+            words=self.words - other.words,
+            chars=self.chars - other.chars,
+            bytes=self.bytes - other.bytes,
+            max_line_length=self.max_line_length,
+            histogram=tuple(histogram),
         )
 
     @classmethod
-    def from_file(cls, file: Path) -> Self:
+    def from_file(
+        cls,
+        file: Path,
+        *,
+        reader: ReadStrategy | None = None,
+        tokenizer: TokenizerFactoryT | None = None,
+        line_lengths: bool = False,
+    ) -> Self:
         """Generate stats for a single file.
 
         Args:
             file(Path): Path to the file.
+            reader(ReadStrategy | None): How the file is read, 64 KB chunks into a reused buffer by default.
+            tokenizer(TokenizerFactoryT | None): Creates tokenizer for the file, UTF-8 with ASCII whitespace by default.
+            line_lengths(bool): Also measure the longest line and the histogram of line lengths.
 
         Returns:
             Self: new FileStats instance.
         """
-        chunk_size = 2**16  # 64 KB
-        lines, words, chars, bytes_read = 0, 0, 0, 0
-        in_word = False
-
-        with file.open("br") as f:
-            # In case the file is too big to read into memory, only process a chunk at a time
-            while chunk := f.read(chunk_size):
-                if not chunk:
-                    break
-                text = chunk.decode("utf-8", errors="ignore")
-
-                bytes_read += len(chunk)
-                chars += len(text)
-
-                for b in chunk:
-                    if b == ord("\n"):
-                        lines += 1
-                    if chr(b).isspace():
-                        if in_word:
-                            words += 1
-                            in_word = False
-                    else:
-                        in_word = True
-
-        # Count last word
-        if in_word:
-            words += 1
+        # In case the file is too big to read into memory, only process a chunk at a time
+        return cls.from_chunks((reader or ReadStrategy()).chunks(file), tokenizer=tokenizer, line_lengths=line_lengths)
+
+    @classmethod
+    def from_chunks(
+        cls,
+        chunks: Iterable[builtins.bytes | memoryview],
+        *,
+        tokenizer: TokenizerFactoryT | None = None,
+        line_lengths: bool = False,
+    ) -> Self:
+        """Generate stats for a single stream, read in consecutive chunks.
+
+        Args:
+            chunks(Iterable[builtins.bytes | memoryview]): Consecutive chunks of the stream.
+            tokenizer(TokenizerFactoryT | None): Creates tokenizer for the stream, ASCII whitespace in UTF-8 by default.
+            line_lengths(bool): Also measure the longest line and the histogram of line lengths, in the same pass.
 
+        Returns:
+            Self: new FileStats instance.
+        """
+        counter = StatsCounter(line_lengths=line_lengths)
+        if tokenizer:
+            counter.tokenizer = tokenizer()
+        for chunk in chunks:
+            counter.feed(chunk)
+
+        max_line_length, histogram = counter.line_stats()
         return cls(
-            lines=lines,
-            words=words,
-            chars=chars,
-            bytes=bytes_read,
+            lines=counter.lines,
+            words=counter.words,
+            chars=counter.chars,
+            bytes=counter.bytes,
+            max_line_length=max_line_length,
+            histogram=histogram,
+        )
+
+
+@dataclass(slots=True, kw_only=True)
+class StatsCounter:
+    """Incremental counter, fed with consecutive chunks of one byte stream.
+
+    Words are counted by their first byte, so counters of adjacent byte ranges add up to the statistics
+    of the whole stream, provided `in_word` is seeded with the state of the byte preceding the range.
+
+    Args:
+        in_word (bool, default=False): True if the byte preceding the first chunk is part of a word.
+        tokenizer (Tokenizer, default=AsciiTokenizer()): Tokenizer of this stream, not shared with other streams.
+        line_lengths (bool, default=False): Also measure lengths of lines, by finding newlines in every chunk.
+
+    Attributes:
+        lines (int): Number of lines fed so far.
+        words (int): Number of words started so far.
+        chars (int): Number of characters fed so far, as decided by the tokenizer.
+        bytes (int): Number of bytes fed so far.
+        in_word (bool): True if the last byte fed is part of a word.
+        tokenizer (Tokenizer): Tokenizer of this stream.
+        line_lengths (bool): True if lengths of lines are measured.
+        max_line_length (int): Length of the longest line terminated so far.
+        histogram (list[int]): Number of lines terminated so far per length bucket, see `FileStats.histogram`.
+        line_length (int): Length of the last line fed, not terminated yet.
+    """
+
+    lines: int = 0
+    words: int = 0
+    chars: int = 0
+    bytes: int = 0
+    in_word: bool = False
+    tokenizer: Tokenizer = field(default_factory=AsciiTokenizer, repr=False)
+    line_lengths: bool = False
+    max_line_length: int = 0
+    histogram: list[int] = field(default_factory=list)
+    line_length: int = 0
+
+    def feed(self, chunk: builtins.bytes | memoryview) -> None:
+        """Update counts with the next chunk of the stream.
+
+        Args:
+            chunk (builtins.bytes | memoryview): Next consecutive chunk of the stream.
+        """
+        lines, words, chars, self.in_word = self.tokenizer.count(chunk, in_word=self.in_word)
+        self.lines += lines
+        self.words += words
+        self.chars += chars
+        self.bytes += len(chunk)
+        if self.line_lengths:
+            self._feed_line_lengths(chunk)
+
+    def line_stats(self) -> tuple[int, tuple[int, ...]]:
+        """Longest line and histogram of line lengths fed so far, including the last line if it is not terminated.
+
+        Returns:
+            tuple[int, tuple[int, ...]]: Longest line and histogram, see `FileStats`.
+        """
+        histogram = list(self.histogram)
+        if self.line_length:
+            _add_line(histogram, self.line_length)
+        return max(self.max_line_length, self.line_length), tuple(histogram)
+
+    def stats(self) -> FileStats:
+        """Statistics of the stream fed so far.
+
+        Returns:
+            FileStats: new FileStats instance.
+        """
+        max_line_length, histogram = self.line_stats()
+        return FileStats(
+            lines=self.lines,
+            words=self.words,
+            chars=self.chars,
+            bytes=self.bytes,
+            max_line_length=max_line_length,
+            histogram=histogram,
         )
+
+    def _feed_line_lengths(self, chunk: builtins.bytes | memoryview) -> None:
+        """Measure lines terminated in the chunk, one `bytes.find` per line, so no Python code runs per byte.
+
+        Args:
+            chunk (builtins.bytes | memoryview): Next consecutive chunk of the stream.
+        """
+        data = bytes(chunk)
+        start, length = 0, self.line_length
+        end = data.find(b"\n")
+        while end != -1:
+            length += end - start
+            self.max_line_length = max(self.max_line_length, length)
+            _add_line(self.histogram, length)
+            start, length = end + 1, 0
+            end = data.find(b"\n", start)
+        self.line_length = length + len(data) - start
+
+
+def _add_line(histogram: list[int], length: int) -> None:
+    """Count a line of the given length in its histogram bucket.
+
+    Args:
+        histogram (list[int]): Histogram of line lengths, extended with empty buckets as needed.
+        length (int): Length of the line in bytes.
+    """
+    bucket = length.bit_length()
+    if bucket >= len(histogram):
+        histogram.extend([0] * (bucket + 1 - len(histogram)))
+    histogram[bucket] += 1
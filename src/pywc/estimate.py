@@ -0,0 +1,206 @@
+"""Estimating statistics of huge trees from a random sample of byte ranges."""
+
+import math
+import random
+import time
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import TYPE_CHECKING
+
+from pywc.data import StatsCounter
+from pywc.navigation import iter_files
+from pywc.tokenizer import ASCII_WHITESPACE
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+BLOCK_SIZE = 2**16  # 64 KB, same as FileStats.from_file chunks
+MIN_SAMPLES = 2  # required to compute sample variance
+SHUFFLE_LIMIT = 2**20  # populations up to this many blocks are shuffled, larger ones are sampled with rejection
+COUNTS = ("lines", "words", "chars", "bytes")  # estimated counts, in the order they are printed
+
+
+@dataclass(slots=True, kw_only=True)
+class Estimate:
+    """Sampled estimate of aggregated statistics with confidence intervals.
+
+    Counts are estimated independently, so unlike `FileStats` they need not be in non-descending order,
+    a sample of blank lines estimates more lines than words.
+
+    Attributes:
+        counts (dict[str, int]): Point estimate of totals for every name in `COUNTS`, "bytes" is exact
+            and taken from file sizes.
+        margins (dict[str, int]): Half-width of confidence interval for every name in `COUNTS`.
+        confidence (float): Confidence level of the intervals.
+        files (int): Number of files in the population.
+        blocks (int): Number of blocks in the population.
+        sampled_blocks (int): Number of blocks read.
+        sampled_bytes (int): Number of bytes read.
+    """
+
+    counts: dict[str, int] = field(default_factory=lambda: dict.fromkeys(COUNTS, 0))
+    margins: dict[str, int] = field(default_factory=dict)
+    confidence: float = 0.95
+    files: int = 0
+    blocks: int = 0
+    sampled_blocks: int = 0
+    sampled_bytes: int = 0
+
+    @property
+    def exact(self) -> bool:
+        """True if every block was read, so the estimate is the exact value."""
+        return self.sampled_blocks == self.blocks
+
+
+def _block_order(blocks: int, rng: random.Random) -> Iterator[int]:
+    """Yield block indices in random order without repetition.
+
+    Args:
+        blocks (int): Number of blocks in the population.
+        rng (random.Random): Random generator of the estimate.
+
+    Yields:
+        int: Index of the next block to sample.
+    """
+    if blocks <= SHUFFLE_LIMIT:
+        order = list(range(blocks))
+        rng.shuffle(order)
+        yield from order
+        return
+
+    seen: set[int] = set()
+    while len(seen) < blocks:
+        index = rng.randrange(blocks)
+        if index not in seen:
+            seen.add(index)
+            yield index
+
+
+def _count_range(file: Path, offset: int, size: int) -> StatsCounter:
+    """Count statistics of a byte range, so that counters of adjacent ranges are additive.
+
+    Args:
+        file (Path): File containing the range.
+        offset (int): Position of the first byte of the range.
+        size (int): Size of the range, less is counted at the end of the file.
+
+    Returns:
+        StatsCounter: Counts of the range.
+    """
+    counter = StatsCounter()
+    with file.open("br") as f:
+        if offset:
+            # word state is decided by the byte preceding the range
+            f.seek(offset - 1)
+            counter.in_word = f.read(1) not in ASCII_WHITESPACE
+        counter.feed(f.read(size))
+    return counter
+
+
+def estimate_paths(  # noqa: PLR0913
+    paths: Iterable[Path],
+    *,
+    ignored_regexps: Iterable[str] = (),
+    time_budget: float | None = None,
+    byte_budget: int | None = None,
+    confidence: float = 0.95,
+    block_size: int = BLOCK_SIZE,
+    seed: int | None = None,
+    respect_gitignore: bool = False,
+) -> Estimate:
+    """Estimate aggregated statistics of files and directories by reading random blocks.
+
+    Files are listed with the same traversal as `process_path`, and their sizes give the exact byte total.
+    Blocks of `block_size` bytes are drawn uniformly without replacement from all files, so large files
+    are sampled by byte ranges. Totals are scaled with the ratio estimator, and sampling stops when
+    either budget is exhausted or every block has been read.
+
+    Args:
+        paths (Iterable[Path]): Paths of files or directories to estimate.
+        ignored_regexps (Iterable[str]): Regexes to ignore.
+        time_budget (float | None): Maximum time for sampling in seconds, unlimited if None.
+        byte_budget (int | None): Maximum number of bytes to read, unlimited if None.
+        confidence (float): Confidence level of the reported intervals.
+        block_size (int): Size of a sampled byte range.
+        seed (int | None): Seed for the random generator, for reproducible estimates.
+        respect_gitignore (bool): Skip paths ignored by .gitignore and .ignore files, see `iter_files`.
+
+    Returns:
+        Estimate: Estimated totals with confidence intervals.
+    """
+    ignored_regexps = tuple(ignored_regexps)
+    deadline = math.inf if time_budget is None else time.monotonic() + time_budget
+
+    files: list[Path] = []
+    block_starts: list[int] = []
+    total_bytes, blocks = 0, 0
+    for path in paths:
+        for file in iter_files(path, ignored_regexps=ignored_regexps, respect_gitignore=respect_gitignore):
+            size = file.stat().st_size
+            if size:
+                files.append(file)
+                block_starts.append(blocks)
+                total_bytes += size
+                blocks += math.ceil(size / block_size)
+
+    rng = random.Random(seed)  # noqa: S311 - sampling, not cryptography
+    samples: list[tuple[int, int, int, int]] = []  # bytes, lines, words, chars of each block
+    sampled_bytes = 0
+    for index in _block_order(blocks, rng):
+        if len(samples) >= MIN_SAMPLES and (
+            time.monotonic() >= deadline or (byte_budget is not None and sampled_bytes >= byte_budget)
+        ):
+            break
+        file_index = bisect_right(block_starts, index) - 1
+        offset = (index - block_starts[file_index]) * block_size
+        counter = _count_range(files[file_index], offset, block_size)
+        samples.append((counter.bytes, counter.lines, counter.words, counter.chars))
+        sampled_bytes += counter.bytes
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    counts, margins = {}, {}
+    for position, name in enumerate(COUNTS[:-1], start=1):
+        counts[name], margins[name] = _ratio_estimate(samples, position, total_bytes, blocks, z)
+    counts["bytes"], margins["bytes"] = total_bytes, 0
+
+    return Estimate(
+        counts=counts,
+        margins=margins,
+        confidence=confidence,
+        files=len(files),
+        blocks=blocks,
+        sampled_blocks=len(samples),
+        sampled_bytes=sampled_bytes,
+    )
+
+
+def _ratio_estimate(
+    samples: list[tuple[int, int, int, int]], position: int, total_bytes: int, blocks: int, z: float
+) -> tuple[int, int]:
+    """Scale a sampled count by known total bytes and return it with its confidence half-width.
+
+    Args:
+        samples (list[tuple[int, int, int, int]]): Bytes, lines, words and chars of every sampled block.
+        position (int): Position of the estimated count in a sample.
+        total_bytes (int): Exact number of bytes in the population.
+        blocks (int): Number of blocks in the population.
+        z (float): Quantile of the normal distribution for the confidence level.
+
+    Returns:
+        tuple[int, int]: Estimated total and half-width of its confidence interval, 0 if every block was read.
+    """
+    n = len(samples)
+    sampled_bytes = sum(s[0] for s in samples)
+    if not sampled_bytes:
+        return 0, 0
+
+    ratio = sum(s[position] for s in samples) / sampled_bytes
+    estimate = round(ratio * total_bytes)
+    if n == blocks:
+        return estimate, 0
+
+    residuals = sum((s[position] - ratio * s[0]) ** 2 for s in samples) / (n - 1)
+    variance = blocks**2 * (1 - n / blocks) * residuals / n
+    return estimate, math.ceil(z * math.sqrt(variance))
@@ -1,11 +1,19 @@
 """Formatting collected file statistics."""
 
 from collections.abc import Callable
+from typing import TYPE_CHECKING
 
 from pywc.data import CounterFlags, FileStats
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+    from pywc.estimate import Estimate
+
 FormatterT = Callable[[FileStats, CounterFlags, str | None], str]
 
+COLUMNS = {"lines": "lines", "words": "words", "chars": "chars", "bytes": "bytes", "max_line_length": "longest"}
+
 
 def format_automatic(counts: FileStats, flags: CounterFlags, name: str | None = None) -> str:
     """Format printer for stats, non-human readable format w/o dimensions (like Kb).
@@ -16,12 +24,13 @@ def format_automatic(counts: FileStats, flags: CounterFlags, name: str | None =
         name (str | None): name of the file, appended to the beginning if present.
 
     Returns:
-        str: Name, followed by line, word, character and byte counts, according to the flags and name fields.
+        str: Name, followed by line, word, character and byte counts and the longest line,
+        according to the flags and name fields.
 
     Raises:
         ValueError: if all flags are false, so nothing is added to the format string.
     """
-    if not (flags.lines or flags.words or flags.chars or flags.bytes):
+    if not (flags.lines or flags.words or flags.chars or flags.bytes or flags.max_line_length):
         raise ValueError(flags)
     components = []
     if name:
@@ -34,6 +43,8 @@ def format_automatic(counts: FileStats, flags: CounterFlags, name: str | None =
         components.append(f"{counts.chars:7d}")
     if flags.bytes:
         components.append(f"{counts.bytes:7d}")
+    if flags.max_line_length:
+        components.append(f"{counts.max_line_length:7d}")
 
     if name:
         # name could start with a whitespace character, which must be preserved
@@ -41,6 +52,103 @@ def format_automatic(counts: FileStats, flags: CounterFlags, name: str | None =
     return " ".join(components).strip()
 
 
+def format_estimate(estimate: Estimate, flags: CounterFlags, name: str | None = None) -> str:
+    """Format estimated counts, aligned with `format_automatic` columns.
+
+    Arguments:
+        estimate (Estimate): estimated statistics with margins.
+        flags (CounterFlags): which counts should be printed.
+        name (str | None): name of the row, appended to the beginning if present.
+
+    Returns:
+        str: Name, followed by line, word, character and byte estimates, according to the flags and name fields.
+
+    Raises:
+        ValueError: if all flags are false, so nothing is added to the format string.
+    """
+    if not (flags.lines or flags.words or flags.chars or flags.bytes):
+        raise ValueError(flags)
+    return _format_estimate_row({field: str(count) for field, count in estimate.counts.items()}, flags, name)
+
+
+def format_margins(estimate: Estimate, flags: CounterFlags, name: str | None = None) -> str:
+    """Format confidence interval half-widths of an estimate, aligned with `format_automatic` columns.
+
+    Arguments:
+        estimate (Estimate): estimated statistics with margins.
+        flags (CounterFlags): which margins should be printed.
+        name (str | None): name of the row, appended to the beginning if present.
+
+    Returns:
+        str: Name, followed by line, word, character and byte margins, according to the flags and name fields.
+
+    Raises:
+        ValueError: if all flags are false, so nothing is added to the format string.
+    """
+    if not (flags.lines or flags.words or flags.chars or flags.bytes):
+        raise ValueError(flags)
+    return _format_estimate_row({field: f"±{margin}" for field, margin in estimate.margins.items()}, flags, name)
+
+
+def _format_estimate_row(values: Mapping[str, str], flags: CounterFlags, name: str | None) -> str:
+    """Format a row of estimated counts or their margins.
+
+    Arguments:
+        values (Mapping[str, str]): formatted value of every count.
+        flags (CounterFlags): which counts should be printed.
+        name (str | None): name of the row, appended to the beginning if present.
+
+    Returns:
+        str: Name, followed by values right-aligned in the order of `format_automatic` columns.
+    """
+    components = []
+    if name:
+        components.append(f"{name:<20s}")
+    components.extend(f"{values[field]:>7s}" for field in ("lines", "words", "chars", "bytes") if getattr(flags, field))
+    return " ".join(components).rstrip()
+
+
+def format_table(rows: Iterable[tuple[str, FileStats]], flags: CounterFlags, title: str = "group") -> str:
+    """Format named statistics as a table with a header, aligned with `format_automatic` columns.
+
+    Arguments:
+        rows (Iterable[tuple[str, FileStats]]): name and statistics of every row.
+        flags (CounterFlags): which file statistics should be printed.
+        title (str): header of the name column.
+
+    Returns:
+        str: Header line followed by one line per row.
+
+    Raises:
+        ValueError: if all flags are false, so nothing is added to the format string.
+    """
+    if not (flags.lines or flags.words or flags.chars or flags.bytes or flags.max_line_length):
+        raise ValueError(flags)
+    header = " ".join(
+        [f"{title:<20s}", *(f"{column:>7s}" for field, column in COLUMNS.items() if getattr(flags, field))]
+    )
+    return "\n".join([header, *(format_automatic(stats, flags, name) for name, stats in rows)])
+
+
+def format_histogram(counts: FileStats, width: int = 40) -> str:
+    """Format histogram of line lengths with a header, one row per length bucket with a bar.
+
+    Arguments:
+        counts (FileStats): statistics with a measured histogram.
+        width (int): length of the bar of the largest bucket.
+
+    Returns:
+        str: Header line followed by a line per bucket, from the shortest lines up to the longest.
+    """
+    peak = max(counts.histogram, default=0)
+    rows = [f"{'line length':<20s} {'lines':>7s}"]
+    for bucket, n in enumerate(counts.histogram):
+        low, high = (1 << bucket) >> 1, (1 << bucket) - 1
+        bar = "#" * -(-n * width // peak) if peak else ""
+        rows.append(f"{str(low) if low == high else f'{low}-{high}':<20s} {n:7d} {bar}".rstrip())
+    return "\n".join(rows)
+
+
 def formatter_wrapper_print(formatter: FormatterT) -> FormatterT:
     """Add sideeffect of printing to formatter wrapper.
 
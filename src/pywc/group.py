@@ -0,0 +1,143 @@
+"""Aggregating statistics of files into groups, like extensions or languages, in a single pass."""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from pywc.data import FileStats
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+GroupKeyT = Callable[[Path, Path], str]  # processed path and a file under it -> group name
+
+GROUP_BY = ("ext", "dir", "glob-map")
+OTHER_GROUP = "other"  # files not matching any pattern of a glob map
+NO_EXTENSION = "(none)"
+ROOT_GROUP = "."  # files directly in the processed directory, or the processed file itself
+
+# default glob map, grouping common source files by language
+LANGUAGES = {
+    "*.py": "Python",
+    "*.pyi": "Python",
+    "*.c": "C",
+    "*.h": "C",
+    "*.cc": "C++",
+    "*.cpp": "C++",
+    "*.hpp": "C++",
+    "*.rs": "Rust",
+    "*.go": "Go",
+    "*.java": "Java",
+    "*.js": "JavaScript",
+    "*.ts": "TypeScript",
+    "*.sh": "Shell",
+    "*.html": "HTML",
+    "*.css": "CSS",
+    "*.md": "Markdown",
+    "*.rst": "reStructuredText",
+    "*.json": "JSON",
+    "*.toml": "TOML",
+    "*.yaml": "YAML",
+    "*.yml": "YAML",
+}
+
+
+def extension_key(_root: Path, file: Path) -> str:
+    """Group by file extension, including the dot.
+
+    Args:
+        _root (Path): Processed path, unused.
+        file (Path): Counted file.
+
+    Returns:
+        str: Extension of the file, `NO_EXTENSION` if it has none.
+    """
+    return file.suffix or NO_EXTENSION
+
+
+def directory_key(root: Path, file: Path) -> str:
+    """Group by top-level directory under the processed path.
+
+    Args:
+        root (Path): Processed path.
+        file (Path): Counted file under the processed path.
+
+    Returns:
+        str: Name of the top-level directory, `ROOT_GROUP` for files directly in the processed path.
+    """
+    parts = file.relative_to(root).parts
+    return parts[0] if len(parts) > 1 else ROOT_GROUP
+
+
+def glob_map_key(glob_map: Mapping[str, str]) -> GroupKeyT:
+    """Group by the first matching glob pattern, matched like ignored regexps.
+
+    Args:
+        glob_map (Mapping[str, str]): Glob pattern to group name, in order of precedence.
+
+    Returns:
+        GroupKeyT: Key of the group, `OTHER_GROUP` for files not matching any pattern.
+    """
+    patterns = tuple(glob_map.items())
+
+    def key(_root: Path, file: Path) -> str:
+        return next((group for pattern, group in patterns if file.match(pattern)), OTHER_GROUP)
+
+    return key
+
+
+def group_key(group_by: str, glob_map: Mapping[str, str] | None = None) -> GroupKeyT:
+    """Choose group key function.
+
+    Args:
+        group_by (str): One of `GROUP_BY`.
+        glob_map (Mapping[str, str] | None): Patterns for "glob-map", `LANGUAGES` if None.
+
+    Returns:
+        GroupKeyT: Function returning group name of a file.
+
+    Raises:
+        ValueError: Unknown `group_by`.
+    """
+    match group_by:
+        case "ext":
+            return extension_key
+        case "dir":
+            return directory_key
+        case "glob-map":
+            return glob_map_key(LANGUAGES if glob_map is None else glob_map)
+    msg = f"Unknown group {group_by!r}, expected one of {GROUP_BY}."
+    raise ValueError(msg)
+
+
+@dataclass(slots=True, kw_only=True)
+class GroupTotals:
+    """Aggregated statistics of every group, memory is proportional to the number of groups, not files.
+
+    Attributes:
+        key (GroupKeyT): Function returning group name of a file.
+        totals (dict[str, FileStats]): Aggregated statistics of every group seen so far.
+    """
+
+    key: GroupKeyT
+    totals: dict[str, FileStats] = field(default_factory=dict)
+
+    def add(self, root: Path, file: Path, stats: FileStats) -> None:
+        """Add statistics of a file to its group.
+
+        Args:
+            root (Path): Path being processed, that the file was found under.
+            file (Path): Counted file.
+            stats (FileStats): Statistics of the file.
+        """
+        name = self.key(root, file)
+        self.totals[name] = self.totals.get(name, FileStats()) + stats
+
+    def rows(self) -> list[tuple[str, FileStats]]:
+        """Groups with their statistics, sorted by name.
+
+        Returns:
+            list[tuple[str, FileStats]]: Group name and statistics of every group.
+        """
+        return sorted(self.totals.items())
@@ -0,0 +1,239 @@
+"""Ignore rules read from .gitignore and .ignore files while traversing directories."""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Self
+
+IGNORE_FILES = (".gitignore", ".ignore")  # later files take precedence, like in ripgrep
+ALWAYS_IGNORED = ".git"  # repository metadata, never counted when ignore files are respected
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class _Rule:
+    """One compiled pattern of an ignore file.
+
+    Attributes:
+        regex (re.Pattern[str]): Pattern matching paths relative to the ignore directory, with "/" separators.
+        negate (bool): True if matching paths are re-included by "!".
+        directory_only (bool): True if the pattern ends with "/" and matches only directories.
+    """
+
+    regex: re.Pattern[str]
+    negate: bool
+    directory_only: bool
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class _Level:
+    """Rules of one ignore directory, with how walked paths are made relative to it.
+
+    Attributes:
+        strip (str): Prefix of walked paths that is the ignore directory.
+        prepend (str): Path from the ignore directory to the stripped prefix, for directories above the walk.
+        rules (tuple[_Rule, ...]): Rules of the ignore files of the directory, in order.
+    """
+
+    strip: str
+    prepend: str
+    rules: tuple[_Rule, ...]
+
+
+class IgnoreRules:
+    """Compiled ignore rules in effect inside one directory, including rules inherited from its parents.
+
+    Rules follow gitignore semantics: the last matching pattern wins, deeper files override their parents,
+    and "!" re-includes a path unless one of its parent directories is ignored.
+    Rules are compiled once per directory and shared with children, which only add their own rules.
+
+    Args:
+        levels (tuple[_Level, ...]): Rules of every directory with ignore files, from the top down.
+    """
+
+    __slots__ = ("_levels",)
+
+    def __init__(self, levels: tuple[_Level, ...] = ()) -> None:  # noqa: D107
+        self._levels = levels
+
+    @classmethod
+    def for_directory(cls, directory: Path) -> Self:
+        """Rules in effect inside a directory where traversal starts.
+
+        Ignore files of parent directories are included up to the root of the repository containing the directory,
+        so that counting a subdirectory ignores the same files as counting the whole repository.
+
+        Args:
+            directory (Path): Directory where traversal starts.
+
+        Returns:
+            Self: Rules for children of the directory.
+        """
+        resolved = directory.resolve()
+        repository = next((p for p in resolved.parents if (p / ALWAYS_IGNORED).exists()), None)
+        rules = cls()
+        if repository is not None:
+            strip = _prefix(directory)
+            for ancestor in reversed(resolved.parents[: resolved.parents.index(repository) + 1]):
+                prepend = f"{resolved.relative_to(ancestor).as_posix()}/"
+                rules = rules._extend(ancestor, strip=strip, prepend=prepend)
+        return rules.child(directory)
+
+    def child(self, directory: Path) -> Self:
+        """Rules in effect inside a subdirectory, the same object if it has no ignore files.
+
+        Args:
+            directory (Path): Directory being listed, a child of the directory of these rules.
+
+        Returns:
+            Self: Rules for children of the directory.
+        """
+        return self._extend(directory, strip=_prefix(directory), prepend="")
+
+    def is_ignored(self, path: Path) -> bool:
+        """True if a path listed in the directory of these rules is ignored.
+
+        Args:
+            path (Path): Path of a file or directory, as listed during traversal.
+
+        Returns:
+            bool: True if the path and everything under it should be skipped.
+        """
+        if path.name == ALWAYS_IGNORED:
+            return True
+        name = str(path)
+        for level in reversed(self._levels):
+            relative = level.prepend + name[len(level.strip) :]
+            if os.sep != "/":
+                relative = relative.replace(os.sep, "/")
+            for rule in reversed(level.rules):
+                if rule.regex.fullmatch(relative) and (not rule.directory_only or path.is_dir()):
+                    return not rule.negate
+        return False
+
+    def _extend(self, directory: Path, *, strip: str, prepend: str) -> Self:
+        """Add rules of ignore files in a directory, if there are any.
+
+        Args:
+            directory (Path): Directory that may contain ignore files.
+            strip (str): Prefix of walked paths that is the directory.
+            prepend (str): Path from the directory to the stripped prefix.
+
+        Returns:
+            Self: Extended rules, the same object if the directory has no rules.
+        """
+        rules: list[_Rule] = []
+        for name in IGNORE_FILES:
+            try:
+                lines = (directory / name).read_text(encoding="utf-8", errors="replace").splitlines()
+            except OSError:  # missing or unreadable ignore file
+                continue
+            rules.extend(rule for rule in map(_compile_rule, lines) if rule is not None)
+        if not rules:
+            return self
+        return type(self)((*self._levels, _Level(strip=strip, prepend=prepend, rules=tuple(rules))))
+
+
+def _prefix(directory: Path) -> str:
+    """Prefix of paths listed in a directory.
+
+    Args:
+        directory (Path): Listed directory.
+
+    Returns:
+        str: Directory with a trailing separator, empty for ".", which lists names without any prefix.
+    """
+    name = str(directory)
+    return "" if name == "." else os.path.join(name, "")  # noqa: PTH118 - string prefix, not a path
+
+
+def _compile_rule(line: str) -> _Rule | None:
+    """Compile one line of an ignore file.
+
+    Args:
+        line (str): Line without its newline.
+
+    Returns:
+        _Rule | None: Compiled rule, None for blank lines and comments.
+    """
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "  # escaped trailing space
+    if not stripped or stripped.startswith("#"):
+        return None
+
+    negate = stripped.startswith("!")
+    pattern = stripped.removeprefix("!")
+    directory_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    if not pattern:
+        return None
+
+    # pattern with a slash is relative to the ignore directory, otherwise it matches at any depth
+    anchored = "/" in pattern
+    regex = _translate(pattern.removeprefix("/"))
+    if not anchored:
+        regex = f"(?:.*/)?{regex}"
+    return _Rule(regex=re.compile(regex, re.DOTALL), negate=negate, directory_only=directory_only)
+
+
+def _translate(pattern: str) -> str:
+    """Translate gitignore glob to a regex, "*", "?" and classes never match "/", "**" matches across directories.
+
+    Args:
+        pattern (str): Glob without a leading "/", "!" and trailing "/".
+
+    Returns:
+        str: Regex matching the same relative paths.
+    """
+    parts: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*" and pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/"):
+            if i + 2 == n:  # trailing "**", everything inside
+                parts.append(".*")
+                i += 2
+                continue
+            if pattern[i + 2] == "/":  # leading or inner "**/", zero or more directories
+                parts.append("(?:.*/)?")
+                i += 3
+                continue
+        if c == "*":
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[" and (end := _class_end(pattern, i)) != -1:
+            body = pattern[i + 1 : end].replace("\\", "\\\\")
+            if body[0] in "!^":
+                body = f"^{body[1:]}"
+            parts.append(f"(?!/)[{body}]")
+            i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return "".join(parts)
+
+
+def _class_end(pattern: str, start: int) -> int:
+    """Find the end of a character class.
+
+    Args:
+        pattern (str): Glob containing the class.
+        start (int): Index of "[" opening the class.
+
+    Returns:
+        int: Index of "]" closing the class, -1 if it is not closed.
+    """
+    i = start + 1
+    if i < len(pattern) and pattern[i] in "!^":
+        i += 1
+    if i < len(pattern) and pattern[i] == "]":  # "]" first in a class is literal
+        i += 1
+    return pattern.find("]", i)
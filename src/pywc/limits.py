@@ -0,0 +1,130 @@
+"""Bounding resources used by a single run."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from pywc.data import FileStats
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+class LimitExceededError(Exception):
+    """Raised when a run hits one of its resource limits.
+
+    Args:
+        reason (str): Which limit was hit.
+
+    Attributes:
+        reason (str): Which limit was hit.
+        partial (FileStats): Totals of files counted completely before the limit was hit.
+    """
+
+    reason: str
+    partial: FileStats
+
+    def __init__(self, reason: str) -> None:  # noqa: D107
+        super().__init__(reason)
+        self.reason = reason
+        self.partial = FileStats()
+
+
+class Limits:
+    """Resource limits of one run, shared by every path processed in it.
+
+    The clock starts when limits are created. Files are admitted one at a time, and a file that would
+    exceed `max_bytes` by its size is not read at all, so only completely counted files are in totals.
+
+    Args:
+        max_files (int | None): Maximum number of files to count, unlimited if None.
+        max_bytes (int | None): Maximum number of bytes to read, unlimited if None.
+        timeout (float | None): Maximum run time in seconds, checked between chunks, unlimited if None.
+        max_open_files (int | None): Maximum number of files open at once, readers over it wait, unlimited if None.
+
+    Attributes:
+        max_files (int | None): Maximum number of files to count, unlimited if None.
+        max_bytes (int | None): Maximum number of bytes to read, unlimited if None.
+        deadline (float | None): Time of `time.monotonic` when the run times out, never if None.
+        files (int): Number of files admitted so far.
+        bytes (int): Number of bytes admitted so far.
+    """
+
+    max_files: int | None
+    max_bytes: int | None
+    deadline: float | None
+    files: int
+    bytes: int
+
+    def __init__(  # noqa: D107
+        self,
+        *,
+        max_files: int | None = None,
+        max_bytes: int | None = None,
+        timeout: float | None = None,
+        max_open_files: int | None = None,
+    ) -> None:
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self._open_files = None if max_open_files is None else threading.BoundedSemaphore(max_open_files)
+        self._lock = threading.Lock()
+        self.files = 0
+        self.bytes = 0
+
+    def check_time(self) -> None:
+        """Check that the run is within its timeout.
+
+        Raises:
+            LimitExceededError: Timeout has passed.
+        """
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            msg = "timeout reached"
+            raise LimitExceededError(msg)
+
+    def admit(self, size: int) -> None:
+        """Reserve budget for one file of the given size.
+
+        Args:
+            size (int): Size of the file in bytes.
+
+        Raises:
+            LimitExceededError: Counting the file would exceed one of the limits.
+        """
+        self.check_time()
+        with self._lock:
+            if self.max_files is not None and self.files >= self.max_files:
+                msg = f"maximum of {self.max_files} files reached"
+                raise LimitExceededError(msg)
+            if self.max_bytes is not None and self.bytes + size > self.max_bytes:
+                msg = f"maximum of {self.max_bytes} bytes reached"
+                raise LimitExceededError(msg)
+            self.files += 1
+            self.bytes += size
+
+    @contextmanager
+    def opened(self) -> Iterator[None]:
+        """Hold one of the open file slots for the duration of the block.
+
+        Yields:
+            None: Slot is held until the block exits.
+        """
+        if self._open_files is None:
+            yield
+            return
+        with self._open_files:
+            yield
+
+    def guard(self, chunks: Iterable[bytes | memoryview]) -> Iterator[bytes | memoryview]:
+        """Pass chunks through, checking timeout before every chunk.
+
+        Args:
+            chunks (Iterable[bytes | memoryview]): Chunks of a file being read.
+
+        Yields:
+            bytes | memoryview: Same chunks, until timeout is reached.
+        """
+        for chunk in chunks:
+            self.check_time()
+            yield chunk
@@ -0,0 +1,215 @@
+"""Measuring a run and exporting its metrics in the OpenMetrics text format."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+
+    from pywc.data import FileStats
+
+PHASES = ("traverse", "count", "report")
+METRIC_PREFIX = "pywc"
+
+
+class RunMetrics:
+    """Counters and time spent per phase of one run, shared by every path processed in it.
+
+    Wall and CPU time of a phase are measured in the thread running it and summed over threads,
+    so with several counting threads the time of the "count" phase can exceed the run time.
+    CPU time of a phase is the CPU time of its threads, CPU time of the run is that of the whole process.
+
+    Args:
+        workers (int): Number of threads counting files, see `utilization`, 1 by default.
+
+    Attributes:
+        files (int): Number of files counted.
+        bytes (int): Number of bytes counted in this run, without totals resumed from a checkpoint.
+        directories (int): Number of directories traversed completely.
+        ignored (int): Number of files and directories skipped by ignore rules, a directory counts once.
+        permission_errors (int): Number of paths that could not be read.
+        wall (dict[str, float]): Wall time per phase, in seconds.
+        cpu (dict[str, float]): CPU time per phase, in seconds.
+        workers (int): Number of threads counting files.
+    """
+
+    files: int
+    bytes: int
+    directories: int
+    ignored: int
+    permission_errors: int
+    wall: dict[str, float]
+    cpu: dict[str, float]
+    workers: int
+
+    def __init__(self, workers: int = 1) -> None:  # noqa: D107
+        self.workers = workers
+        self.files = 0
+        self.bytes = 0
+        self.directories = 0
+        self.ignored = 0
+        self.permission_errors = 0
+        self.wall = dict.fromkeys(PHASES, 0.0)
+        self.cpu = dict.fromkeys(PHASES, 0.0)
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._started_cpu = time.process_time()
+
+    def path_ignored(self, path: Path) -> None:  # noqa: ARG002
+        """Count a file or directory skipped by ignore rules, see `iter_files`.
+
+        Args:
+            path (Path): Ignored path.
+        """
+        self.ignored += 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add time spent in the block to a phase.
+
+        Args:
+            name (str): One of `PHASES`.
+
+        Yields:
+            None: Time is measured until the block exits.
+        """
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            with self._lock:
+                self.wall[name] += wall
+                self.cpu[name] += cpu
+
+    def timed[T, R](self, name: str, function: Callable[[T], R]) -> Callable[[T], R]:
+        """Wrap a function, so that time spent in its calls is added to a phase.
+
+        Args:
+            name (str): One of `PHASES`.
+            function (Callable[[T], R]): Function to measure, may be called from any thread.
+
+        Returns:
+            Callable[[T], R]: Measured function.
+        """
+
+        def wrapped(item: T) -> R:
+            with self.phase(name):
+                return function(item)
+
+        return wrapped
+
+    def timed_iter[T](self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """Yield items, adding time spent producing them to a phase, but not time spent by the consumer.
+
+        Args:
+            name (str): One of `PHASES`.
+            items (Iterable[T]): Items produced lazily, like traversed files.
+
+        Yields:
+            T: Same items.
+        """
+        iterator = iter(items)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def utilization(self) -> float:
+        """Share of time the counting threads spent counting, from the start of the run until reporting.
+
+        Low utilization with several workers means threads waited for traversal or for a straggling large file.
+
+        Returns:
+            float: Time of the "count" phase over the time available to all workers, between 0 and 1.
+        """
+        available = self.workers * (time.perf_counter() - self._started - self.wall["report"])
+        return min(self.wall["count"] / available, 1.0) if available > 0 else 0.0
+
+    def format(self, total: FileStats, *, complete: bool) -> str:
+        """Format metrics of the run so far in the OpenMetrics text format.
+
+        Every metric is a gauge, a file describes the last run, as read by the node exporter textfile collector.
+
+        Args:
+            total (FileStats): Totals of the run.
+            complete (bool): False if the run stopped early on a limit.
+
+        Returns:
+            str: Metric families terminated by "# EOF".
+        """
+        run_wall = time.perf_counter() - self._started
+        families: list[tuple[str, str, str, list[tuple[str, float]]]] = [
+            ("lines", "", "Lines counted.", [("", total.lines)]),
+            ("words", "", "Words counted.", [("", total.words)]),
+            ("characters", "", "Characters counted.", [("", total.chars)]),
+            ("read", "bytes", "Bytes counted.", [("", total.bytes)]),
+            ("files", "", "Files counted.", [("", self.files)]),
+            ("directories", "", "Directories traversed.", [("", self.directories)]),
+            ("ignored_paths", "", "Files and directories skipped by ignore rules.", [("", self.ignored)]),
+            ("permission_errors", "", "Paths that could not be read.", [("", self.permission_errors)]),
+            ("workers", "", "Threads counting files.", [("", self.workers)]),
+            (
+                "worker_utilization",
+                "ratio",
+                "Share of time the counting threads spent counting.",
+                [("", self.utilization())],
+            ),
+            ("complete", "", "1 if every file was counted, 0 if a limit stopped the run.", [("", int(complete))]),
+            ("run_duration", "seconds", "Wall time of the run.", [("", run_wall)]),
+            ("run_cpu", "seconds", "CPU time of the process.", [("", time.process_time() - self._started_cpu)]),
+            (
+                "read_throughput",
+                "bytes_per_second",
+                "Bytes counted per second of the run, without bytes resumed from a checkpoint.",
+                [("", self.bytes / run_wall if run_wall else 0.0)],
+            ),
+            (
+                "phase_duration",
+                "seconds",
+                "Wall time per phase, summed over threads.",
+                [(f'phase="{name}"', seconds) for name, seconds in self.wall.items()],
+            ),
+            (
+                "phase_cpu",
+                "seconds",
+                "CPU time per phase, summed over threads.",
+                [(f'phase="{name}"', seconds) for name, seconds in self.cpu.items()],
+            ),
+            (
+                "last_run_timestamp",
+                "seconds",
+                "Time the run finished, in seconds since the epoch.",
+                [("", time.time())],
+            ),
+        ]
+        lines: list[str] = []
+        for name, unit, help_text, samples in families:
+            family = f"{METRIC_PREFIX}_{name}_{unit}" if unit else f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# TYPE {family} gauge")
+            if unit:
+                lines.append(f"# UNIT {family} {unit}")
+            lines.append(f"# HELP {family} {help_text}")
+            lines.extend(
+                f"{family}{{{labels}}} {value}" if labels else f"{family} {value}" for labels, value in samples
+            )
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, file: Path, total: FileStats, *, complete: bool) -> None:
+        """Write metrics atomically, so that a collector never reads a partly written file.
+
+        Args:
+            file (Path): Metrics file, named *.prom for the node exporter textfile collector.
+            total (FileStats): Totals of the run.
+            complete (bool): False if the run stopped early on a limit.
+        """
+        tmp = file.with_name(f".{file.name}.tmp")
+        tmp.write_text(self.format(total, complete=complete), encoding="utf-8")
+        tmp.replace(file)
@@ -1,23 +1,142 @@
 """Navigate different files and folders."""
 
-from typing import TYPE_CHECKING
+from contextlib import closing
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import TYPE_CHECKING, Any, cast
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Iterable, Iterator
     from pathlib import Path
 
+    from pywc.checkpoint import Checkpoint
     from pywc.data import CounterFlags
     from pywc.format import FormatterT
+    from pywc.group import GroupTotals
+    from pywc.metrics import RunMetrics
+    from pywc.shard import RecordT, Shard
+    from pywc.store import ResultStore
+    from pywc.tokenizer import TokenizerFactoryT
 
-from pywc.data import FileStats
+from pywc.archive import ArchiveError, is_archive, iter_members
+from pywc.data import FileStats, StatsCounter
+from pywc.ignore import IgnoreRules
+from pywc.limits import LimitExceededError, Limits
+from pywc.parallel import effective_workers, map_scheduled
+from pywc.reader import ReadStrategy
+from pywc.tokenizer import ASCII_WHITESPACE, AsciiTokenizer
 
+SPLIT_SIZE = 2**26  # 64 MB, files of at least two parts are counted in parts on several threads
 
-def process_path(
+# statistics of a file or of every member of an archive, or raw counts of a part of a file until parts are combined
+type _Counted = list[tuple[str, FileStats]] | tuple[str, StatsCounter]
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class _Item:
+    """File to count, or a directory that is done once every file before it is accounted.
+
+    Attributes:
+        ordinal (int | None): Position among files of the path, None for a directory.
+        path (Path): File or directory.
+        size (int): Size of the file in bytes.
+        offset (int): Start of the part of the file to count.
+        length (int | None): Size of the part of the file from `offset`, the whole file if None.
+    """
+
+    ordinal: int | None
+    path: Path
+    size: int = 0
+    offset: int = 0
+    length: int | None = None
+
+    @property
+    def work(self) -> int:
+        """Number of bytes to count."""
+        return self.size if self.length is None else self.length
+
+
+def iter_files(  # noqa: PLR0913
+    path: Path,
+    *,
+    ignored_regexps: Iterable[str] = (),
+    skip: Callable[[Path], bool] | None = None,
+    on_directory_done: Callable[[Path], object] | None = None,
+    on_ignored: Callable[[Path], object] | None = None,
+    respect_gitignore: bool = False,
+) -> Iterator[Path]:
+    """Recursively yield regular files of a file or directory, skipping ignored paths.
+
+    Traversal keeps its own stack instead of recursing, so tree depth is not limited by the interpreter,
+    and every directory is listed completely before descending, so directories are not kept open.
+
+    Args:
+        path (Path): Path of file or directory to traverse.
+        ignored_regexps (Iterable[str]): Regexes to ignore, matched against every visited path.
+        skip (Callable[[Path], bool] | None): Paths it returns True for are neither yielded nor listed.
+        on_directory_done (Callable[[Path], object] | None): Called with every directory once the files
+            yielded from it were consumed, directories left early by closing the iterator are not reported.
+        on_ignored (Callable[[Path], object] | None): Called with every path skipped by `ignored_regexps`
+            or ignore files, paths under an ignored directory are not reported.
+        respect_gitignore (bool): Skip paths ignored by .gitignore and .ignore files, and .git directories.
+            Rules of every directory are read once, before it is listed, and inherited by its subdirectories.
+
+    Yields:
+        Path: Path of every file that is not ignored, in directory listing order.
+    """
+    ignored_regexps = tuple(ignored_regexps)
+
+    # stack of directories, ignore rules for their children and their listings,
+    # in the same depth-first order as a recursive walk
+    stack: list[tuple[Path | None, IgnoreRules | None, Iterator[Path]]] = [(None, None, iter((path,)))]
+    while stack:
+        directory, rules, listing = stack[-1]
+        p = next(listing, None)
+        if p is None:
+            stack.pop()
+            if directory is not None and on_directory_done:
+                on_directory_done(directory)
+            continue
+
+        if (skip and skip(p)) or not p.exists():
+            continue
+
+        if any(p.match(r) for r in ignored_regexps) or (rules is not None and rules.is_ignored(p)):
+            if on_ignored:
+                on_ignored(p)
+            continue
+
+        if p.is_file():
+            yield p
+            continue
+
+        if not p.is_dir():  # symlink, broken, etc.
+            continue
+
+        if respect_gitignore:
+            rules = rules.child(p) if rules is not None else IgnoreRules.for_directory(p)
+        stack.append((p, rules, iter(list(p.iterdir()))))
+
+
+def process_path(  # noqa: PLR0913
     path: Path,
     flags: CounterFlags,
     *,
     ignored_regexps: Iterable[str] = (),
     formatter: FormatterT | None = None,
+    reader: ReadStrategy | None = None,
+    tokenizer: TokenizerFactoryT | None = None,
+    limits: Limits | None = None,
+    checkpoint: Checkpoint | None = None,
+    respect_gitignore: bool = False,
+    groups: GroupTotals | None = None,
+    archives: bool = False,
+    shard: Shard | None = None,
+    record: RecordT | None = None,
+    workers: int = 1,
+    store: ResultStore | None = None,
+    metrics: RunMetrics | None = None,
+    on_archive_error: Callable[[Path, ArchiveError], object] | None = None,
 ) -> FileStats:
     """Recursively process a file or directory and return aggregated FileStats.
 
@@ -25,38 +144,358 @@ def process_path(
 
     Args:
         path (Path): Path of file or directory to process.
-        flags (CounterFlags): Optional counter of file flags to use.
+        flags (CounterFlags): Optional counter of file flags to use, line lengths are measured only if chosen in them.
         ignored_regexps (Iterable[str]): Regexes to ignore.
         formatter (FormatterT | None): Optional formatter, used to print file contents on IO device.
+        reader (ReadStrategy | None): How files are read, default `ReadStrategy` if None.
+        tokenizer (TokenizerFactoryT | None): New tokenizer for every file, default of `FileStats.from_file` if None.
+        limits (Limits | None): Resource limits of the run, shared between calls, unlimited if None.
+        checkpoint (Checkpoint | None): Progress of the run, paths done in it are skipped and newly counted ones
+            are marked done, nothing is recorded if None.
+        respect_gitignore (bool): Skip paths ignored by .gitignore and .ignore files, see `iter_files`.
+        groups (GroupTotals | None): Group totals every counted file is added to, shared between calls.
+            Members of an archive are added together as the archive file, which is under the path.
+        archives (bool): Count members of tar and zip archives as files named `archive.tar!/member`,
+            instead of counting archives themselves.
+        shard (Shard | None): Count only files of this shard, every file if None.
+        record (RecordT | None): Called with ordinal, name and statistics of every counted file or archive member.
+            Ordinal is the position of the file among all files of the path, including files of other shards,
+            and the position of the member in its archive.
+        workers (int): Number of threads counting files, used only when the GIL is disabled, see `effective_workers`.
+            Results are accounted in traversal order in the calling thread, so output does not depend on it.
+            Larger files are started first and small files are counted in batches, see `map_scheduled`,
+            and files of at least two `SPLIT_SIZE` parts are counted in parts, when counts of parts add up.
+        store (ResultStore | None): Store every counted file or archive member is appended to, shared between calls.
+        metrics (RunMetrics | None): Metrics of the run, updated with visited paths and time spent traversing
+            and counting, shared between calls.
+        on_archive_error (Callable[[Path, ArchiveError], object] | None): Called with every file with an archive
+            name that is not a valid archive, when archives are counted. Such files are counted as plain files.
+            Called from counting threads.
 
     Returns:
-        FileStats: FileStats instance containing file or aggregated directory statistics.
+        FileStats: FileStats instance containing file or aggregated directory statistics,
+        without paths skipped as done.
+
+    Raises:
+        LimitExceededError: One of the limits is hit, `partial` holds totals of files counted before it.
     """
+    total = FileStats(lines=0, words=0, chars=0, bytes=0)
+    reader = reader or ReadStrategy()
+    limits = limits or Limits()
+    count = partial(
+        _count_file,
+        reader=reader,
+        tokenizer=tokenizer,
+        limits=limits,
+        archives=archives,
+        line_lengths=flags.line_lengths,
+        on_archive_error=on_archive_error,
+    )
+    reports = _reports(flags, formatter=formatter, record=record, store=store)
+    accounts = _accounts(path, groups=groups, metrics=metrics, checkpoint=checkpoint)
+    items = _iter_items(
+        path,
+        shard=shard,
+        limits=limits,
+        checkpoint=checkpoint,
+        metrics=metrics,
+        ignored_regexps=ignored_regexps,
+        respect_gitignore=respect_gitignore,
+    )
+    if metrics is not None:
+        count = metrics.timed("count", count)
+        items = metrics.timed_iter("traverse", items)
 
-    def _walk(p: Path) -> FileStats:
-        total = FileStats(lines=0, words=0, chars=0, bytes=0)
+    scheduled = map_scheduled(
+        count,
+        items,
+        workers=effective_workers(workers),
+        size=lambda item: item.work,
+        split=_splitter(tokenizer, flags, archives=archives),
+        combine=_combine_parts,
+    )
+    try:
+        for item, counted in scheduled:
+            ordinal, p = item.ordinal, item.path
+            if ordinal is None:  # directory is done once every file before it is accounted
+                if checkpoint:
+                    checkpoint.directory_done(p)
+                continue
 
-        if not path.exists():
-            return total  # zero value
+            # archive is accounted only once all its members are counted, like a single file
+            file_total = FileStats()
+            for member, (name, stats) in enumerate(cast("list[tuple[str, FileStats]]", counted)):  # parts combined
+                for report in reports:
+                    report((ordinal, member), name, stats)
+                file_total += stats
+            total += file_total
+            for account in accounts:
+                account(p, file_total)
+    except LimitExceededError as e:
+        e.partial = total
+        raise
 
-        if any(path.match(r) for r in ignored_regexps):
-            return total  # zero value
+    return total
 
-        if p.is_file():
-            stats = FileStats.from_file(p)
 
-            if formatter:
-                formatter(stats, flags, str(p))
+def _reports(
+    flags: CounterFlags,
+    *,
+    formatter: FormatterT | None,
+    record: RecordT | None,
+    store: ResultStore | None,
+) -> list[RecordT]:
+    """Callables every counted file or archive member is reported to, in the order of `process_path` arguments.
+
+    Args:
+        flags (CounterFlags): Counts passed to the formatter.
+        formatter (FormatterT | None): Prints every file, if given.
+        record (RecordT | None): Records every file with its ordinal, if given.
+        store (ResultStore | None): Stores every file, if given.
+
+    Returns:
+        list[RecordT]: Reports taking ordinal, name and statistics of a file.
+    """
+    reports: list[RecordT] = []
+    if formatter:
+        reports.append(lambda _ordinal, name, stats: formatter(stats, flags, name))
+    if record:
+        reports.append(record)
+    if store is not None:
+        reports.append(lambda _ordinal, name, stats: store.append(name, stats))
+    return reports
 
-            return stats
 
-        if not p.is_dir():  # symlink, broken, etc.
-            return total  # zero value
+def _accounts(
+    path: Path, *, groups: GroupTotals | None, metrics: RunMetrics | None, checkpoint: Checkpoint | None
+) -> list[Callable[[Path, FileStats], object]]:
+    """Callables every counted file is accounted to, with the total of its members if it is an archive.
+
+    Args:
+        path (Path): Path given to `process_path`, the root of groups.
+        groups (GroupTotals | None): Adds every file to its group, if given.
+        metrics (RunMetrics | None): Counts bytes of every file, if given.
+        checkpoint (Checkpoint | None): Marks every file done, if given.
+
+    Returns:
+        list[Callable[[Path, FileStats], object]]: Accounts taking path and statistics of a file.
+    """
+    accounts: list[Callable[[Path, FileStats], object]] = []
+    if groups is not None:
+        accounts.append(lambda file, stats: groups.add(path, file, stats))
+    if metrics is not None:
+
+        def count_bytes(_file: Path, stats: FileStats) -> None:
+            metrics.bytes += stats.bytes
+
+        accounts.append(count_bytes)
+    if checkpoint:
+        accounts.append(checkpoint.file_done)
+    return accounts
 
-        # Recursive call for directories
-        for child in p.iterdir():
-            total += _walk(child)
 
-        return total
+def _iter_items(
+    path: Path,
+    *,
+    shard: Shard | None,
+    limits: Limits,
+    checkpoint: Checkpoint | None,
+    metrics: RunMetrics | None,
+    **options: Any,  # noqa: ANN401
+) -> Iterator[_Item]:
+    """Yield every file to count with its ordinal and size, admitted by limits, and every directory once it is done.
+
+    Directories are reported in traversal order between files, so that when files are counted ahead
+    on worker threads, a directory is marked done only after its files.
 
-    return _walk(path)
+    Args:
+        path (Path): File or directory to traverse.
+        shard (Shard | None): Only files owned by the shard are yielded, every file if None.
+        limits (Limits): Admits every file by its size.
+        checkpoint (Checkpoint | None): Files and directories done in the checkpoint are skipped.
+        metrics (RunMetrics | None): Counts files, directories and ignored paths.
+        **options (Any): Passed to `iter_files`.
+
+    Yields:
+        _Item: Every file to count, and every directory once its files are yielded.
+    """
+    directories: list[Path] = []
+
+    def directory_done(directory: Path) -> None:
+        if metrics is not None:
+            metrics.directories += 1
+        if checkpoint:
+            directories.append(directory)
+
+    files = iter_files(
+        path,
+        skip=checkpoint.is_done if checkpoint else None,
+        on_directory_done=directory_done,
+        on_ignored=metrics.path_ignored if metrics is not None else None,
+        **options,
+    )
+    for ordinal, file in enumerate(files):
+        yield from (_Item(ordinal=None, path=directory) for directory in directories)
+        directories.clear()
+        if shard is not None and not shard.owns(file):
+            continue
+        size = file.stat().st_size
+        limits.admit(size)
+        if metrics is not None:
+            metrics.files += 1
+        yield _Item(ordinal=ordinal, path=file, size=size)
+    yield from (_Item(ordinal=None, path=directory) for directory in directories)
+
+
+def _splitter(
+    tokenizer: TokenizerFactoryT | None, flags: CounterFlags, *, archives: bool
+) -> Callable[[_Item], list[_Item]] | None:
+    """Split of files into parts, None unless counts of adjacent parts add up to counts of the file.
+
+    Only the ASCII tokenizer is stateless apart from word state, and line lengths span parts.
+
+    Args:
+        tokenizer (TokenizerFactoryT | None): Tokenizer of the run.
+        flags (CounterFlags): Counts of the run.
+        archives (bool): Archives are counted by members, so they are not split.
+
+    Returns:
+        Callable[[_Item], list[_Item]] | None: Split for `map_scheduled`, None if files cannot be split.
+    """
+    if tokenizer not in (None, AsciiTokenizer) or flags.line_lengths:
+        return None
+    return partial(_split_file, archives=archives)
+
+
+def _split_file(item: _Item, *, archives: bool) -> list[_Item]:
+    """Parts of `SPLIT_SIZE` bytes of a large file, the item itself for directories, small files and archives.
+
+    Args:
+        item (_Item): File or directory.
+        archives (bool): Archives are counted by members, so they are not split.
+
+    Returns:
+        list[_Item]: Parts of the file in order, or the item alone.
+    """
+    if item.ordinal is None or item.size < 2 * SPLIT_SIZE or (archives and is_archive(item.path)):
+        return [item]
+    return [
+        replace(item, offset=offset, length=min(SPLIT_SIZE, item.size - offset))
+        for offset in range(0, item.size, SPLIT_SIZE)
+    ]
+
+
+def _combine_parts(parts: list[_Counted]) -> _Counted:
+    """Statistics of a file from counts of its parts.
+
+    Counts of a part alone need not be valid statistics, a part of blank lines has more lines than words,
+    so they are summed before statistics are made.
+
+    Args:
+        parts (list[_Counted]): Name and counter of every part, in order.
+
+    Returns:
+        _Counted: Name and statistics of the file.
+    """
+    named = cast("list[tuple[str, StatsCounter]]", parts)
+    counters = [counter for _, counter in named]
+    stats = FileStats(
+        lines=sum(counter.lines for counter in counters),
+        words=sum(counter.words for counter in counters),
+        chars=sum(counter.chars for counter in counters),
+        bytes=sum(counter.bytes for counter in counters),
+    )
+    return [(named[0][0], stats)]
+
+
+def _count_file(  # noqa: PLR0913
+    item: _Item,
+    *,
+    reader: ReadStrategy,
+    tokenizer: TokenizerFactoryT | None,
+    limits: Limits,
+    archives: bool,
+    line_lengths: bool,
+    on_archive_error: Callable[[Path, ArchiveError], object] | None,
+) -> _Counted:
+    """Count a file, a part of it, or every member of an archive, nothing for directory items.
+
+    Safe to run on worker threads. An invalid archive is counted as a plain file.
+
+    Args:
+        item (_Item): File, part of a file, or directory.
+        reader (ReadStrategy): How files are read.
+        tokenizer (TokenizerFactoryT | None): Creates tokenizer for every file.
+        limits (Limits): Resource limits of the run, checked between chunks.
+        archives (bool): Count members of archives instead of archives.
+        line_lengths (bool): Also measure lines.
+        on_archive_error (Callable[[Path, ArchiveError], object] | None): Called with a file with an archive
+            name that is not a valid archive.
+
+    Returns:
+        _Counted: Name and statistics of the file or every member, nothing for a directory, name and counter
+        of a part.
+    """
+    if item.ordinal is None:
+        return []
+    if item.length is not None:
+        return str(item.path), _count_part(item, reader=reader, tokenizer=tokenizer, limits=limits)
+    count = partial(FileStats.from_chunks, tokenizer=tokenizer, line_lengths=line_lengths)
+    with limits.opened():
+        if archives and is_archive(item.path):
+            try:
+                return _count_members(item.path, count, reader=reader, limits=limits)
+            except ArchiveError as e:
+                if on_archive_error is not None:
+                    on_archive_error(item.path, e)
+        with closing(reader.chunks(item.path)) as chunks:
+            return [(str(item.path), count(limits.guard(chunks)))]
+
+
+def _count_part(
+    item: _Item, *, reader: ReadStrategy, tokenizer: TokenizerFactoryT | None, limits: Limits
+) -> StatsCounter:
+    """Count a part of a file, so that counts of adjacent parts add up, see `StatsCounter`.
+
+    Args:
+        item (_Item): Part of a file.
+        reader (ReadStrategy): How the file is read.
+        tokenizer (TokenizerFactoryT | None): Creates tokenizer for the part.
+        limits (Limits): Resource limits of the run, checked between chunks.
+
+    Returns:
+        StatsCounter: Counts of the part.
+    """
+    counter = StatsCounter(tokenizer=tokenizer()) if tokenizer else StatsCounter()
+    with limits.opened():
+        if item.offset:
+            # word state is decided by the byte preceding the part
+            with item.path.open("rb") as f:
+                f.seek(item.offset - 1)
+                counter.in_word = f.read(1) not in ASCII_WHITESPACE
+        with closing(reader.chunks(item.path, offset=item.offset, size=item.length)) as chunks:
+            for chunk in limits.guard(chunks):
+                counter.feed(chunk)
+    return counter
+
+
+def _count_members(
+    archive: Path, count: Callable[[Iterable[bytes | memoryview]], FileStats], *, reader: ReadStrategy, limits: Limits
+) -> list[tuple[str, FileStats]]:
+    """Count every member of an archive.
+
+    Args:
+        archive (Path): Tar or zip archive.
+        count (Callable[[Iterable[bytes | memoryview]], FileStats]): Counts chunks of a member.
+        reader (ReadStrategy): How member streams are read.
+        limits (Limits): Resource limits of the run, checked between chunks.
+
+    Returns:
+        list[tuple[str, FileStats]]: Name and statistics of every member, in the order they are stored.
+    """
+    counted: list[tuple[str, FileStats]] = []
+    with closing(iter_members(archive, reader=reader)) as members:
+        for name, chunks in members:
+            with closing(chunks):
+                counted.append((name, count(limits.guard(chunks))))
+    return counted
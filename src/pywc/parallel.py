@@ -0,0 +1,260 @@
+"""Counting files on a pool of threads, which run in parallel on free-threaded Python builds."""
+
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
+from typing import TYPE_CHECKING, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from concurrent.futures import Future
+
+WINDOW_PER_WORKER = 4  # items running or queued in the pool, per worker
+BUFFER_PER_WORKER = 256  # items taken ahead of the consumer, done or not, per worker
+LOOKAHEAD_PER_WORKER = 64  # items planned together by `map_scheduled`, per worker
+BATCH_SIZE = 2**20  # smaller items are counted in batches of about this many bytes
+BATCH_ITEMS = 64  # maximum number of items in a batch
+
+
+def gil_enabled() -> bool:
+    """True if the interpreter runs with the GIL, so threads execute Python code one at a time.
+
+    Returns:
+        bool: False only on free-threaded builds, like python3.14t, with the GIL left disabled.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+def effective_workers(workers: int) -> int:
+    """Number of counting threads worth starting.
+
+    Counting is CPU-bound between reads, so with the GIL extra threads only add overhead and a single
+    thread is used instead.
+
+    Args:
+        workers (int): Requested number of threads.
+
+    Returns:
+        int: `workers` if the GIL is disabled, otherwise 1.
+    """
+    return workers if workers > 1 and not gil_enabled() else 1
+
+
+def map_ordered[T, R](function: Callable[[T], R], items: Iterable[T], *, workers: int) -> Iterator[tuple[T, R]]:
+    """Apply function to items on a thread pool, yielding results in the order of items.
+
+    Items are taken from the iterable in the consumer thread, so aggregation of results needs no locks.
+    At most `WINDOW_PER_WORKER` items per worker are unfinished in the pool, and whenever one finishes,
+    the next item is submitted, so a slow item does not hold up others. Results of items after a slow item
+    are kept until it finishes, at most `BUFFER_PER_WORKER` items per worker, so memory stays bounded.
+    If taking the next item raises, results of items taken before it are yielded first, as in a serial loop.
+    With a single worker, items are processed in the consumer thread without a pool.
+
+    Args:
+        function (Callable[[T], R]): Function applied to every item, on worker threads.
+        items (Iterable[T]): Items to process.
+        workers (int): Number of worker threads.
+
+    Yields:
+        tuple[T, R]: Every item with its result.
+
+    Raises:
+        Exception: Error of taking the next item, once results of earlier items are yielded.
+    """  # noqa: DOC503 - the error of the iterable is re-raised as it is
+    if workers <= 1:
+        for item in items:
+            yield item, function(item)
+    else:
+        errors: list[Exception] = []
+        source = _until_error(items, errors)
+        pending: deque[tuple[T, Future[R]]] = deque()  # in the order of items, done or not
+        running: set[Future[R]] = set()
+        exhausted = False
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pywc") as executor:
+            try:
+                while pending or not exhausted:
+                    room = min(workers * WINDOW_PER_WORKER - len(running), workers * BUFFER_PER_WORKER - len(pending))
+                    for submitted in islice(source, room):
+                        future = executor.submit(function, submitted)
+                        pending.append((submitted, future))
+                        running.add(future)
+                        room -= 1
+                    exhausted = exhausted or room > 0
+                    while pending and pending[0][1].done():
+                        item, future = pending.popleft()
+                        yield item, future.result()
+                    if running:
+                        running = wait(running, return_when=FIRST_COMPLETED).not_done
+            finally:
+                # results are no longer needed after an error or when the consumer stops early
+                for _, future in pending:
+                    future.cancel()
+        if errors:
+            raise errors[0]
+
+
+def _until_error[T](items: Iterable[T], errors: list[Exception]) -> Iterator[T]:
+    """Yield items until the iterable raises, the exception is appended to `errors` instead of raised.
+
+    Args:
+        items (Iterable[T]): Items to pass through.
+        errors (list[Exception]): Receives the error of the iterable, if any.
+
+    Yields:
+        T: Every item taken before the error.
+    """
+    try:
+        yield from items
+    except Exception as e:  # noqa: BLE001 - raised by the caller once earlier items are processed
+        errors.append(e)
+
+
+@dataclass(slots=True, kw_only=True)
+class _Slot[T, R]:
+    """Item waiting for results of its parts, in traversal order.
+
+    Attributes:
+        item (T): Item as taken from the iterable.
+        parts (int): Number of parts the item is split into.
+        results (dict[int, R]): Results of finished parts by their index.
+    """
+
+    item: T
+    parts: int
+    results: dict[int, R] = field(default_factory=dict)
+
+
+type _Unit[T] = tuple[int, int, T]  # sequence number of the item, index of the part, part
+
+
+def map_scheduled[T, R](  # noqa: PLR0913
+    function: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    workers: int,
+    size: Callable[[T], int],
+    split: Callable[[T], list[T]] | None = None,
+    combine: Callable[[list[R]], R] | None = None,
+) -> Iterator[tuple[T, R]]:
+    """Apply function to items on a thread pool, largest work first, yielding results in the order of items.
+
+    Items are planned in windows of `LOOKAHEAD_PER_WORKER` per worker. Within a window, items smaller than
+    `BATCH_SIZE` are grouped with their neighbours into batches run as one task, and tasks are started largest
+    first, so that a large item found late in a window does not finish last. Windows are submitted one after
+    another without waiting, see `map_ordered`. With a single worker, items are processed in order without
+    planning, splitting or batching.
+
+    Args:
+        function (Callable[[T], R]): Function applied to every item or part, on worker threads.
+        items (Iterable[T]): Items to process.
+        workers (int): Number of worker threads.
+        size (Callable[[T], int]): Amount of work of an item or part, like its size in bytes.
+        split (Callable[[T], list[T]] | None): Parts of an item processed as separate tasks, `[item]` to keep
+            it whole, nothing is split if None.
+        combine (Callable[[list[R]], R] | None): Result of a split item from results of its parts, in order.
+
+    Yields:
+        tuple[T, R]: Every item with its result.
+    """
+    if workers <= 1:
+        yield from map_ordered(function, items, workers=1)
+    else:
+        slots: dict[int, _Slot[T, R]] = {}
+        tasks = _plan(items, slots, size=size, split=split, lookahead=workers * LOOKAHEAD_PER_WORKER)
+        done = 0
+        for task, results in map_ordered(partial(_run_task, function), tasks, workers=workers):
+            for (seq, index, _), result in zip(task, results, strict=True):
+                slots[seq].results[index] = result
+            while done in slots and len(slots[done].results) == slots[done].parts:
+                slot = slots.pop(done)
+                done += 1
+                if slot.parts == 1:
+                    yield slot.item, slot.results[0]
+                else:
+                    parts = [slot.results[i] for i in range(slot.parts)]
+                    yield slot.item, cast("Callable[[list[R]], R]", combine)(parts)
+
+
+def _run_task[T, R](function: Callable[[T], R], task: tuple[_Unit[T], ...]) -> list[R]:
+    """Apply function to every part of a task, on a worker thread.
+
+    Args:
+        function (Callable[[T], R]): Function applied to every part.
+        task (tuple[_Unit[T], ...]): Parts of one or more items.
+
+    Returns:
+        list[R]: Result of every part, in order.
+    """
+    return [function(part) for _, _, part in task]
+
+
+def _plan[T, R](
+    items: Iterable[T],
+    slots: dict[int, _Slot[T, R]],
+    *,
+    size: Callable[[T], int],
+    split: Callable[[T], list[T]] | None,
+    lookahead: int,
+) -> Iterator[tuple[_Unit[T], ...]]:
+    """Yield tasks of every window of items, registering the items in `slots` as they are taken.
+
+    If taking the next item raises, tasks of items taken before it are yielded first.
+
+    Args:
+        items (Iterable[T]): Items to plan.
+        slots (dict[int, _Slot[T, R]]): Receives every item by its sequence number.
+        size (Callable[[T], int]): Amount of work of an item or part.
+        split (Callable[[T], list[T]] | None): Parts of an item, nothing is split if None.
+        lookahead (int): Number of items planned together.
+
+    Yields:
+        tuple[_Unit[T], ...]: Parts run as one task, largest tasks of a window first.
+
+    Raises:
+        Exception: Error of taking the next item, once tasks of earlier items are yielded.
+    """  # noqa: DOC503 - the error of the iterable is re-raised as it is
+    errors: list[Exception] = []
+    units: list[_Unit[T]] = []
+    for seq, item in enumerate(_until_error(items, errors)):
+        parts = split(item) if split else [item]
+        slots[seq] = _Slot(item=item, parts=len(parts))
+        units.extend((seq, index, part) for index, part in enumerate(parts))
+        if seq % lookahead == lookahead - 1:
+            yield from _tasks(units, size)
+            units = []
+    yield from _tasks(units, size)
+    if errors:
+        raise errors[0]
+
+
+def _tasks[T](units: list[_Unit[T]], size: Callable[[T], int]) -> list[tuple[_Unit[T], ...]]:
+    """Group small neighbouring units into batches, largest tasks first, ties in traversal order.
+
+    Args:
+        units (list[_Unit[T]]): Parts of a window of items, in traversal order.
+        size (Callable[[T], int]): Amount of work of a part.
+
+    Returns:
+        list[tuple[_Unit[T], ...]]: Tasks, a large part alone or a batch of small parts.
+    """
+    tasks: list[tuple[tuple[_Unit[T], ...], int]] = []
+    batch: list[_Unit[T]] = []
+    batch_size = 0
+    for unit in units:
+        unit_size = size(unit[2])
+        if unit_size >= BATCH_SIZE:
+            tasks.append(((unit,), unit_size))
+            continue
+        batch.append(unit)
+        batch_size += unit_size
+        if batch_size >= BATCH_SIZE or len(batch) == BATCH_ITEMS:
+            tasks.append((tuple(batch), batch_size))
+            batch, batch_size = [], 0
+    if batch:
+        tasks.append((tuple(batch), batch_size))
+    tasks.sort(key=lambda task: task[1], reverse=True)
+    return [task for task, _ in tasks]
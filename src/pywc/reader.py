@@ -0,0 +1,147 @@
+"""Reading file contents in chunks with configurable buffering."""
+
+import contextlib
+import io
+import mmap
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+    from typing import IO
+
+DEFAULT_BUFFER_SIZE = 2**16  # 64 KB
+MAX_AUTO_BUFFER_SIZE = 2**20  # 1 MB
+
+
+@dataclass(slots=True, kw_only=True, frozen=True)
+class ReadStrategy:
+    """Decide how file contents are read into memory.
+
+    Args:
+        buffer_size (int | None, default=65536): Size of a single read, auto-tuned from `st_blksize` if None.
+        reuse_buffer (bool, default=True): If true, read into one preallocated buffer instead of new bytes per read.
+        sequential (bool, default=False): If true, advise the kernel of sequential access with `posix_fadvise`.
+        direct (bool, default=False): If true, bypass the page cache with `O_DIRECT` where the platform allows.
+
+    Attributes:
+        buffer_size (int | None): Size of a single read, auto-tuned from `st_blksize` if None.
+        reuse_buffer (bool): If true, read into one preallocated buffer instead of new bytes per read.
+        sequential (bool): If true, advise the kernel of sequential access with `posix_fadvise`.
+        direct (bool): If true, bypass the page cache with `O_DIRECT` where the platform allows.
+
+    Raises:
+        ValueError: Buffer size is not positive.
+    """
+
+    buffer_size: int | None = DEFAULT_BUFFER_SIZE
+    reuse_buffer: bool = True
+    sequential: bool = False
+    direct: bool = False
+
+    def __post_init__(self) -> None:  # noqa: D105
+        if self.buffer_size is not None and self.buffer_size <= 0:
+            msg = "Buffer size must be positive."
+            raise ValueError(msg)
+
+    def tuned_buffer_size(self, st: os.stat_result) -> int:
+        """Choose buffer size for a file.
+
+        Auto-tuned size is the largest multiple of `st_blksize` not exceeding 1 MB,
+        but no larger than the file itself rounded up to a whole block.
+
+        Args:
+            st (os.stat_result): Status of the file to read.
+
+        Returns:
+            int: Buffer size in bytes.
+        """
+        if self.buffer_size is not None:
+            return self.buffer_size
+        block = getattr(st, "st_blksize", 0) or DEFAULT_BUFFER_SIZE
+        file_blocks = max(1, -(-st.st_size // block))
+        return block * min(file_blocks, max(1, MAX_AUTO_BUFFER_SIZE // block))
+
+    def chunks(
+        self, file: Path, *, offset: int = 0, size: int | None = None
+    ) -> Generator[bytes | memoryview, None, None]:
+        """Yield consecutive chunks of a file.
+
+        Chunks may be views of a reused buffer, valid only until the next chunk is requested.
+        Reading from an offset does not use `O_DIRECT`, which requires aligned offsets.
+
+        Args:
+            file (Path): Path to the file.
+            offset (int): Position in the file to start reading from.
+            size (int | None): Number of bytes to read from the offset, until the end of the file if None.
+
+        Yields:
+            bytes | memoryview: Next non-empty chunk of the file.
+        """
+        direct = self.direct and not offset
+        fd = self._open(file, direct=direct)
+        with os.fdopen(fd, "rb", buffering=0) as f:
+            st = os.fstat(fd)
+            if offset:
+                f.seek(offset)
+            if self.sequential and hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, offset, size or 0, os.POSIX_FADV_SEQUENTIAL)
+            chunks = self.stream_chunks(f, self.tuned_buffer_size(st), aligned=direct)
+            if size is None:
+                yield from chunks
+                return
+            for chunk in chunks:
+                if len(chunk) >= size:
+                    if size:
+                        yield chunk[:size]
+                    return
+                size -= len(chunk)
+                yield chunk
+
+    def stream_chunks(
+        self, stream: IO[bytes], buffer_size: int, *, aligned: bool = False
+    ) -> Generator[bytes | memoryview, None, None]:
+        """Yield consecutive chunks of an already opened binary stream.
+
+        Streams without `readinto`, which are not `io` streams, are read into new bytes.
+
+        Args:
+            stream (IO[bytes]): Stream to read until its end.
+            buffer_size (int): Size of a single read.
+            aligned (bool): If true, the reused buffer is page-aligned, as required by `O_DIRECT`.
+
+        Yields:
+            bytes | memoryview: Next non-empty chunk of the stream.
+        """
+        if not self.reuse_buffer or not isinstance(stream, io.RawIOBase | io.BufferedIOBase):
+            while chunk := stream.read(buffer_size):
+                yield chunk
+            return
+
+        if aligned:
+            # anonymous memory maps are page-aligned, unlike bytearray, and O_DIRECT needs whole pages
+            view = memoryview(mmap.mmap(-1, -(-buffer_size // mmap.PAGESIZE) * mmap.PAGESIZE))
+        else:
+            view = memoryview(bytearray(buffer_size))
+        while n := stream.readinto(view):
+            yield view[:n]
+
+    @staticmethod
+    def _open(file: Path, *, direct: bool) -> int:
+        """Open file descriptor for reading, with `O_DIRECT` if requested and supported.
+
+        Args:
+            file (Path): Path to the file.
+            direct (bool): If true, try to bypass the page cache.
+
+        Returns:
+            int: File descriptor, closed by the caller.
+        """
+        flags = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+        if direct and hasattr(os, "O_DIRECT"):
+            # file systems like tmpfs refuse O_DIRECT, reading falls back to the page cache
+            with contextlib.suppress(OSError):
+                return os.open(file, flags | os.O_DIRECT)
+        return os.open(file, flags)
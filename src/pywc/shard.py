@@ -0,0 +1,232 @@
+"""Splitting a run into shards and merging their partial results."""
+
+import heapq
+import json
+import os
+import zlib
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import IO, TYPE_CHECKING
+
+from pywc.data import FileStats
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+    from typing import Self
+
+PARTIAL_VERSION = 1
+TRAILER_MAX_SIZE = 2**16  # trailer line is read from the end of a partial file
+
+RecordT = Callable[[tuple[int, int], str, FileStats], object]  # ordinal of file and member, name, statistics
+OrdinalT = tuple[int, int, int]  # path on the command line, file in traversal order, member of an archive
+
+
+@dataclass(frozen=True, slots=True)
+class Shard:
+    """One of `count` disjoint parts of a run, files are assigned by a stable hash of their path.
+
+    Every shard traverses the same trees, so paths have to be given the same way on every node.
+
+    Attributes:
+        index (int): Number of the shard, from 1 to `count`.
+        count (int): Number of shards.
+
+    Raises:
+        ValueError: Index is not between 1 and count.
+    """
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:  # noqa: D105
+        if not 1 <= self.index <= self.count:
+            msg = f"Shard {self.index}/{self.count} must be between 1/{self.count} and {self.count}/{self.count}."
+            raise ValueError(msg)
+
+    @classmethod
+    def parse(cls, value: str) -> Self:
+        """Parse shard given as "K/N".
+
+        Args:
+            value (str): Shard number and number of shards, separated by a slash.
+
+        Returns:
+            Self: Parsed shard.
+
+        Raises:
+            ValueError: Value is not in K/N form, or K is not between 1 and N.
+        """
+        index, sep, count = value.partition("/")
+        if not (sep and index.isdigit() and count.isdigit()):
+            msg = f"{value!r} is not in K/N form."
+            raise ValueError(msg)
+        return cls(int(index), int(count))
+
+    def owns(self, file: Path) -> bool:
+        """True if the file is counted by this shard.
+
+        Args:
+            file (Path): Path of a file, as yielded by traversal.
+
+        Returns:
+            bool: True for exactly one shard of every file.
+        """
+        return zlib.crc32(os.fsencode(file)) % self.count == self.index - 1
+
+
+class PartialWriter:
+    """Writes results of one shard as JSON lines, merged by `merge_records`.
+
+    The first line describes the run, every counted file or archive member is a record with its ordinal,
+    and the last line holds shard totals. The header is written on creation, records as they are counted,
+    so memory does not grow.
+
+    Args:
+        stream (IO[str]): Text stream to write to.
+        shard (Shard): Shard of the run.
+        paths (Iterable[str]): Paths given on the command line, in order.
+    """
+
+    def __init__(self, stream: IO[str], *, shard: Shard, paths: Iterable[str]) -> None:  # noqa: D107
+        self._stream = stream
+        self._write({"version": PARTIAL_VERSION, "shard": [shard.index, shard.count], "paths": list(paths)})
+
+    def recorder(self, path_index: int) -> RecordT:
+        """Callable recording files of one path given on the command line, see `process_path`.
+
+        Args:
+            path_index (int): Position of the path on the command line.
+
+        Returns:
+            RecordT: Writes a record for every counted file.
+        """
+
+        def record(ordinal: tuple[int, int], name: str, stats: FileStats) -> None:
+            self._write({"o": [path_index, *ordinal], "name": name, "stats": asdict(stats)})
+
+        return record
+
+    def finish(self, total: FileStats, *, complete: bool) -> None:
+        """Write the trailer line, partial file without it is treated as truncated.
+
+        Args:
+            total (FileStats): Totals of the shard.
+            complete (bool): False if the shard stopped early on a limit.
+        """
+        self._write({"total": asdict(total), "complete": complete})
+        self._stream.flush()
+
+    def _write(self, data: dict[str, object]) -> None:
+        """Write one compact JSON line.
+
+        Args:
+            data (dict[str, object]): Header, record or trailer.
+        """
+        self._stream.write(json.dumps(data, separators=(",", ":")))
+        self._stream.write("\n")
+
+
+@dataclass(slots=True, kw_only=True)
+class Partial:
+    """Partial result of one shard, as written by `PartialWriter`.
+
+    Attributes:
+        file (Path): Partial file.
+        shard (Shard): Shard the file was written by.
+        paths (list[str]): Paths given on the command line of the shard.
+        total (FileStats): Totals of the shard.
+        complete (bool): False if the shard stopped early on a limit.
+    """
+
+    file: Path
+    shard: Shard
+    paths: list[str]
+    total: FileStats
+    complete: bool
+
+    @classmethod
+    def load(cls, file: Path) -> Self:
+        """Read header and trailer of a partial file, records are read lazily by `records`.
+
+        Args:
+            file (Path): Partial file.
+
+        Returns:
+            Self: Description of the partial result.
+
+        Raises:
+            ValueError: File is not a complete partial file of a compatible version.
+        """
+        try:
+            with file.open("rb") as f:
+                header = json.loads(f.readline())
+                f.seek(max(0, f.seek(0, os.SEEK_END) - TRAILER_MAX_SIZE))
+                trailer = json.loads(f.read().splitlines()[-1])
+            version = header["version"]
+            partial = cls(
+                file=file,
+                shard=Shard(*header["shard"]),
+                paths=header["paths"],
+                total=FileStats(**trailer["total"]),
+                complete=trailer["complete"],
+            )
+        except (ValueError, KeyError, TypeError, IndexError) as e:
+            msg = f"{file} is not a partial file, or it is truncated."
+            raise ValueError(msg) from e
+        if version != PARTIAL_VERSION:
+            msg = f"{file} is a partial file of version {version}, not {PARTIAL_VERSION}."
+            raise ValueError(msg)
+        return partial
+
+    def records(self) -> Iterator[tuple[OrdinalT, str, FileStats]]:
+        """Yield records in the order they were written, which is the order of their ordinals.
+
+        Yields:
+            tuple[OrdinalT, str, FileStats]: Ordinal, name and statistics of every counted file.
+        """
+        with self.file.open("rb") as f:
+            next(f)  # header
+            for line in f:
+                data = json.loads(line)
+                if "o" not in data:  # trailer
+                    break
+                yield tuple(data["o"]), data["name"], FileStats(**data["stats"])
+
+
+def check_shards(partials: Iterable[Partial]) -> None:
+    """Check that partial results are every shard of the same run, each exactly once.
+
+    Args:
+        partials (Iterable[Partial]): Partial results to merge.
+
+    Raises:
+        ValueError: Partial results have different paths or shard counts, or some shard is missing or repeated.
+    """
+    partials = list(partials)
+    if not partials:
+        msg = "Nothing to merge."
+        raise ValueError(msg)
+    first = partials[0]
+    for partial in partials:
+        if partial.paths != first.paths or partial.shard.count != first.shard.count:
+            msg = f"{partial.file} is not a shard of the same run as {first.file}."
+            raise ValueError(msg)
+
+    indices = sorted(partial.shard.index for partial in partials)
+    if indices != list(range(1, first.shard.count + 1)):
+        msg = f"Expected shards 1 to {first.shard.count} once each, got {indices}."
+        raise ValueError(msg)
+
+
+def merge_records(partials: Iterable[Partial]) -> Iterator[tuple[str, FileStats]]:
+    """Merge records of all shards into the order of a single run, reading every file once.
+
+    Args:
+        partials (Iterable[Partial]): Partial results of every shard, see `check_shards`.
+
+    Yields:
+        tuple[str, FileStats]: Name and statistics of every counted file.
+    """
+    for _, name, stats in heapq.merge(*(p.records() for p in partials), key=lambda record: record[0]):
+        yield name, stats
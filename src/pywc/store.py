@@ -0,0 +1,217 @@
+"""Compact columnar storage of per-file results, for runs over millions of files."""
+
+import heapq
+import mmap
+import os
+import struct
+from array import array
+from typing import TYPE_CHECKING, cast
+
+from pywc.data import FileStats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+    from typing import Self
+
+COLUMNS = ("lines", "words", "chars", "bytes", "max_line_length")
+STORE_MAGIC = b"PYWCRS\x00\x01"  # file type and version
+BYTE_ORDER_MARK = 0x0102030405060708  # columns are saved in native byte order
+_HEADER = struct.Struct("=8sQQQ")  # magic, byte order mark, number of files, size of names, keeps columns aligned
+
+type _Column = array[int] | memoryview[int]  # array while appending, memoryview of a mapped file once loaded
+
+
+class ResultStore:
+    """Per-file results as one unsigned 64-bit array per count and one blob of names.
+
+    A file costs 48 bytes plus its name, instead of a `FileStats` and a name object of several hundred bytes.
+    Sorting, top-k and totals work on whole columns, without creating an object per file.
+    Histograms of line lengths are not stored.
+
+    A store is created empty and filled by `append`, or loaded read-only from a file with `load`, which maps
+    the file into memory instead of reading it.
+    """
+
+    __slots__ = ("_columns", "_mmap", "_names", "_offsets")
+
+    def __init__(self) -> None:  # noqa: D107
+        self._columns: dict[str, _Column] = {column: array("Q") for column in COLUMNS}
+        self._offsets: _Column = array("Q", [0])  # name i is names[offsets[i] : offsets[i + 1]]
+        self._names: bytearray | memoryview = bytearray()
+        self._mmap: mmap.mmap | None = None
+
+    def __len__(self) -> int:
+        """Number of stored files.
+
+        Returns:
+            int: Number of files appended or loaded.
+        """
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[tuple[str, FileStats]]:
+        """Name and statistics of every file, in the order they were appended.
+
+        Yields:
+            tuple[str, FileStats]: Name and statistics of a file, without a histogram.
+        """
+        for index in range(len(self)):
+            yield self.name(index), self.stats(index)
+
+    def append(self, name: str, stats: FileStats) -> None:
+        """Store results of one file.
+
+        Args:
+            name (str): Name of the file, as reported by `process_path`.
+            stats (FileStats): Statistics of the file.
+
+        Raises:
+            TypeError: Store was loaded from a file and is read-only.
+        """
+        if self._mmap is not None:
+            msg = "Loaded result store is read-only."
+            raise TypeError(msg)
+        for column, values in self._columns.items():
+            cast("array[int]", values).append(getattr(stats, column))
+        names = cast("bytearray", self._names)
+        names += os.fsencode(name)
+        cast("array[int]", self._offsets).append(len(names))
+
+    def name(self, index: int) -> str:
+        """Name of a stored file.
+
+        Args:
+            index (int): Position of the file in the store.
+
+        Returns:
+            str: Name of the file.
+        """
+        return os.fsdecode(bytes(self._names[self._offsets[index] : self._offsets[index + 1]]))
+
+    def stats(self, index: int) -> FileStats:
+        """Statistics of a stored file.
+
+        Args:
+            index (int): Position of the file in the store.
+
+        Returns:
+            FileStats: Statistics of the file, without a histogram.
+        """
+        return _from_columns(values[index] for values in self._columns.values())
+
+    def total(self) -> FileStats:
+        """Totals of every stored file, summed column by column.
+
+        Returns:
+            FileStats: Totals, without a histogram.
+        """
+        return _from_columns(
+            max(values, default=0) if column == "max_line_length" else sum(values)
+            for column, values in self._columns.items()
+        )
+
+    def argsort(self, column: str, *, reverse: bool = False) -> list[int]:
+        """Positions of files ordered by one of the counts, ties keep the order of appending.
+
+        Args:
+            column (str): One of `COLUMNS`.
+            reverse (bool): Largest first.
+
+        Returns:
+            list[int]: Positions of every file.
+        """
+        return sorted(range(len(self)), key=self._key(column), reverse=reverse)
+
+    def top(self, column: str, k: int) -> list[int]:
+        """Positions of `k` files with the largest counts, without sorting the whole column.
+
+        Args:
+            column (str): One of `COLUMNS`.
+            k (int): Number of files.
+
+        Returns:
+            list[int]: Positions of at most `k` files, largest first, ties in the order of appending.
+        """
+        return heapq.nlargest(k, range(len(self)), key=self._key(column))
+
+    def save(self, file: Path) -> None:
+        """Write the store in its in-memory layout, which `load` maps back without parsing.
+
+        Args:
+            file (Path): File to write.
+        """
+        with file.open("wb") as f:
+            f.write(_HEADER.pack(STORE_MAGIC, BYTE_ORDER_MARK, len(self), len(self._names)))
+            for values in self._columns.values():
+                f.write(values)
+            f.write(self._offsets)
+            f.write(self._names)
+
+    @classmethod
+    def load(cls, file: Path) -> Self:
+        """Map a store saved by `save` into memory, read-only.
+
+        Columns are read from the page cache on access, so loading does not depend on the number of files.
+
+        Args:
+            file (Path): File written by `save`.
+
+        Returns:
+            Self: Read-only store, see `close`.
+
+        Raises:
+            ValueError: File is not a result store saved on a machine with the same byte order.
+        """
+        msg = f"{file} is not a result store of this version and byte order, or it is truncated."
+        with file.open("rb") as f:
+            try:
+                magic, mark, count, names_size = _HEADER.unpack(f.read(_HEADER.size))
+            except struct.error as e:
+                raise ValueError(msg) from e
+            size = _HEADER.size + (len(COLUMNS) + 1) * 8 * count + 8 + names_size
+            if magic != STORE_MAGIC or mark != BYTE_ORDER_MARK or os.fstat(f.fileno()).st_size != size:
+                raise ValueError(msg)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        store = cls()
+        with memoryview(mapped) as view:
+            start = _HEADER.size
+            for column in COLUMNS:
+                store._columns[column] = view[start : start + count * 8].cast("Q")
+                start += count * 8
+            store._offsets = view[start : start + (count + 1) * 8].cast("Q")
+            store._names = view[start + (count + 1) * 8 :]
+        store._mmap = mapped
+        return store
+
+    def _key(self, column: str) -> Callable[[int], int]:
+        """Count of one column by position of the file, a key for sorting positions.
+
+        Args:
+            column (str): One of `COLUMNS`.
+
+        Returns:
+            Callable[[int], int]: Item getter of the column, which runs without Python code per call.
+        """
+        return cast("Callable[[int], int]", self._columns[column].__getitem__)
+
+    def close(self) -> None:
+        """Unmap the file of a loaded store, which must not be used afterwards."""
+        if self._mmap is None:
+            return
+        for view in (*self._columns.values(), self._offsets, self._names):
+            cast("memoryview", view).release()
+        self._mmap.close()
+
+
+def _from_columns(values: Iterable[int]) -> FileStats:
+    """Statistics from one value of every column.
+
+    Args:
+        values (Iterable[int]): Values in the order of `COLUMNS`.
+
+    Returns:
+        FileStats: Statistics without a histogram.
+    """
+    lines, words, chars, byte_count, max_line_length = values
+    return FileStats(lines=lines, words=words, chars=chars, bytes=byte_count, max_line_length=max_line_length)
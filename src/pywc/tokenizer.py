@@ -0,0 +1,147 @@
+"""Splitting chunks of a byte stream into lines, words and characters."""
+
+import codecs
+from collections.abc import Callable
+from functools import partial
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from typing import Self
+
+ASCII_WHITESPACE = bytes(b for b in range(128) if chr(b).isspace())
+CONTINUATION_BYTES = bytes(range(0x80, 0xC0))  # UTF-8 bytes that do not start a character
+
+# 256-entry lookup: whitespace -> " ", UTF-8 continuation -> "c", anything else -> "x"
+_CLASSES = bytes(
+    ord(" ") if b in ASCII_WHITESPACE else ord("c") if b in CONTINUATION_BYTES else ord("x") for b in range(256)
+)
+
+ENGINES = ("ascii", "unicode")
+
+
+class Tokenizer(Protocol):
+    """Counts lines, words and characters in consecutive chunks of one stream.
+
+    A copy made with `copy.copy` continues the stream independently of the original.
+    """
+
+    def count(self, chunk: bytes | memoryview, *, in_word: bool) -> tuple[int, int, int, bool]:
+        """Count the next chunk.
+
+        Args:
+            chunk (bytes | memoryview): Next consecutive chunk of the stream.
+            in_word (bool): True if the stream fed so far ends inside a word.
+
+        Returns:
+            tuple[int, int, int, bool]: Lines, words started and characters in the chunk,
+            and whether the stream now ends inside a word.
+        """
+        ...  # pragma: no cover
+
+
+TokenizerFactoryT = Callable[[], Tokenizer]
+
+
+class AsciiTokenizer:
+    """Table-driven tokenizer for UTF-8 and ASCII text, with ASCII whitespace as word separators.
+
+    Every chunk is classified with one `bytes.translate` call, then counted with `bytes.count`,
+    so no Python code runs per byte. Characters are counted as bytes starting a UTF-8 sequence.
+    """
+
+    def count(self, chunk: bytes | memoryview, *, in_word: bool) -> tuple[int, int, int, bool]:
+        """Count the next chunk.
+
+        Args:
+            chunk (bytes | memoryview): Next consecutive chunk of the stream.
+            in_word (bool): True if the stream fed so far ends inside a word.
+
+        Returns:
+            tuple[int, int, int, bool]: Lines, words started and characters in the chunk,
+            and whether the stream now ends inside a word.
+        """
+        if not chunk:
+            return 0, 0, 0, in_word
+        data = bytes(chunk)
+        classes = data.translate(_CLASSES)
+
+        words = classes.count(b" x") + classes.count(b" c")
+        if not in_word and classes[0] != ord(" "):
+            words += 1
+        chars = len(data) - classes.count(b"c")
+        return data.count(b"\n"), words, chars, classes[-1] != ord(" ")
+
+
+class UnicodeTokenizer:
+    """Tokenizer decoding text, with Unicode whitespace as word separators.
+
+    Undecodable bytes are ignored, and characters split between chunks are decoded once complete.
+
+    Args:
+        encoding (str): Text encoding of the stream, UTF-8 by default.
+    """
+
+    def __init__(self, encoding: str = "utf-8") -> None:  # noqa: D107
+        self._encoding = encoding
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors="ignore")
+
+    def __copy__(self) -> Self:
+        """Tokenizer continuing the same stream independently, with its own decoder.
+
+        Returns:
+            Self: Tokenizer with a copy of the decoder state, like bytes of a split character.
+        """
+        tokenizer = type(self)(self._encoding)
+        tokenizer._decoder.setstate(self._decoder.getstate())  # noqa: SLF001
+        return tokenizer
+
+    def count(self, chunk: bytes | memoryview, *, in_word: bool) -> tuple[int, int, int, bool]:
+        """Count the next chunk.
+
+        Args:
+            chunk (bytes | memoryview): Next consecutive chunk of the stream.
+            in_word (bool): True if the stream fed so far ends inside a word.
+
+        Returns:
+            tuple[int, int, int, bool]: Lines, words started and characters in the chunk,
+            and whether the stream now ends inside a word.
+        """
+        text = self._decoder.decode(chunk)
+        if not text:
+            return 0, 0, 0, in_word
+
+        words = len(text.split())
+        if in_word and not text[0].isspace():
+            words -= 1  # continuation of a word started in previous chunks
+        return text.count("\n"), words, len(text), not text[-1].isspace()
+
+
+def tokenizer_factory(engine: str | None = None, encoding: str = "utf-8") -> TokenizerFactoryT:
+    """Choose tokenizer for an engine and encoding.
+
+    Args:
+        engine (str | None): One of `ENGINES`, "ascii" for UTF-8 and "unicode" for other encodings if None.
+        encoding (str): Text encoding of counted files.
+
+    Returns:
+        TokenizerFactoryT: Callable creating a new tokenizer for every counted stream.
+
+    Raises:
+        ValueError: Unknown engine or encoding, or "ascii" engine with encoding other than UTF-8.
+    """
+    try:
+        is_utf8 = codecs.lookup(encoding).name == "utf-8"
+    except LookupError as e:
+        msg = f"Unknown encoding {encoding!r}."
+        raise ValueError(msg) from e
+    if engine is None:
+        engine = "ascii" if is_utf8 else "unicode"
+    if engine not in ENGINES:
+        msg = f"Unknown tokenizer engine {engine!r}, expected one of {ENGINES}."
+        raise ValueError(msg)
+    if engine == "ascii":
+        if not is_utf8:
+            msg = f"Tokenizer engine 'ascii' supports only UTF-8 encoding, not {encoding!r}."
+            raise ValueError(msg)
+        return AsciiTokenizer
+    return partial(UnicodeTokenizer, encoding)
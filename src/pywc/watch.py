@@ -0,0 +1,177 @@
+"""Watching files and directories, keeping totals up to date incrementally."""
+
+import copy
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+
+from pywc.data import FileStats, StatsCounter
+from pywc.navigation import iter_files
+from pywc.reader import ReadStrategy
+from pywc.tokenizer import AsciiTokenizer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+
+    from pywc.tokenizer import TokenizerFactoryT
+
+
+@dataclass(slots=True, kw_only=True)
+class _Entry:
+    """State of a counted file, enough to continue counting after an append.
+
+    Attributes:
+        inode (tuple[int, int]): Device and inode number of the file.
+        mtime_ns (int): Modification time of the file when it was counted.
+        counter (StatsCounter): Counter of the file, continued when the file grows.
+    """
+
+    inode: tuple[int, int]  # st_dev, st_ino
+    mtime_ns: int
+    counter: StatsCounter
+
+
+class Watcher:
+    """Keep statistics of files and directories, re-counting only files that changed.
+
+    Files are polled by stat metadata. A file that kept its inode and grew is treated as an append-only log,
+    so only the appended tail is counted, continuing from the saved counter state.
+    Any other change re-counts the whole file. Nothing is counted until the first poll.
+    Files that cannot be read are left out of the total, and are counted again once they can be read.
+
+    Args:
+        paths (Iterable[Path]): Paths of files or directories to watch.
+        ignored_regexps (Iterable[str]): Regexes to ignore.
+        reader (ReadStrategy | None): How files are read, default strategy if None.
+        tokenizer (TokenizerFactoryT | None): Creates tokenizer for every file, UTF-8 with ASCII whitespace if None.
+        respect_gitignore (bool): Skip paths ignored by .gitignore and .ignore files, see `iter_files`.
+        line_lengths (bool): Also measure the longest line and the histogram of line lengths. The longest line
+            of the total is taken from the files watched after every poll, as it cannot be subtracted.
+        on_error (Callable[[Path, OSError], object] | None): Called with every file that could not be read
+            in a poll, like a file without read permission.
+
+    Attributes:
+        total (FileStats): Aggregated statistics of all watched files as of the last poll.
+    """
+
+    total: FileStats
+
+    def __init__(  # noqa: D107, PLR0913
+        self,
+        paths: Iterable[Path],
+        *,
+        ignored_regexps: Iterable[str] = (),
+        reader: ReadStrategy | None = None,
+        tokenizer: TokenizerFactoryT | None = None,
+        respect_gitignore: bool = False,
+        line_lengths: bool = False,
+        on_error: Callable[[Path, OSError], object] | None = None,
+    ) -> None:
+        self._paths = list(paths)
+        self._ignored_regexps = tuple(ignored_regexps)
+        self._reader = reader or ReadStrategy()
+        self._tokenizer = tokenizer or AsciiTokenizer
+        self._respect_gitignore = respect_gitignore
+        self._line_lengths = line_lengths
+        self._on_error = on_error
+        self._entries: dict[Path, _Entry] = {}
+        self.total = FileStats()
+
+    def poll(self) -> tuple[list[tuple[Path, FileStats]], list[Path]]:
+        """Count new and changed files, and forget removed files.
+
+        The first poll counts every file, like a full `process_path` pass.
+
+        Returns:
+            tuple[list[tuple[Path, FileStats]], list[Path]]: Updated files with their new statistics,
+            and files that are no longer present.
+        """
+        updated: list[tuple[Path, FileStats]] = []
+        seen: set[Path] = set()
+        for path in self._paths:
+            for file in iter_files(
+                path, ignored_regexps=self._ignored_regexps, respect_gitignore=self._respect_gitignore
+            ):
+                if file in seen:
+                    continue
+                seen.add(file)
+                try:
+                    stats = self._update(file)
+                except FileNotFoundError:  # removed between listing and reading
+                    seen.discard(file)
+                    continue
+                except OSError as e:
+                    seen.discard(file)
+                    if self._on_error:
+                        self._on_error(file, e)
+                    continue
+                if stats is not None:
+                    updated.append((file, stats))
+
+        removed = [file for file in self._entries if file not in seen]
+        for file in removed:
+            self.total -= self._entries.pop(file).counter.stats()
+        if self._line_lengths:  # kept as an upper bound by subtraction, so it is found again
+            longest = (max(e.counter.max_line_length, e.counter.line_length) for e in self._entries.values())
+            self.total = replace(self.total, max_line_length=max(longest, default=0))
+        return updated, removed
+
+    def watch(
+        self, interval: float, *, sleep: Callable[[float], object] = time.sleep
+    ) -> Iterator[tuple[list[tuple[Path, FileStats]], list[Path]]]:
+        """Poll forever, yielding only polls that changed something, the first poll is always yielded.
+
+        Args:
+            interval (float): Pause between polls, in seconds.
+            sleep (Callable[[float], object]): Function used to pause between polls.
+
+        Yields:
+            tuple[list[tuple[Path, FileStats]], list[Path]]: Result of `poll`.
+        """
+        yield self.poll()
+        while True:
+            sleep(interval)
+            updated, removed = self.poll()
+            if updated or removed:
+                yield updated, removed
+
+    def _update(self, file: Path) -> FileStats | None:
+        """Count file or its appended tail.
+
+        Args:
+            file (Path): File to count.
+
+        Returns:
+            FileStats | None: New statistics of the file, None if it is unchanged.
+        """
+        st = file.stat()
+        inode = (st.st_dev, st.st_ino)
+        entry = self._entries.get(file)
+        previous, offset = FileStats(), 0
+        if entry is not None:
+            size = entry.counter.bytes
+            if entry.inode == inode and st.st_size == size and st.st_mtime_ns == entry.mtime_ns:
+                return None
+            previous = entry.counter.stats()
+            if entry.inode == inode and st.st_size > size:
+                offset = size  # appended, otherwise replaced, truncated or rewritten in place
+
+        # saved state, including bytes the tokenizer is in the middle of decoding, is continued in a copy,
+        # so that a failed read leaves the saved entry as it was
+        counter = (
+            replace(
+                entry.counter,
+                tokenizer=copy.copy(entry.counter.tokenizer),
+                histogram=list(entry.counter.histogram),
+            )
+            if entry is not None and offset
+            else StatsCounter(tokenizer=self._tokenizer(), line_lengths=self._line_lengths)
+        )
+        for chunk in self._reader.chunks(file, offset=offset):
+            counter.feed(chunk)
+
+        self._entries[file] = _Entry(inode=inode, mtime_ns=st.st_mtime_ns, counter=counter)
+        stats = counter.stats()
+        self.total = self.total - previous + stats
+        return stats
@@ -0,0 +1,95 @@
+"""Test cases for counting members of archives."""
+
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+import pytest
+
+from pywc.archive import ArchiveError, is_archive, iter_members, member_name
+from pywc.data import FileStats
+from pywc.reader import ReadStrategy
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+MEMBERS = {"a.txt": b"one two\n", "dir/b.txt": b"three\nfour\n"}
+
+
+def write_tar(archive: Path, mode: Literal["w", "w:gz", "w:bz2"]) -> Path:
+    """Tar archive with MEMBERS and a directory entry."""
+    with tarfile.open(archive, mode) as tf:
+        directory = tarfile.TarInfo("dir")
+        directory.type = tarfile.DIRTYPE
+        tf.addfile(directory)
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return archive
+
+
+def write_zip(archive: Path) -> Path:
+    """Zip archive with MEMBERS and a directory entry."""
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.mkdir("dir")
+        for name, data in MEMBERS.items():
+            zf.writestr(name, data)
+    return archive
+
+
+class TestIterMembers:
+    """Tests for pywc.archive.iter_members."""
+
+    @pytest.mark.parametrize(("suffix", "mode"), [(".tar", "w"), (".tar.gz", "w:gz"), (".tbz2", "w:bz2")])
+    def test_tar(self, tmp_path: Path, suffix: str, mode: Literal["w", "w:gz", "w:bz2"]) -> None:
+        """Regular members of tar archives are streamed with any compression."""
+        archive = write_tar(tmp_path / f"bundle{suffix}", mode)
+        members = {name: FileStats.from_chunks(chunks) for name, chunks in iter_members(archive)}
+        assert members == {member_name(archive, name): FileStats.from_chunks([data]) for name, data in MEMBERS.items()}
+
+    def test_zip(self, tmp_path: Path) -> None:
+        """Regular members of zip archives are decompressed while counted."""
+        archive = write_zip(tmp_path / "bundle.zip")
+        members = {name: FileStats.from_chunks(chunks) for name, chunks in iter_members(archive)}
+        assert members == {member_name(archive, name): FileStats.from_chunks([data]) for name, data in MEMBERS.items()}
+
+    def test_tar_is_read_as_stream(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """Tar archive is opened in streaming mode, so it is read once without seeking."""
+        archive = write_tar(tmp_path / "bundle.tar", "w")
+        tar_open = mocker.spy(tarfile, "open")
+        list(iter_members(archive, reader=ReadStrategy(buffer_size=4096)))
+        tar_open.assert_called_once_with(archive, mode="r|*", bufsize=4096)
+
+    def test_invalid_archive(self, tmp_path: Path) -> None:
+        """File with an archive name but other contents is an error."""
+        archive = tmp_path / "bundle.tar.gz"
+        archive.write_bytes(b"not an archive")
+        with pytest.raises(ArchiveError, match=r"bundle\.tar\.gz is not a valid archive"):
+            list(iter_members(archive))
+
+    @pytest.mark.parametrize("name", ["bundle.tar.gz", "bundle.zip"])
+    def test_truncated_archive(self, tmp_path: Path, name: str) -> None:
+        """Archive ending within a member is an error, also while the member is read."""
+        archive = tmp_path / name
+        if name.endswith(".zip"):
+            write_zip(archive)
+        else:
+            write_tar(archive, "w:gz")
+        archive.write_bytes(archive.read_bytes()[:60])
+        with pytest.raises(ArchiveError):
+            [list(chunks) for _, chunks in iter_members(archive)]
+
+
+class TestIsArchive:
+    """Tests for pywc.archive.is_archive."""
+
+    @pytest.mark.parametrize(
+        ("name", "expected"),
+        [("a.tar", True), ("a.TAR.GZ", True), ("a.tgz", True), ("a.zip", True), ("a.gz", False), ("tar", False)],
+    )
+    def test_by_name(self, name: str, expected: bool) -> None:  # noqa: FBT001
+        """Archives are recognized by their suffix."""
+        assert is_archive(Path(name)) is expected
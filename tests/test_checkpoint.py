@@ -0,0 +1,101 @@
+"""Test cases for saving and resuming progress of a run."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from pywc.checkpoint import Checkpoint
+from pywc.data import FileStats
+
+
+@pytest.fixture
+def checkpoint_file(tmp_path: Path) -> Path:
+    """Location of a checkpoint, not created yet."""
+    return tmp_path / "run.checkpoint"
+
+
+class TestCheckpoint:
+    """Tests for pywc.checkpoint.Checkpoint."""
+
+    def test_save_and_load(self, checkpoint_file: Path) -> None:
+        """Loaded checkpoint continues with the same totals and done paths."""
+        checkpoint = Checkpoint(checkpoint_file)
+        checkpoint.file_done(Path("a/x.txt"), FileStats(lines=1, words=2, chars=3, bytes=4))
+        checkpoint.save()
+
+        loaded = Checkpoint.load(checkpoint_file)
+        assert loaded.total == FileStats(lines=1, words=2, chars=3, bytes=4)
+        assert loaded.is_done(Path("a/x.txt"))
+        assert not loaded.is_done(Path("a/y.txt"))
+
+    def test_groups_are_saved(self, checkpoint_file: Path) -> None:
+        """Group totals are resumed with the checkpoint."""
+        checkpoint = Checkpoint(checkpoint_file)
+        checkpoint.groups[".py"] = FileStats(lines=1, words=1, chars=1, bytes=1)
+        checkpoint.save()
+        assert Checkpoint.load(checkpoint_file).groups == checkpoint.groups
+
+    def test_load_missing_file_starts_empty(self, checkpoint_file: Path) -> None:
+        """Resuming a run that never saved starts from scratch."""
+        checkpoint = Checkpoint.load(checkpoint_file)
+        assert checkpoint.total == FileStats()
+        assert not checkpoint.done
+
+    @pytest.mark.parametrize("content", ["{", "[]", '{"version": 0}', '{"version": 1, "done": []}', "\xff"])
+    def test_load_invalid_file(self, checkpoint_file: Path, content: str) -> None:
+        """Anything but a saved checkpoint is rejected."""
+        checkpoint_file.write_text(content, encoding="latin-1")
+        with pytest.raises(ValueError, match="checkpoint"):
+            Checkpoint.load(checkpoint_file)
+
+    def test_done_directory_replaces_descendants(self, checkpoint_file: Path) -> None:
+        """Frontier keeps finished directories, not their files."""
+        checkpoint = Checkpoint(checkpoint_file)
+        checkpoint.file_done(Path("a/x.txt"), FileStats())
+        checkpoint.file_done(Path("a/b/y.txt"), FileStats())
+        checkpoint.directory_done(Path("a/b"))
+        assert list(checkpoint.done) == [Path("a/x.txt"), Path("a/b")]
+
+        checkpoint.directory_done(Path("a"))
+        assert list(checkpoint.done) == [Path("a")]
+
+    def test_done_directory_replaces_resumed_descendants(self, checkpoint_file: Path) -> None:
+        """Descendants from the interrupted run are replaced even when not at the end of the frontier."""
+        checkpoint = Checkpoint(checkpoint_file)
+        checkpoint.file_done(Path("a/b/x.txt"), FileStats())
+        checkpoint.save()
+
+        resumed = Checkpoint.load(checkpoint_file)
+        resumed.file_done(Path("a/y.txt"), FileStats())
+        resumed.file_done(Path("a/b/z.txt"), FileStats())
+        resumed.directory_done(Path("a/b"))
+        assert list(resumed.done) == [Path("a/y.txt"), Path("a/b")]
+
+    def test_done_directory_keeps_other_resumed_paths(self, checkpoint_file: Path) -> None:
+        """Only resumed paths inside the directory are replaced, however deep they are."""
+        checkpoint = Checkpoint(checkpoint_file)
+        checkpoint.file_done(Path("a/b/c/x.txt"), FileStats())
+        checkpoint.file_done(Path("ab/y.txt"), FileStats())
+        checkpoint.save()
+
+        resumed = Checkpoint.load(checkpoint_file)
+        resumed.directory_done(Path("a"))
+        assert list(resumed.done) == [Path("ab/y.txt"), Path("a")]
+
+    def test_saves_periodically(self, checkpoint_file: Path) -> None:
+        """Marking paths done saves once the interval has passed."""
+        checkpoint = Checkpoint(checkpoint_file, interval=0)
+        checkpoint.file_done(Path("x.txt"), FileStats(lines=1, words=1, chars=1, bytes=1))
+        assert json.loads(checkpoint_file.read_text())["done"] == ["x.txt"]
+
+        slow = Checkpoint(checkpoint_file, interval=3600)
+        slow.file_done(Path("y.txt"), FileStats())
+        assert json.loads(checkpoint_file.read_text())["done"] == ["x.txt"]
+
+    def test_save_is_compact(self, checkpoint_file: Path) -> None:
+        """Checkpoint is written without whitespace and without leftover temporary files."""
+        checkpoint = Checkpoint(checkpoint_file)
+        checkpoint.save()
+        assert " " not in checkpoint_file.read_text()
+        assert list(checkpoint_file.parent.iterdir()) == [checkpoint_file]
@@ -1,5 +1,6 @@
 """Tests for CLI of pywc package."""
 
+import tarfile
 from importlib.metadata import version
 from pathlib import Path
 from types import SimpleNamespace
@@ -9,15 +10,16 @@ import pytest
 from click.testing import CliRunner
 
 from pywc.console import main
+from pywc.data import FileStats
+from pywc.reader import ReadStrategy
+from pywc.tokenizer import AsciiTokenizer, UnicodeTokenizer
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Sequence
+    from collections.abc import Iterable, Iterator, Sequence
     from unittest.mock import Mock
 
     from pytest_mock import MockerFixture
 
-    from pywc.data import FileStats
-
 
 @pytest.fixture
 def runner() -> CliRunner:
@@ -78,6 +80,8 @@ class TestConsole:
             lines=True,
             chars=True,
             words=True,
+            max_line_length=False,
+            histogram=False,
         )
 
     @pytest.mark.parametrize(
@@ -130,7 +134,28 @@ class TestConsole:
         paths = [str(p) for p in [small_file, small_file]]
         runner.invoke(main, paths)
         assert mocked.mock_process_path.call_count == len(paths)
-        expected_calls = [mocker.call(Path(p), mocker.ANY, ignored_regexps=[], formatter=mocker.ANY) for p in paths]
+        expected_calls = [
+            mocker.call(
+                Path(p),
+                mocker.ANY,
+                ignored_regexps=[],
+                respect_gitignore=False,
+                archives=False,
+                workers=1,
+                formatter=mocker.ANY,
+                reader=mocker.ANY,
+                tokenizer=mocker.ANY,
+                limits=mocker.ANY,
+                checkpoint=None,
+                groups=None,
+                shard=None,
+                record=None,
+                store=None,
+                metrics=mocker.ANY,
+                on_archive_error=mocker.ANY,
+            )
+            for p in paths
+        ]
         mocked.mock_process_path.assert_has_calls(expected_calls, any_order=False)
 
     @pytest.mark.parametrize(
@@ -189,3 +214,394 @@ class TestConsole:
         assert stats.lines == 2 * small_file_stats.lines
         assert stats.words == 2 * small_file_stats.words
         assert stats.chars == 2 * small_file_stats.chars
+
+    @pytest.mark.usefixtures("small_file")
+    def test_estimate_prints_total_and_margins(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Estimate mode without budget reads everything, so it reports an exact total with zero margins."""
+        result = runner.invoke(main, ["--estimate", "--seed", "1", "-l", str(tmp_path)])
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [f"{'TOTAL:':<20s} {11:7d}", f"{'±95%:':<20s} {'±0':>7s}"]
+
+    def test_exact_estimate_is_not_clamped(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Estimate reading every block prints true counts, even with more lines than words."""
+        (tmp_path / "blank.txt").write_bytes(b"a\n\n\n\n")
+        result = runner.invoke(main, ["--estimate", "-lwm", str(tmp_path)])
+        assert result.exit_code == 0
+        assert result.output.splitlines()[0] == f"{'TOTAL:':<20s} {4:7d} {1:7d} {5:7d}"
+
+    def test_estimate_with_budget_is_marked(self, runner: CliRunner, large_file: Path) -> None:
+        """Partially sampled totals are printed as an estimate."""
+        result = runner.invoke(main, ["--estimate", "--budget-bytes", "1", str(large_file)])
+        assert result.exit_code == 0
+        assert result.output.startswith("ESTIMATE:")
+
+    @pytest.mark.parametrize(
+        ("buffer_args", "expected_reader"),
+        [
+            ([], ReadStrategy()),
+            (["--buffer-size", "auto"], ReadStrategy(buffer_size=None)),
+            (["--buffer-size", "4096", "--no-buffer-reuse"], ReadStrategy(buffer_size=4096, reuse_buffer=False)),
+            (["--fadvise-sequential", "--direct-io"], ReadStrategy(sequential=True, direct=True)),
+        ],
+    )
+    def test_read_options_are_passed_to_process_path(
+        self,
+        runner: CliRunner,
+        buffer_args: Iterable[str],
+        expected_reader: ReadStrategy,
+        mocked: SimpleNamespace,
+        small_file: Path,
+    ) -> None:
+        """Read strategy is built from buffer options."""
+        runner.invoke(main, [*buffer_args, str(small_file)])
+        assert mocked.mock_process_path.call_args[1]["reader"] == expected_reader
+
+    @pytest.mark.parametrize("size", ["0", "-1", "big"])
+    def test_invalid_buffer_size(self, runner: CliRunner, size: str) -> None:
+        """Buffer size must be positive integer or auto."""
+        result = runner.invoke(main, ["--buffer-size", size])
+        assert result.exit_code != 0
+
+    def test_watch_prints_updates_until_interrupted(
+        self, runner: CliRunner, mocker: MockerFixture, small_file: Path, small_file_stats: FileStats
+    ) -> None:
+        """Every yielded poll prints updated files and the new total, Ctrl-C ends watching cleanly."""
+        watcher = mocker.patch("pywc.console.Watcher").return_value
+        watcher.total = small_file_stats
+
+        def polls(_interval: float) -> Iterator[tuple[list[tuple[Path, FileStats]], list[Path]]]:
+            yield [(small_file, small_file_stats)], []
+            yield [], [small_file]
+            raise KeyboardInterrupt
+
+        watcher.watch.side_effect = polls
+        result = runner.invoke(main, ["--watch", "--interval", "0.5", "-l", str(small_file)])
+
+        assert result.exit_code == 0
+        watcher.watch.assert_called_once_with(0.5)
+        assert result.output.splitlines() == [
+            f"{small_file!s:<20s} {small_file_stats.lines:7d}",
+            f"{'TOTAL:':<20s} {small_file_stats.lines:7d}",
+            f"{'TOTAL:':<20s} {small_file_stats.lines:7d}",
+        ]
+
+    def test_watch_quiet_prints_only_totals(
+        self, runner: CliRunner, mocker: MockerFixture, small_file: Path, small_file_stats: FileStats
+    ) -> None:
+        """Updated files are not printed with --quiet, every poll still prints the total."""
+        watcher = mocker.patch("pywc.console.Watcher").return_value
+        watcher.total = small_file_stats
+
+        def polls(_interval: float) -> Iterator[tuple[list[tuple[Path, FileStats]], list[Path]]]:
+            yield [(small_file, small_file_stats)], []
+            raise KeyboardInterrupt
+
+        watcher.watch.side_effect = polls
+        result = runner.invoke(main, ["--watch", "-q", "-l", str(small_file)])
+
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [f"{'TOTAL:':<20s} {small_file_stats.lines:7d}"]
+
+    def test_watch_reports_unreadable_files(self, runner: CliRunner, mocker: MockerFixture, tmp_path: Path) -> None:
+        """Files the watcher cannot read are printed like in counting runs, and watching goes on."""
+        watcher_class = mocker.patch("pywc.console.Watcher")
+        watcher_class.return_value.total = FileStats()
+
+        def polls(_interval: float) -> Iterator[tuple[list[tuple[Path, FileStats]], list[Path]]]:
+            on_error = watcher_class.call_args.kwargs["on_error"]
+            on_error(tmp_path / "denied.txt", PermissionError(13, "Permission denied"))
+            on_error(tmp_path / "broken.txt", OSError(5, "Input/output error"))
+            yield [], []
+            raise KeyboardInterrupt
+
+        watcher_class.return_value.watch.side_effect = polls
+        result = runner.invoke(main, ["--watch", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert result.output.splitlines()[:2] == [
+            f"{tmp_path / 'denied.txt'} - Permission denied",
+            f"{tmp_path / 'broken.txt'} - Input/output error",
+        ]
+
+    @pytest.mark.parametrize(
+        ("tokenizer_args", "expected_type"),
+        [
+            ([], AsciiTokenizer),
+            (["--tokenizer", "unicode"], UnicodeTokenizer),
+            (["--encoding", "utf-16"], UnicodeTokenizer),
+        ],
+    )
+    def test_tokenizer_is_passed_to_process_path(
+        self,
+        runner: CliRunner,
+        tokenizer_args: Iterable[str],
+        expected_type: type,
+        mocked: SimpleNamespace,
+        small_file: Path,
+    ) -> None:
+        """Tokenizer engine is chosen from --tokenizer and --encoding."""
+        runner.invoke(main, [*tokenizer_args, str(small_file)])
+        factory = mocked.mock_process_path.call_args[1]["tokenizer"]
+        assert isinstance(factory(), expected_type)
+
+    @pytest.mark.parametrize("tokenizer_args", [["--tokenizer", "ascii", "--encoding", "utf-16"], ["--encoding", "no"]])
+    def test_invalid_tokenizer(self, runner: CliRunner, tokenizer_args: list[str]) -> None:
+        """Incompatible engine and encoding are reported as usage errors."""
+        result = runner.invoke(main, tokenizer_args)
+        assert result.exit_code == 2  # noqa: PLR2004
+
+    def test_limit_prints_incomplete_total(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Hitting a limit prints partial totals marked as incomplete and skips remaining paths."""
+        for name in "abc":
+            (tmp_path / f"{name}.txt").write_text("word\n")
+        result = runner.invoke(main, ["-l", "--max-files", "2", str(tmp_path), str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert result.stdout.splitlines()[-1] == f"{'TOTAL (incomplete):':<20s} {2:7d}"
+        assert "maximum of 2 files" in result.stderr
+
+    def test_resume_continues_interrupted_run(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Resumed run skips files counted before the interruption and prints the complete total."""
+        tree = tmp_path / "tree"
+        tree.mkdir()
+        for name in "abc":
+            (tree / f"{name}.txt").write_text("word\n")
+        checkpoint = tmp_path / "run.checkpoint"
+
+        first = runner.invoke(main, ["-l", "--checkpoint", str(checkpoint), "--max-files", "2", str(tree)])
+        assert first.stdout.splitlines()[-1] == f"{'TOTAL (incomplete):':<20s} {2:7d}"
+
+        resumed = runner.invoke(main, ["-l", "--checkpoint", str(checkpoint), "--resume", str(tree)])
+        assert resumed.exit_code == 0
+        *files, total = resumed.stdout.splitlines()
+        assert len(files) == 1  # only the file not counted before
+        assert total == f"{'TOTAL:':<20s} {3:7d}"
+
+    def test_resume_requires_checkpoint(self, runner: CliRunner, small_file: Path) -> None:
+        """Nothing can be resumed without a checkpoint file."""
+        result = runner.invoke(main, ["--resume", str(small_file)])
+        assert result.exit_code == 2  # noqa: PLR2004
+
+    def test_resume_invalid_checkpoint(self, runner: CliRunner, small_file: Path, tmp_path: Path) -> None:
+        """Corrupted checkpoint is a usage error."""
+        checkpoint = tmp_path / "run.checkpoint"
+        checkpoint.write_text("{")
+        result = runner.invoke(main, ["--checkpoint", str(checkpoint), "--resume", str(small_file)])
+        assert result.exit_code == 2  # noqa: PLR2004
+
+    def test_respect_gitignore(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Ignored files are not counted."""
+        (tmp_path / ".gitignore").write_text("*.log\n")
+        (tmp_path / "debug.log").write_text("a\nb\n")
+        (tmp_path / "main.py").write_text("print()\n")
+        result = runner.invoke(main, ["-l", "--respect-gitignore", str(tmp_path)])
+        assert result.stdout.splitlines()[-1] == f"{'TOTAL:':<20s} {2:7d}"
+
+    def test_group_by_prints_table_before_total(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Quiet group-by prints only the group table and the total."""
+        (tmp_path / "a.py").write_text("1\n2\n")
+        (tmp_path / "b.py").write_text("3\n")
+        (tmp_path / "c.txt").write_text("4\n")
+        result = runner.invoke(main, ["-l", "-q", "--group-by", "ext", str(tmp_path)])
+
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [
+            f"{'group':<20s} {'lines':>7s}",
+            f"{'.py':<20s} {3:7d}",
+            f"{'.txt':<20s} {1:7d}",
+            f"{'TOTAL:':<20s} {4:7d}",
+        ]
+
+    def test_group_by_dir_of_archive(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Archive given on the command line is grouped as a file, with all its members."""
+        archive = tmp_path / "bundle.tar"
+        member = tmp_path / "a.txt"
+        member.write_text("1\n2\n")
+        with tarfile.open(archive, "w") as tf:
+            tf.add(member, arcname="sub/a.txt")
+        result = runner.invoke(main, ["-l", "-q", "--archives", "--group-by", "dir", str(archive)])
+
+        assert result.exit_code == 0
+        assert result.stdout.splitlines()[1:] == [f"{'.':<20s} {2:7d}", f"{'TOTAL:':<20s} {2:7d}"]
+
+    def test_group_map(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Glob map entries name the groups."""
+        (tmp_path / "a.py").write_text("1\n")
+        (tmp_path / "b.txt").write_text("2\n")
+        result = runner.invoke(main, ["-l", "-q", "--group-by", "glob-map", "--group-map", "*.py=code", str(tmp_path)])
+        assert result.stdout.splitlines()[1:3] == [f"{'code':<20s} {1:7d}", f"{'other':<20s} {1:7d}"]
+
+    def test_invalid_group_map(self, runner: CliRunner) -> None:
+        """Glob map entries must have a group name."""
+        result = runner.invoke(main, ["--group-by", "glob-map", "--group-map", "*.py"])
+        assert result.exit_code == 2  # noqa: PLR2004
+
+    def test_archives(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Archive members are printed with the archive name."""
+        archive = tmp_path / "bundle.tar.gz"
+        member = tmp_path / "member.txt"
+        member.write_text("1\n2\n")
+        with tarfile.open(archive, "w:gz") as tf:
+            tf.add(member, arcname="docs/member.txt")
+        member.unlink()
+
+        result = runner.invoke(main, ["-l", "--archives", str(archive)])
+        assert result.stdout.splitlines() == [f"{archive}!/docs/member.txt {2:7d}", f"{'TOTAL:':<20s} {2:7d}"]
+
+    def test_invalid_archive_is_counted_as_plain_file(self, runner: CliRunner, tmp_path: Path) -> None:
+        """File with an archive name that is not an archive is reported, and the run goes on."""
+        archive = tmp_path / "bundle.zip"
+        archive.write_text("1\n2\n")
+
+        result = runner.invoke(main, ["-l", "--archives", str(archive)])
+        assert result.exit_code == 0
+        assert result.stdout.splitlines() == [f"{archive} {2:7d}", f"{'TOTAL:':<20s} {2:7d}"]
+        assert f"{archive} is not a valid archive" in result.stderr
+        assert "counted as a plain file" in result.stderr
+
+    @pytest.mark.parametrize("flags", [[], ["-lL", "--line-histogram"]])
+    def test_sharded_run_merges_into_single_run_output(
+        self, runner: CliRunner, tmp_path: Path, flags: list[str]
+    ) -> None:
+        """Merging partial results of all shards prints the same output as a single run."""
+        tree = tmp_path / "tree"
+        for i in range(12):
+            (tree / str(i % 3)).mkdir(parents=True, exist_ok=True)
+            (tree / str(i % 3) / f"{i}.txt").write_text("word\n" * i)
+        (tree / "top.txt").write_text("top\n")
+        single = runner.invoke(main, [*flags, str(tree), str(tree / "0")])
+
+        partials = [str(tmp_path / f"{k}.jsonl") for k in (1, 2, 3)]
+        for k, partial in enumerate(partials, start=1):
+            result = runner.invoke(
+                main, [*flags, "-q", "--shard", f"{k}/3", "--emit-partial", partial, str(tree), str(tree / "0")]
+            )
+            assert result.exit_code == 0
+
+        merged = runner.invoke(main, ["merge", *flags, *reversed(partials)])
+        assert merged.exit_code == 0
+        assert merged.stdout == single.stdout
+
+    def test_merge_missing_shard(self, runner: CliRunner, tmp_path: Path, small_file: Path) -> None:
+        """Merging an incomplete set of shards is a usage error."""
+        partial = tmp_path / "1.jsonl"
+        runner.invoke(main, ["--shard", "1/2", "--emit-partial", str(partial), str(small_file)])
+        result = runner.invoke(main, ["merge", str(partial)])
+        assert result.exit_code == 2  # noqa: PLR2004
+        assert "once each" in result.output
+
+    @pytest.mark.parametrize("shard", ["0/2", "x"])
+    def test_invalid_shard(self, runner: CliRunner, shard: str) -> None:
+        """Shard must be K/N."""
+        result = runner.invoke(main, ["--shard", shard])
+        assert result.exit_code == 2  # noqa: PLR2004
+
+    def test_emit_partial_cannot_resume(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Records of a resumed run would have different ordinals."""
+        args = ["--checkpoint", str(tmp_path / "c"), "--resume", "--emit-partial", str(tmp_path / "p")]
+        result = runner.invoke(main, args)
+        assert result.exit_code == 2  # noqa: PLR2004
+
+    def test_emit_partial_cannot_group(self, runner: CliRunner, small_file: Path, tmp_path: Path) -> None:
+        """Group totals are not recorded in partial results, so they are rejected instead of lost by merge."""
+        result = runner.invoke(main, ["--group-by", "ext", "--emit-partial", str(tmp_path / "p"), str(small_file)])
+        assert result.exit_code == 2  # noqa: PLR2004
+        assert "--group-by" in result.output
+        assert not (tmp_path / "p").exists()
+
+    def test_jobs_fall_back_to_single_thread_with_gil(
+        self, runner: CliRunner, small_file: Path, mocker: MockerFixture
+    ) -> None:
+        """Requested threads are passed on, with a note when the GIL makes them useless."""
+        mocker.patch("pywc.console.gil_enabled", return_value=True)
+        result = runner.invoke(main, ["-j", "4", str(small_file)])
+        assert result.exit_code == 0
+        assert "GIL is enabled" in result.stderr
+        assert "TOTAL:" in result.stdout
+
+    def test_jobs_report_worker_utilization(self, runner: CliRunner, small_file: Path, mocker: MockerFixture) -> None:
+        """Utilization of several counting threads is printed to stderr."""
+        mocker.patch("pywc.console.gil_enabled", return_value=False)
+        mocker.patch("pywc.console.effective_workers", side_effect=lambda workers: workers)
+        result = runner.invoke(main, ["-j", "4", str(small_file)])
+        assert result.exit_code == 0
+        assert "Worker utilization:" in result.stderr
+        assert "of 4 threads" in result.stderr
+        assert "Worker" not in result.stdout
+
+    def test_max_line_length_alone(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Longest line alone is printed without the default counts, like GNU wc -L."""
+        file = tmp_path / "f.txt"
+        file.write_text("short\n" + "x" * 50 + "\nend")
+        result = runner.invoke(main, ["-L", "--line-histogram", str(file)])
+        assert result.exit_code == 0
+        lines = result.stdout.splitlines()
+        assert lines[0].split() == [str(file), "50"]
+        assert lines[1].split() == ["TOTAL:", "50"]
+        assert lines[2].split() == ["line", "length", "lines"]
+        assert sum(int(line.split()[1]) for line in lines[3:]) == 3  # noqa: PLR2004
+
+    @pytest.mark.parametrize("args", [["--encoding", "utf-16-le"], ["--tokenizer", "unicode"]])
+    def test_estimate_requires_ascii_tokenizer(self, runner: CliRunner, small_file: Path, args: list[str]) -> None:
+        """Byte ranges of decoded text do not add up, so they cannot be sampled."""
+        result = runner.invoke(main, ["--estimate", *args, str(small_file)])
+        assert result.exit_code == 2  # noqa: PLR2004
+        assert "'ascii' tokenizer" in result.output
+
+    def test_line_lengths_cannot_be_estimated(self, runner: CliRunner, small_file: Path) -> None:
+        """Sampling cannot find the longest line."""
+        result = runner.invoke(main, ["--estimate", "-L", str(small_file)])
+        assert result.exit_code == 2  # noqa: PLR2004
+
+    def test_top_files_are_printed_largest_first(self, runner: CliRunner, tmp_path: Path) -> None:
+        """Files are collected and only the largest are printed, the total still covers every file."""
+        for i in range(5):
+            (tmp_path / f"{i}.txt").write_text("word\n" * i)
+        result = runner.invoke(main, ["-l", "--sort-by", "lines", "--top", "2", str(tmp_path)])
+        assert result.exit_code == 0
+        assert [line.split() for line in result.stdout.splitlines()] == [
+            [str(tmp_path / "4.txt"), "4"],
+            [str(tmp_path / "3.txt"), "3"],
+            ["TOTAL:", "10"],
+        ]
+
+    @pytest.mark.parametrize("mode", ["--watch", "--estimate"])
+    @pytest.mark.parametrize(
+        "option",
+        [
+            ["--max-files", "1"],
+            ["--max-bytes", "1"],
+            ["--timeout", "1"],
+            ["--max-open-files", "1"],
+            ["--group-by", "ext"],
+            ["--archives"],
+            ["--shard", "1/2"],
+            ["--emit-partial", "partial"],
+            ["--checkpoint", "checkpoint"],
+            ["--resume"],
+            ["--sort-by", "lines"],
+            ["--top", "1"],
+        ],
+    )
+    def test_counting_only_options_are_rejected(
+        self, runner: CliRunner, small_file: Path, mode: str, option: list[str]
+    ) -> None:
+        """Limits, grouping, sorting, archives, shards and checkpoints are not silently ignored by other modes."""
+        result = runner.invoke(main, [mode, *option, str(small_file)])
+        assert result.exit_code == 2  # noqa: PLR2004
+        assert option[0] in result.output
+
+    def test_metrics_file(self, runner: CliRunner, tmp_path: Path, small_file: Path) -> None:
+        """Metrics of the run are written when it ends."""
+        metrics_file = tmp_path / "pywc.prom"
+        result = runner.invoke(main, ["--metrics-file", str(metrics_file), str(small_file)])
+        assert result.exit_code == 0
+        text = metrics_file.read_text()
+        assert "pywc_files 1\n" in text
+        assert f"pywc_read_bytes {small_file.stat().st_size}\n" in text
+        assert text.endswith("# EOF\n")
+
+    def test_metrics_file_needs_counting_run(self, runner: CliRunner, tmp_path: Path, small_file: Path) -> None:
+        """Watching never ends, so it writes no metrics."""
+        result = runner.invoke(main, ["--watch", "--metrics-file", str(tmp_path / "m.prom"), str(small_file)])
+        assert result.exit_code == 2  # noqa: PLR2004
@@ -1,6 +1,6 @@
 """Test cases for the data classes necessary for pywc."""
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -8,7 +8,8 @@ if TYPE_CHECKING:
 
 import pytest
 
-from pywc.data import FileStats
+from pywc.data import FileStats, StatsCounter
+from pywc.tokenizer import ASCII_WHITESPACE
 
 
 class TestFileStats:
@@ -45,6 +46,38 @@ class TestFileStats:
         assert c.chars == a.chars + b.chars
         assert c.bytes == a.bytes + b.bytes
 
+    def test_sub(self) -> None:
+        """Subtract respective fields, inverse of add."""
+        a = FileStats(lines=111, words=222, chars=333, bytes=444)
+        b = FileStats(lines=11, words=22, chars=33, bytes=44)
+        assert (a + b) - b == a
+
+    def test_add_line_lengths(self) -> None:
+        """Longest line is the longer one, histograms of different length are added per bucket."""
+        a = FileStats(lines=1, words=1, chars=1, bytes=1, max_line_length=5, histogram=(1, 0, 0, 2))
+        b = FileStats(lines=1, words=1, chars=1, bytes=1, max_line_length=9, histogram=(0, 1))
+        c = a + b
+        assert c.max_line_length == 9  # noqa: PLR2004
+        assert c.histogram == (1, 1, 0, 2)
+        assert (c - b).histogram == a.histogram
+        assert (c - a).histogram == b.histogram
+
+    def test_histogram_from_json_list(self) -> None:
+        """Histogram loaded from JSON as a list is stored as a tuple, so that it compares equal."""
+        assert FileStats(histogram=cast("tuple[int, ...]", [1, 2])) == FileStats(histogram=(1, 2))
+
+    def test_negative_histogram(self) -> None:
+        """Histogram buckets are non-negative."""
+        with pytest.raises(ValueError):
+            FileStats(histogram=(1, -1))
+
+    def test_line_lengths_are_measured_only_on_request(self, small_file: Path) -> None:
+        """Default statistics do not pay for measuring lines."""
+        assert FileStats.from_file(small_file).histogram == ()
+        stats = FileStats.from_file(small_file, line_lengths=True)
+        assert stats.max_line_length > 0
+        assert sum(stats.histogram) >= stats.lines
+
     def test_from_small_file(self, small_file: Path, small_file_stats: FileStats) -> None:
         """Handle small files."""
         res = FileStats.from_file(small_file)
@@ -72,3 +105,60 @@ class TestFileStats:
         assert res.lines == 1
         assert res.words == chunk_size
         assert res.chars == 3 * chunk_size
+
+
+class TestStatsCounter:
+    """Tests for pywc.data.StatsCounter."""
+
+    @pytest.mark.parametrize("split", [0, 1, 3, 4, 5, 7, 9])
+    def test_split_ranges_are_additive(self, split: int) -> None:
+        """Counters of adjacent ranges add up, if word state of preceding byte is passed on."""
+        data = "ab cd\n日本語 x\n".encode()
+        whole = StatsCounter()
+        whole.feed(data)
+
+        head, tail = StatsCounter(), StatsCounter(in_word=split > 0 and data[split - 1] not in ASCII_WHITESPACE)
+        head.feed(data[:split])
+        tail.feed(data[split:])
+
+        assert (head.lines + tail.lines, head.words + tail.words, head.bytes + tail.bytes) == (
+            whole.lines,
+            whole.words,
+            whole.bytes,
+        )
+        assert whole.words == 4  # noqa: PLR2004
+
+    def test_stats(self, large_file: Path, large_file_stats: FileStats) -> None:
+        """Statistics of a fully fed file are the same as from_file."""
+        counter = StatsCounter()
+        counter.feed(large_file.read_bytes())
+        assert counter.stats() == large_file_stats
+
+    def test_multibyte_character_split_between_chunks(self) -> None:
+        """Characters are decoded across chunk boundaries."""
+        counter = StatsCounter()
+        data = "ж".encode()
+        counter.feed(data[:1])
+        counter.feed(data[1:])
+        assert counter.chars == 1
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 100])
+    def test_line_lengths_across_chunks(self, chunk_size: int) -> None:
+        """Lines split between chunks are measured whole, a last line without newline is included."""
+        data = b"abc\n\n" + b"x" * 17 + b"\nlast"
+        counter = StatsCounter(line_lengths=True)
+        for start in range(0, len(data), chunk_size):
+            counter.feed(data[start : start + chunk_size])
+        stats = counter.stats()
+        assert stats.max_line_length == 17  # noqa: PLR2004
+        # lengths 3, 0, 17 and 4 fall into buckets 2, 0, 5 and 3
+        assert stats.histogram == (1, 0, 1, 1, 0, 1)
+
+    def test_line_lengths_continue_after_stats(self) -> None:
+        """Unterminated line is reported by stats, and keeps growing when more is fed."""
+        counter = StatsCounter(line_lengths=True)
+        counter.feed(b"ab")
+        assert counter.stats().max_line_length == 2  # noqa: PLR2004
+        counter.feed(memoryview(b"cdef\n"))
+        assert counter.stats().max_line_length == 6  # noqa: PLR2004
+        assert counter.stats().histogram == (0, 0, 0, 1)
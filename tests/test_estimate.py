@@ -0,0 +1,89 @@
+"""Test cases for sampling estimator of pywc."""
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pywc.data import CounterFlags, FileStats
+from pywc.estimate import COUNTS, estimate_paths
+from pywc.navigation import process_path
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+
+def counts(stats: FileStats) -> dict[str, int]:
+    """Counts of statistics, as estimated."""
+    return {name: getattr(stats, name) for name in COUNTS}
+
+
+class TestEstimatePaths:
+    """Tests for pywc.estimate.estimate_paths function."""
+
+    def test_unlimited_budget_is_exact(self, tmp_path: Path, large_file: Path, small_file: Path) -> None:
+        """Without a budget every block is read, so estimate equals exact statistics with zero margins."""
+        result = estimate_paths([tmp_path], seed=1)
+        assert result.exact
+        assert result.counts == counts(FileStats.from_file(large_file) + FileStats.from_file(small_file))
+        assert result.margins == {"lines": 0, "words": 0, "chars": 0, "bytes": 0}
+
+    def test_blocks_are_additive(
+        self, tmp_path: Path, create_file: Callable[[int, int, int, str | None], Path]
+    ) -> None:
+        """Words split by block boundaries are counted once."""
+        file = create_file(1, 100, 1000, None)
+        result = estimate_paths([tmp_path], block_size=7, seed=1)
+        assert result.counts == counts(FileStats.from_file(file))
+
+    def test_byte_budget_samples_part_of_blocks(self, large_file: Path, large_file_stats: FileStats) -> None:
+        """Budget stops sampling early, bytes stay exact and true value is inside the interval."""
+        block_size = 2**12
+        result = estimate_paths([large_file], byte_budget=20 * block_size, block_size=block_size, seed=1)
+        assert not result.exact
+        assert result.sampled_bytes <= 21 * block_size
+        assert result.counts["bytes"] == large_file_stats.bytes
+        for field in ("lines", "words", "chars"):
+            assert abs(result.counts[field] - getattr(large_file_stats, field)) <= result.margins[field]
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_line_heavy_samples_are_estimated(self, tmp_path: Path, seed: int) -> None:
+        """Samples of blank lines alone estimate more lines than words, which is not an error."""
+        file = tmp_path / "blank.txt"
+        file.write_bytes((b"a b c d e f g h " * 3 + b"\n" * 16) * 16)
+        result = estimate_paths([file], byte_budget=32, block_size=16, seed=seed)
+        assert not result.exact
+        assert result.counts["bytes"] == file.stat().st_size
+
+    def test_exact_counts_are_not_clamped(self, tmp_path: Path) -> None:
+        """Every block read gives the true counts, even with more lines than words."""
+        file = tmp_path / "blank.txt"
+        file.write_bytes(b"a\n\n\n\n")
+        result = estimate_paths([file], block_size=2)
+        assert result.exact
+        assert result.counts == {"lines": 4, "words": 1, "chars": 5, "bytes": 5}
+
+    def test_zero_time_budget_still_samples(self, large_file: Path) -> None:
+        """At least two blocks are read to compute variance."""
+        result = estimate_paths([large_file], time_budget=0, block_size=2**12, seed=1)
+        assert result.sampled_blocks == 2  # noqa: PLR2004
+
+    def test_uses_process_path_traversal(self, tmp_path: Path, small_file: Path) -> None:
+        """Ignored paths are excluded from the population, the same way process_path excludes them."""
+        (tmp_path / "ignored.log").write_text("ignored content")
+        result = estimate_paths([tmp_path], ignored_regexps=["*.log"])
+        assert result.files == 1
+        assert result.counts == counts(process_path(small_file, CounterFlags(), ignored_regexps=["*.log"]))
+
+    def test_empty_directory(self, tmp_path: Path) -> None:
+        """Nothing to sample results in zero estimate."""
+        result = estimate_paths([tmp_path])
+        assert result.counts == counts(FileStats())
+        assert result.exact
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_same_seed_same_estimate(self, large_file: Path, seed: int) -> None:
+        """Seed makes estimates reproducible."""
+        a = estimate_paths([large_file], byte_budget=2**14, block_size=2**12, seed=seed)
+        b = estimate_paths([large_file], byte_budget=2**14, block_size=2**12, seed=seed)
+        assert a == b
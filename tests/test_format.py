@@ -3,7 +3,8 @@
 import pytest
 
 from pywc.data import CounterFlags, FileStats
-from pywc.format import format_automatic
+from pywc.estimate import Estimate
+from pywc.format import format_automatic, format_estimate, format_histogram, format_margins, format_table
 
 
 class TestFormatAutomatic:
@@ -44,6 +45,13 @@ class TestFormatAutomatic:
         result = format_automatic(small_file_stats, CounterFlags(lines=False, words=False, chars=False, bytes=True))
         assert result == str(small_file_stats.bytes)
 
+    def test_max_line_length_is_last(self) -> None:
+        """Longest line follows the other counts, and can be printed alone."""
+        stats = FileStats(lines=1, words=2, chars=3, bytes=4, max_line_length=5)
+        assert format_automatic(stats, CounterFlags(max_line_length=True)).split() == ["1", "2", "3", "4", "5"]
+        flags = CounterFlags(lines=False, words=False, chars=False, bytes=False, max_line_length=True)
+        assert format_automatic(stats, flags) == "5"
+
     @pytest.mark.parametrize(
         "name", [" file.txt", "file txt", "file.txt ", " very long filename with spaces everywhere "]
     )
@@ -77,3 +85,75 @@ class TestFormatAutomatic:
         result2 = format_automatic(small_file_stats, full_counter_flags)
 
         assert result1 == result2
+
+
+class TestFormatMargins:
+    """Tests for format_margins, which prints confidence intervals of estimates."""
+
+    def test_columns_follow_flags(self) -> None:
+        """Only enabled margins are printed, prefixed with ±."""
+        estimate = Estimate(margins={"lines": 1, "words": 2, "chars": 3, "bytes": 0})
+        result = format_margins(estimate, CounterFlags(lines=True, words=False, chars=True, bytes=False), "±95%:")
+        assert result.split() == ["±95%:", "±1", "±3"]
+
+    def test_raises_value_error_when_no_flags_enabled(self) -> None:
+        """Should raise ValueError if no output fields are requested."""
+        with pytest.raises(ValueError):
+            format_margins(Estimate(), CounterFlags(lines=False, words=False, chars=False, bytes=False))
+
+
+class TestFormatEstimate:
+    """Tests for format_estimate, which prints estimated counts."""
+
+    def test_counts_are_not_ordered(self) -> None:
+        """Estimated counts are printed as they are, aligned with format_automatic columns."""
+        estimate = Estimate(counts={"lines": 4, "words": 1, "chars": 5, "bytes": 5})
+        result = format_estimate(estimate, CounterFlags(bytes=False), "TOTAL:")
+        assert result == f"{'TOTAL:':<20s} {4:7d} {1:7d} {5:7d}"
+
+    def test_raises_value_error_when_no_flags_enabled(self) -> None:
+        """Should raise ValueError if no output fields are requested."""
+        with pytest.raises(ValueError):
+            format_estimate(Estimate(), CounterFlags(lines=False, words=False, chars=False, bytes=False))
+
+
+class TestFormatTable:
+    """Tests for format_table."""
+
+    def test_header_and_rows(self, small_file_stats: FileStats) -> None:
+        """Header names the columns of rows below it."""
+        flags = CounterFlags(lines=True, words=False, chars=False, bytes=True)
+        result = format_table([(".py", small_file_stats)], flags, title="ext")
+        assert result.splitlines() == [
+            f"{'ext':<20s} {'lines':>7s} {'bytes':>7s}",
+            format_automatic(small_file_stats, flags, ".py"),
+        ]
+
+    def test_raises_value_error_when_no_flags_enabled(self) -> None:
+        """Should raise ValueError if no output fields are requested."""
+        with pytest.raises(ValueError):
+            format_table([], CounterFlags(lines=False, words=False, chars=False, bytes=False))
+
+    def test_max_line_length_column(self, small_file_stats: FileStats) -> None:
+        """Longest line has its own column header."""
+        flags = CounterFlags(lines=False, words=False, chars=False, bytes=False, max_line_length=True)
+        assert format_table([("a", small_file_stats)], flags).splitlines()[0] == f"{'group':<20s} {'longest':>7s}"
+
+
+class TestFormatHistogram:
+    """Tests for format_histogram."""
+
+    def test_buckets_and_bars(self) -> None:
+        """Every bucket is a row with its length range, bars are scaled to the largest bucket."""
+        result = format_histogram(FileStats(histogram=(2, 0, 4, 1)), width=4)
+        assert [line.split() for line in result.splitlines()] == [
+            ["line", "length", "lines"],
+            ["0", "2", "##"],
+            ["1", "0"],
+            ["2-3", "4", "####"],
+            ["4-7", "1", "#"],
+        ]
+
+    def test_empty(self) -> None:
+        """Without measured lines only the header is printed."""
+        assert format_histogram(FileStats()).splitlines() == [f"{'line length':<20s} {'lines':>7s}"]
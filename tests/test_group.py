@@ -0,0 +1,58 @@
+"""Test cases for group aggregation."""
+
+from pathlib import Path
+
+import pytest
+
+from pywc.data import FileStats
+from pywc.group import LANGUAGES, OTHER_GROUP, GroupTotals, group_key
+
+
+class TestGroupKey:
+    """Tests for pywc.group.group_key."""
+
+    @pytest.mark.parametrize(
+        ("file", "expected"),
+        [("root/a/b/c.py", ".py"), ("root/Makefile", "(none)"), ("root/archive.tar.gz", ".gz")],
+    )
+    def test_ext(self, file: str, expected: str) -> None:
+        """Extension includes the dot."""
+        assert group_key("ext")(Path("root"), Path(file)) == expected
+
+    @pytest.mark.parametrize(
+        ("root", "file", "expected"),
+        [("root", "root/a/b/c.py", "a"), ("root", "root/c.py", "."), ("root/c.py", "root/c.py", ".")],
+    )
+    def test_dir(self, root: str, file: str, expected: str) -> None:
+        """Top-level directory is relative to the processed path."""
+        assert group_key("dir")(Path(root), Path(file)) == expected
+
+    def test_glob_map_first_match_wins(self) -> None:
+        """Patterns are tried in order, unmatched files are in the other group."""
+        key = group_key("glob-map", {"test_*.py": "tests", "*.py": "code"})
+        assert key(Path(), Path("src/test_a.py")) == "tests"
+        assert key(Path(), Path("src/a.py")) == "code"
+        assert key(Path(), Path("README")) == OTHER_GROUP
+
+    def test_glob_map_defaults_to_languages(self) -> None:
+        """Without patterns, files are grouped by language."""
+        key = group_key("glob-map")
+        assert key(Path(), Path("a.pyi")) == LANGUAGES["*.py"]
+
+    def test_unknown(self) -> None:
+        """Unknown grouping is rejected."""
+        with pytest.raises(ValueError, match="Unknown group"):
+            group_key("size")
+
+
+class TestGroupTotals:
+    """Tests for pywc.group.GroupTotals."""
+
+    def test_add_aggregates_per_group(self) -> None:
+        """Files of the same group are summed, rows are sorted by group name."""
+        groups = GroupTotals(key=group_key("ext"))
+        one = FileStats(lines=1, words=1, chars=1, bytes=1)
+        groups.add(Path(), Path("b.txt"), one)
+        groups.add(Path(), Path("a.py"), one)
+        groups.add(Path(), Path("c.py"), one)
+        assert groups.rows() == [(".py", one + one), (".txt", one)]
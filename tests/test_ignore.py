@@ -0,0 +1,105 @@
+"""Test cases for gitignore rules."""
+
+from pathlib import Path
+
+import pytest
+
+from pywc.ignore import IgnoreRules
+
+
+def rules_with(tmp_path: Path, content: str, name: str = ".gitignore") -> IgnoreRules:
+    """Rules of a directory with a single ignore file."""
+    (tmp_path / name).write_text(content)
+    return IgnoreRules().child(tmp_path)
+
+
+class TestIgnoreRules:
+    """Tests for pywc.ignore.IgnoreRules."""
+
+    @pytest.mark.parametrize(
+        ("pattern", "relative", "expected"),
+        [
+            ("*.o", "main.o", True),
+            ("*.o", "src/main.o", True),
+            ("*.o", "main.c", False),
+            ("build", "build", True),
+            ("build", "src/build", True),
+            ("/build", "src/build", False),
+            ("src/*.c", "src/main.c", True),
+            ("src/*.c", "src/sub/main.c", False),
+            ("src/*.c", "lib/src/main.c", False),
+            ("**/gen", "a/b/gen", True),
+            ("a/**/z", "a/z", True),
+            ("a/**/z", "a/b/c/z", True),
+            ("a/**", "a/b", True),
+            ("file?.txt", "file1.txt", True),
+            ("file?.txt", "file10.txt", False),
+            ("file[0-9].txt", "file5.txt", True),
+            ("file[!0-9].txt", "file5.txt", False),
+            ("file[!0-9].txt", "fileA.txt", True),
+            ("\\#hash", "#hash", True),
+            ("# comment", "# comment", False),
+            ("", "anything", False),
+            ("with\\ ", "with ", True),
+        ],
+    )
+    def test_patterns(self, tmp_path: Path, pattern: str, relative: str, expected: bool) -> None:  # noqa: FBT001
+        """Patterns follow gitignore matching."""
+        rules = rules_with(tmp_path, pattern)
+        assert rules.is_ignored(tmp_path / relative) is expected
+
+    def test_directory_only(self, tmp_path: Path) -> None:
+        """Pattern with trailing slash matches only directories."""
+        rules = rules_with(tmp_path, "out/")
+        (tmp_path / "out").mkdir()
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "out").write_text("file")
+        assert rules.is_ignored(tmp_path / "out")
+        assert not rules.is_ignored(tmp_path / "sub" / "out")
+
+    def test_last_match_wins(self, tmp_path: Path) -> None:
+        """Negation re-includes paths excluded by earlier patterns."""
+        rules = rules_with(tmp_path, "*.log\n!keep.log\n")
+        assert rules.is_ignored(tmp_path / "debug.log")
+        assert not rules.is_ignored(tmp_path / "keep.log")
+
+    def test_child_overrides_parent(self, tmp_path: Path) -> None:
+        """Rules of a subdirectory take precedence and are relative to it."""
+        rules = rules_with(tmp_path, "*.log\n")
+        sub = tmp_path / "sub"
+        sub.mkdir()
+        (sub / ".ignore").write_text("!/keep.log\n")
+        child = rules.child(sub)
+        assert not child.is_ignored(sub / "keep.log")
+        assert child.is_ignored(sub / "other.log")
+        assert child.is_ignored(sub / "deeper" / "keep.log")
+
+    def test_child_without_ignore_files_is_shared(self, tmp_path: Path) -> None:
+        """Directories without ignore files reuse compiled rules of their parent."""
+        rules = rules_with(tmp_path, "*.log\n")
+        (tmp_path / "sub").mkdir()
+        assert rules.child(tmp_path / "sub") is rules
+
+    def test_git_directory_is_always_ignored(self, tmp_path: Path) -> None:
+        """Repository metadata is never counted."""
+        assert IgnoreRules().is_ignored(tmp_path / ".git")
+
+    def test_for_directory_includes_repository_ancestors(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Counting a subdirectory of a repository applies ignore files of its parents."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".gitignore").write_text("/src/generated\n*.tmp\n")
+        src = tmp_path / "src"
+        src.mkdir()
+        monkeypatch.chdir(src)
+
+        rules = IgnoreRules.for_directory(Path())
+        assert rules.is_ignored(Path("generated"))
+        assert rules.is_ignored(Path("a.tmp"))
+        assert not rules.is_ignored(Path("main.py"))
+
+    def test_for_directory_outside_repository(self, tmp_path: Path) -> None:
+        """Outside of a repository only ignore files under the directory count."""
+        (tmp_path / ".gitignore").write_text("*.tmp\n")
+        sub = tmp_path / "sub"
+        sub.mkdir()
+        assert not IgnoreRules.for_directory(sub).is_ignored(sub / "a.tmp")
@@ -0,0 +1,67 @@
+"""Test cases for resource limits of a run."""
+
+import threading
+import time
+
+import pytest
+
+from pywc.limits import LimitExceededError, Limits
+
+
+class TestLimits:
+    """Tests for pywc.limits.Limits."""
+
+    def test_unlimited(self) -> None:
+        """Without limits everything is admitted."""
+        limits = Limits()
+        for _ in range(1000):
+            limits.admit(2**40)
+        assert limits.files == 1000  # noqa: PLR2004
+
+    def test_max_files(self) -> None:
+        """Files over maximum are rejected."""
+        limits = Limits(max_files=2)
+        limits.admit(1)
+        limits.admit(1)
+        with pytest.raises(LimitExceededError, match="2 files"):
+            limits.admit(1)
+
+    def test_max_bytes_rejects_file_before_reading(self) -> None:
+        """A file that does not fit is rejected and not accounted."""
+        limits = Limits(max_bytes=10)
+        limits.admit(6)
+        with pytest.raises(LimitExceededError, match="10 bytes"):
+            limits.admit(5)
+        assert limits.bytes == 6  # noqa: PLR2004
+        limits.admit(4)
+
+    def test_timeout_is_checked_between_chunks(self) -> None:
+        """Guard stops passing chunks once timeout has passed."""
+        limits = Limits(timeout=0.01)
+        chunks = limits.guard([b"a", b"b"])
+        assert next(chunks) == b"a"
+        time.sleep(0.02)
+        with pytest.raises(LimitExceededError, match="timeout"):
+            next(chunks)
+
+    def test_max_open_files(self) -> None:
+        """Readers over maximum wait for a free slot."""
+        limits = Limits(max_open_files=1)
+        entered = threading.Event()
+
+        def other() -> None:
+            with limits.opened():
+                entered.set()
+
+        with limits.opened():
+            thread = threading.Thread(target=other)
+            thread.start()
+            assert not entered.wait(0.05)
+        thread.join()
+        assert entered.is_set()
+
+    def test_error_has_empty_partial(self) -> None:
+        """Partial totals are filled by whoever counted them."""
+        error = LimitExceededError("reason")
+        assert error.reason == "reason"
+        assert error.partial.bytes == 0
@@ -0,0 +1,100 @@
+"""Test cases for run metrics."""
+
+import time
+from typing import TYPE_CHECKING
+
+from pywc.data import FileStats
+from pywc.metrics import PHASES, RunMetrics
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+def samples(text: str) -> dict[str, float]:
+    """Samples of OpenMetrics text by metric name with labels."""
+    result = {}
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            result[name] = float(value)
+    return result
+
+
+class TestRunMetrics:
+    """Tests for pywc.metrics.RunMetrics."""
+
+    def test_phase_adds_time(self) -> None:
+        """Time of every block is added to its phase."""
+        metrics = RunMetrics()
+        for _ in range(2):
+            with metrics.phase("count"):
+                time.sleep(0.01)
+        assert metrics.wall["count"] >= 0.02  # noqa: PLR2004
+        assert metrics.wall["traverse"] == 0
+
+    def test_timed_iter_excludes_consumer(self) -> None:
+        """Only producing items is measured, not what the consumer does with them."""
+
+        def slow_items() -> Iterator[int]:
+            time.sleep(0.01)
+            yield 1
+
+        metrics = RunMetrics()
+        for _ in metrics.timed_iter("traverse", slow_items()):
+            with metrics.phase("count"):
+                time.sleep(0.03)
+        assert 0.01 <= metrics.wall["traverse"] < metrics.wall["count"]  # noqa: PLR2004
+
+    def test_timed_function(self) -> None:
+        """Wrapped function returns its result and is measured."""
+        metrics = RunMetrics()
+        assert metrics.timed("count", lambda n: n + 1)(1) == 2  # noqa: PLR2004
+        assert metrics.cpu["count"] >= 0
+
+    def test_utilization(self) -> None:
+        """Counting time is shared by every worker, time spent reporting is not available to them."""
+        metrics = RunMetrics(workers=2)
+        with metrics.phase("count"):
+            time.sleep(0.02)
+        with metrics.phase("report"):
+            time.sleep(0.05)
+        assert 0.4 < metrics.utilization() <= 0.5  # noqa: PLR2004
+        assert RunMetrics().utilization() == 0
+
+    def test_format(self) -> None:
+        """Every family has metadata, samples follow the counters, and the text ends with EOF."""
+        metrics = RunMetrics()
+        metrics.files, metrics.directories, metrics.ignored, metrics.permission_errors = 3, 2, 1, 1
+        text = metrics.format(FileStats(lines=1, words=2, chars=3, bytes=4), complete=False)
+        assert text.endswith("# EOF\n")
+        values = samples(text)
+        assert values["pywc_lines"] == 1
+        assert values["pywc_read_bytes"] == 4  # noqa: PLR2004
+        assert values["pywc_files"] == 3  # noqa: PLR2004
+        assert values["pywc_directories"] == 2  # noqa: PLR2004
+        assert values["pywc_ignored_paths"] == 1
+        assert values["pywc_permission_errors"] == 1
+        assert values["pywc_complete"] == 0
+        assert values["pywc_workers"] == 1
+        assert 0 <= values["pywc_worker_utilization_ratio"] <= 1
+        assert {f'pywc_phase_duration_seconds{{phase="{phase}"}}' for phase in PHASES} <= values.keys()
+        assert "# TYPE pywc_read_throughput_bytes_per_second gauge" in text.splitlines()
+
+    def test_throughput_counts_bytes_of_this_run(self) -> None:
+        """Bytes of a resumed total are not counted again in the throughput."""
+        metrics = RunMetrics()
+        resumed = samples(metrics.format(FileStats(lines=1, words=1, chars=1, bytes=10**9), complete=True))
+        assert resumed["pywc_read_bytes"] == 10**9
+        assert resumed["pywc_read_throughput_bytes_per_second"] == 0
+
+        metrics.bytes = 10
+        assert samples(metrics.format(FileStats(), complete=True))["pywc_read_throughput_bytes_per_second"] > 0
+
+    def test_write_replaces_file(self, tmp_path: Path) -> None:
+        """Metrics file is replaced as a whole, without leaving a temporary file."""
+        file = tmp_path / "pywc.prom"
+        file.write_text("old")
+        RunMetrics().write(file, FileStats(), complete=True)
+        assert samples(file.read_text())["pywc_complete"] == 1
+        assert [p.name for p in tmp_path.iterdir()] == ["pywc.prom"]
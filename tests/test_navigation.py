@@ -1,13 +1,30 @@
 """Test cases for the Path navigation code necessary for pywc."""
 
+import inspect
+import sys
+import zipfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 from unittest.mock import MagicMock
 
 import pytest
 
+from pywc.archive import ArchiveError
+from pywc.checkpoint import Checkpoint
 from pywc.data import CounterFlags, FileStats
 from pywc.format import FormatterT
-from pywc.navigation import process_path
+from pywc.group import GroupTotals, group_key
+from pywc.limits import LimitExceededError, Limits
+from pywc.metrics import RunMetrics
+from pywc.navigation import iter_files, process_path
+from pywc.reader import ReadStrategy
+from pywc.shard import Shard
+from pywc.tokenizer import UnicodeTokenizer
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+    from pywc.tokenizer import TokenizerFactoryT
 
 
 @pytest.fixture
@@ -146,3 +163,239 @@ class TestProcessPath:
 
         result = process_path(broken, CounterFlags())
         assert result == FileStats(lines=0, words=0, chars=0, bytes=0)
+
+    def test_limits_stop_with_partial_totals(self, tmp_path: Path, formatter_mock: MagicMock) -> None:
+        """Hitting a limit raises with totals of files counted before it."""
+        for name in "abc":
+            (tmp_path / f"{name}.txt").write_text("word\n")
+
+        with pytest.raises(LimitExceededError) as exc_info:
+            process_path(tmp_path, CounterFlags(), formatter=formatter_mock, limits=Limits(max_files=2))
+
+        assert exc_info.value.partial == FileStats(lines=2, words=2, chars=10, bytes=10)
+        assert formatter_mock.call_count == 2  # noqa: PLR2004
+
+    def test_limits_are_shared_between_calls(self, small_file: Path) -> None:
+        """The same limits bound consecutive calls of one run."""
+        limits = Limits(max_files=1)
+        process_path(small_file, CounterFlags(), limits=limits)
+        with pytest.raises(LimitExceededError):
+            process_path(small_file, CounterFlags(), limits=limits)
+
+    def test_checkpoint_skips_done_and_marks_counted(self, tmp_path: Path, small_file: Path) -> None:
+        """Done files are not counted again, every counted file and finished directory is marked done."""
+        other = tmp_path / "other.txt"
+        other.write_text("other words\n")
+        checkpoint = Checkpoint(tmp_path / "run.checkpoint")
+        checkpoint.file_done(small_file, FileStats())
+
+        result = process_path(tmp_path, CounterFlags(), checkpoint=checkpoint)
+        assert result == FileStats(lines=1, words=2, chars=12, bytes=12)
+        assert checkpoint.total == result
+        assert list(checkpoint.done) == [tmp_path]
+
+    def test_groups_are_added_per_file(self, tmp_path: Path) -> None:
+        """Every counted file is added to its group relative to the processed path."""
+        for name in ("a/x.txt", "a/y.py", "b/z.txt"):
+            (tmp_path / name).parent.mkdir(exist_ok=True)
+            (tmp_path / name).write_text("word\n")
+        groups = GroupTotals(key=group_key("dir"))
+
+        total = process_path(tmp_path, CounterFlags(), groups=groups)
+        assert [name for name, _ in groups.rows()] == ["a", "b"]
+        assert groups.totals["a"] + groups.totals["b"] == total
+
+    def test_archive_members_are_grouped_as_the_archive(self, tmp_path: Path) -> None:
+        """Members of an archive are grouped by the archive file, given directly or found in a directory."""
+        (tmp_path / "sub").mkdir()
+        archive = tmp_path / "sub" / "bundle.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("dir/a.txt", "one two\n")
+            zf.writestr("b.txt", "three\n")
+        (tmp_path / "top.txt").write_text("top\n")
+
+        groups = GroupTotals(key=group_key("dir"))
+        total = process_path(tmp_path, CounterFlags(), groups=groups, archives=True)
+        assert groups.rows() == [
+            (".", FileStats(lines=1, words=1, chars=4, bytes=4)),
+            ("sub", total - groups.totals["."]),
+        ]
+
+        groups = GroupTotals(key=group_key("dir"))
+        total = process_path(archive, CounterFlags(), groups=groups, archives=True)
+        assert groups.rows() == [(".", total)]
+
+    def test_archives_count_members(self, tmp_path: Path, formatter_mock: MagicMock) -> None:
+        """Members of archives are reported and counted instead of the archive."""
+        archive = tmp_path / "bundle.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("a.txt", "one two\n")
+            zf.writestr("b.txt", "three\n")
+
+        result = process_path(archive, CounterFlags(), formatter=formatter_mock, archives=True)
+        assert result == FileStats(lines=2, words=3, chars=14, bytes=14)
+        assert [c.args[2] for c in formatter_mock.call_args_list] == [f"{archive}!/a.txt", f"{archive}!/b.txt"]
+        assert process_path(archive, CounterFlags()).bytes == archive.stat().st_size
+
+    def test_invalid_archive_is_counted_as_plain_file(self, tmp_path: Path) -> None:
+        """File with an archive name that is not an archive is reported and counted as it is."""
+        archive = tmp_path / "bundle.tar"
+        archive.write_text("one two\n")
+        errors: list[tuple[Path, ArchiveError]] = []
+
+        result = process_path(
+            archive, CounterFlags(), archives=True, on_archive_error=lambda file, e: errors.append((file, e))
+        )
+        assert result == FileStats(lines=1, words=2, chars=8, bytes=8)
+        assert [(file, type(e)) for file, e in errors] == [(archive, ArchiveError)]
+
+    def test_shard_counts_owned_files_with_global_ordinals(self, tmp_path: Path) -> None:
+        """Shards split files, ordinals count files of all shards."""
+        for i in range(20):
+            (tmp_path / f"{i:02d}.txt").write_text("word\n")
+        files = list(iter_files(tmp_path))
+
+        totals, ordinals = FileStats(), []
+        for k in (1, 2):
+            totals += process_path(
+                tmp_path,
+                CounterFlags(),
+                shard=Shard(k, 2),
+                record=lambda ordinal, name, _stats: ordinals.append((ordinal[0], name)),
+            )
+        assert totals == process_path(tmp_path, CounterFlags())
+        assert sorted(ordinals) == [(i, str(file)) for i, file in enumerate(files)]
+
+    def test_workers_give_same_results_in_same_order(
+        self, tmp_path: Path, formatter_mock: MagicMock, mocker: MockerFixture
+    ) -> None:
+        """Files counted on threads are reported and checkpointed in traversal order."""
+        mocker.patch("pywc.navigation.effective_workers", side_effect=lambda workers: workers)
+        tree = tmp_path / "tree"
+        for d in (tree / "a", tree / "b", tree / "c"):
+            d.mkdir(parents=True)
+            for i in range(5):
+                (d / f"{i}.txt").write_text("word " * (i + 1))
+        serial = process_path(tree, CounterFlags(), formatter=formatter_mock)
+        serial_calls = formatter_mock.call_args_list.copy()
+        formatter_mock.reset_mock()
+
+        checkpoint = Checkpoint(tmp_path / "checkpoint.json")
+        directory_done = mocker.spy(checkpoint, "directory_done")
+        result = process_path(tree, CounterFlags(), formatter=formatter_mock, checkpoint=checkpoint, workers=4)
+        assert result == serial
+        assert formatter_mock.call_args_list == serial_calls
+        done: list[Path] = []
+        list(iter_files(tree, on_directory_done=done.append))
+        assert [c.args[0] for c in directory_done.call_args_list] == done
+
+    @pytest.mark.parametrize(
+        ("flags", "tokenizer", "parts"),
+        [
+            (CounterFlags(), None, 10),
+            (CounterFlags(max_line_length=True), None, 1),
+            (CounterFlags(), UnicodeTokenizer, 1),
+        ],
+    )
+    def test_large_files_are_counted_in_parts(
+        self,
+        tmp_path: Path,
+        mocker: MockerFixture,
+        flags: CounterFlags,
+        tokenizer: TokenizerFactoryT | None,
+        parts: int,
+    ) -> None:
+        """Parts give the statistics of the whole file, and files are split only when counts of parts add up."""
+        mocker.patch("pywc.navigation.effective_workers", side_effect=lambda workers: workers)
+        mocker.patch("pywc.navigation.SPLIT_SIZE", 100)
+        file = tmp_path / "large.txt"
+        file.write_bytes(("ząb  słowo\n\tkot " * 60).encode()[:1000])
+        expected = FileStats.from_file(file, tokenizer=tokenizer, line_lengths=flags.line_lengths)
+        chunks = mocker.spy(ReadStrategy, "chunks")
+        assert process_path(file, flags, tokenizer=tokenizer, workers=4) == expected
+        assert chunks.call_count == parts
+
+    def test_parts_of_blank_lines_are_counted(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """A part with more lines than words is counted, only the file has to be valid statistics."""
+        mocker.patch("pywc.navigation.effective_workers", side_effect=lambda workers: workers)
+        mocker.patch("pywc.navigation.SPLIT_SIZE", 16)
+        file = tmp_path / "large.txt"
+        file.write_bytes(b"aaaa bbbb cccc dddd eeee ffff gggg hhhh " + b"\n" * 8 + b"z")
+        assert process_path(file, CounterFlags(), workers=4) == FileStats(lines=8, words=9, chars=49, bytes=49)
+
+    def test_metrics_count_visited_paths(self, tmp_path: Path) -> None:
+        """Files, directories and ignored paths are counted, and traversal and counting are timed."""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "a.txt").write_text("a\n")
+        (tmp_path / "b.txt").write_text("b\n")
+        (tmp_path / "skip").mkdir()
+        (tmp_path / "skip" / "c.txt").write_text("c\n")
+        metrics = RunMetrics()
+        process_path(tmp_path, CounterFlags(), ignored_regexps=["skip"], metrics=metrics)
+        assert (metrics.files, metrics.directories, metrics.ignored) == (2, 2, 1)
+        assert metrics.bytes == 4  # noqa: PLR2004
+        assert metrics.wall["traverse"] > 0
+        assert metrics.wall["count"] > 0
+
+
+class TestIterFiles:
+    """Tests for pywc.navigation.iter_files function."""
+
+    def test_yields_nested_files(self, tmp_path: Path) -> None:
+        """Files of nested directories are yielded, directories are not."""
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "b.txt").write_text("b")
+
+        assert sorted(iter_files(tmp_path)) == [tmp_path / "a.txt", tmp_path / "sub" / "b.txt"]
+
+    def test_ignored_regexps_apply_to_children(self, tmp_path: Path) -> None:
+        """Ignore rules are matched against every visited path, not only the root."""
+        (tmp_path / "a.txt").write_text("a")
+        (tmp_path / "b.log").write_text("b")
+        (tmp_path / ".git").mkdir()
+        (tmp_path / ".git" / "c.txt").write_text("c")
+
+        assert list(iter_files(tmp_path, ignored_regexps=iter(["*.log", ".git"]))) == [tmp_path / "a.txt"]
+
+    def test_deep_tree_does_not_recurse(self, tmp_path: Path) -> None:
+        """Depth is not limited by the interpreter recursion limit."""
+        deep = tmp_path.joinpath(*["d"] * 200)
+        deep.mkdir(parents=True)
+        (deep / "leaf.txt").write_text("leaf")
+
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(len(inspect.stack()) + 50)
+        try:
+            files = list(iter_files(tmp_path))
+        finally:
+            sys.setrecursionlimit(limit)
+        assert files == [deep / "leaf.txt"]
+
+    def test_skip_prunes_directories(self, tmp_path: Path) -> None:
+        """Skipped directories are not listed."""
+        (tmp_path / "done").mkdir()
+        (tmp_path / "done" / "a.txt").write_text("a")
+        (tmp_path / "b.txt").write_text("b")
+        assert list(iter_files(tmp_path, skip=lambda p: p.name == "done")) == [tmp_path / "b.txt"]
+
+    def test_directories_are_reported_after_their_files(self, tmp_path: Path) -> None:
+        """Directory is done once its last file was consumed, children before parents."""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "a.txt").write_text("a")
+        events: list[Path] = []
+        events.extend(iter_files(tmp_path, on_directory_done=events.append))
+        assert events == [tmp_path / "sub" / "a.txt", tmp_path / "sub", tmp_path]
+
+    def test_respect_gitignore_prunes_ignored_directories(self, tmp_path: Path, mocker: MockerFixture) -> None:
+        """Ignored directories are not listed, .git is skipped, ignore files themselves are counted."""
+        (tmp_path / ".gitignore").write_text("build/\n")
+        for directory in ("build", ".git", "src"):
+            (tmp_path / directory).mkdir()
+            (tmp_path / directory / "file.txt").write_text("file")
+        iterdir = mocker.spy(Path, "iterdir")
+
+        files = set(iter_files(tmp_path, respect_gitignore=True))
+        assert files == {tmp_path / ".gitignore", tmp_path / "src" / "file.txt"}
+        assert {call.args[0] for call in iterdir.call_args_list} == {tmp_path, tmp_path / "src"}
+        assert len(set(iter_files(tmp_path))) == 4  # noqa: PLR2004
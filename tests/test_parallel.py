@@ -0,0 +1,157 @@
+"""Test cases for counting on a thread pool."""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pywc.parallel import BATCH_ITEMS, BATCH_SIZE, effective_workers, gil_enabled, map_ordered, map_scheduled
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from pytest_mock import MockerFixture
+
+
+class TestEffectiveWorkers:
+    """Tests for pywc.parallel.effective_workers."""
+
+    def test_gil_enabled_uses_single_thread(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Threads would only add overhead with the GIL."""
+        monkeypatch.setattr(sys, "_is_gil_enabled", lambda: True, raising=False)
+        assert gil_enabled()
+        assert effective_workers(8) == 1
+
+    def test_gil_disabled_uses_requested_threads(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Free-threaded builds use every requested thread."""
+        monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+        assert not gil_enabled()
+        assert effective_workers(8) == 8  # noqa: PLR2004
+        assert effective_workers(1) == 1
+
+    def test_builds_without_check_have_gil(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Interpreters before free-threading always have the GIL."""
+        monkeypatch.delattr(sys, "_is_gil_enabled", raising=False)
+        assert gil_enabled()
+
+
+class TestMapOrdered:
+    """Tests for pywc.parallel.map_ordered."""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_results_are_in_item_order(self, workers: int) -> None:
+        """Slow early items do not reorder results."""
+
+        def slow_square(n: int) -> int:
+            time.sleep(0.001 * (10 - n % 10))
+            return n * n
+
+        assert list(map_ordered(slow_square, range(50), workers=workers)) == [(n, n * n) for n in range(50)]
+
+    def test_runs_on_worker_threads(self) -> None:
+        """With more than one worker, function runs outside the consumer thread."""
+        threads = {thread for _, thread in map_ordered(lambda _: threading.get_ident(), range(8), workers=2)}
+        assert threading.get_ident() not in threads
+
+    def test_slow_item_does_not_hold_up_later_items(self) -> None:
+        """Other workers keep counting while the first item runs, their results wait for it."""
+        delays = [1.0] + [0.01] * 400
+        start = time.perf_counter()
+        assert [delay for delay, _ in map_ordered(time.sleep, delays, workers=4)] == delays
+        # waiting for the slow item before taking more would take 1 s + 400 x 10 ms / 4 workers = 2 s
+        assert time.perf_counter() - start < 1.7  # noqa: PLR2004
+
+    def test_items_error_is_raised_after_earlier_results(self) -> None:
+        """Error of the iterable surfaces where a serial loop would raise it."""
+
+        def items() -> Iterator[int]:
+            yield 1
+            yield 2
+            msg = "listing failed"
+            raise OSError(msg)
+
+        results = map_ordered(lambda n: -n, items(), workers=4)
+        assert [next(results), next(results)] == [(1, -1), (2, -2)]
+        with pytest.raises(OSError, match="listing failed"):
+            next(results)
+
+    def test_function_error_is_raised_in_order(self) -> None:
+        """Error of an item is raised when its result is due."""
+
+        def fail_on_three(n: int) -> int:
+            if n == 3:  # noqa: PLR2004
+                msg = "bad item"
+                raise ValueError(msg)
+            return n
+
+        results = map_ordered(fail_on_three, range(10), workers=4)
+        assert [next(results) for _ in range(3)] == [(0, 0), (1, 1), (2, 2)]
+        with pytest.raises(ValueError, match="bad item"):
+            next(results)
+
+
+class TestMapScheduled:
+    """Tests for pywc.parallel.map_scheduled."""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_results_are_in_item_order(self, workers: int) -> None:
+        """Items of any size are yielded in order with their results."""
+        sizes = [(n * 7919) % (3 * BATCH_SIZE) for n in range(200)]
+        results = map_scheduled(lambda n: -n, sizes, workers=workers, size=lambda n: n)
+        assert list(results) == [(n, -n) for n in sizes]
+
+    def test_large_items_start_first(self) -> None:
+        """Within a window, the largest item is started before smaller items found earlier."""
+        started: list[int] = []
+        lock = threading.Lock()
+
+        def record(n: int) -> int:
+            with lock:
+                started.append(n)
+            time.sleep(0.01)
+            return n
+
+        sizes = [BATCH_SIZE, 2 * BATCH_SIZE, 5 * BATCH_SIZE, 3 * BATCH_SIZE]
+        assert list(map_scheduled(record, sizes, workers=2, size=lambda n: n)) == [(n, n) for n in sizes]
+        assert set(started[:2]) == {5 * BATCH_SIZE, 3 * BATCH_SIZE}
+
+    def test_small_items_are_batched(self, mocker: MockerFixture) -> None:
+        """Small items run as batches of at most BATCH_ITEMS, large items alone."""
+        submit = mocker.spy(ThreadPoolExecutor, "submit")
+        items = [1] * (2 * BATCH_ITEMS) + [BATCH_SIZE]
+        assert len(list(map_scheduled(lambda n: n, items, workers=4, size=lambda n: n))) == len(items)
+        assert submit.call_count == 3  # noqa: PLR2004
+
+    def test_split_items_are_combined(self) -> None:
+        """Parts of a split item are processed separately and combined in order."""
+
+        def join(parts: list[str]) -> str:
+            return "+".join(parts)
+
+        items = ["ab", "cdefgh", "i"]
+        results = map_scheduled(
+            lambda part: part.upper(),
+            items,
+            workers=4,
+            size=len,
+            split=lambda item: [item[i : i + 2] for i in range(0, len(item), 2)],
+            combine=join,
+        )
+        assert list(results) == [("ab", "AB"), ("cdefgh", "CD+EF+GH"), ("i", "I")]
+
+    def test_items_error_is_raised_after_earlier_results(self) -> None:
+        """Error of the iterable surfaces after results of items taken before it."""
+
+        def items() -> Iterator[int]:
+            yield 1
+            yield 2
+            msg = "listing failed"
+            raise OSError(msg)
+
+        results = map_scheduled(lambda n: -n, items(), workers=4, size=lambda n: n)
+        assert [next(results), next(results)] == [(1, -1), (2, -2)]
+        with pytest.raises(OSError, match="listing failed"):
+            next(results)
@@ -0,0 +1,79 @@
+"""Test cases for reading files in chunks."""
+
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pywc.data import FileStats
+from pywc.reader import DEFAULT_BUFFER_SIZE, MAX_AUTO_BUFFER_SIZE, ReadStrategy
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestReadStrategy:
+    """Tests for pywc.reader.ReadStrategy."""
+
+    def test_positive_buffer_size(self) -> None:
+        """Allow only positive buffer sizes."""
+        with pytest.raises(ValueError):
+            ReadStrategy(buffer_size=0)
+
+    @pytest.mark.parametrize(
+        "strategy",
+        [
+            ReadStrategy(),
+            ReadStrategy(buffer_size=7),
+            ReadStrategy(buffer_size=None),
+            ReadStrategy(reuse_buffer=False),
+            ReadStrategy(sequential=True),
+            ReadStrategy(direct=True, buffer_size=None),
+        ],
+    )
+    def test_chunks_concatenate_to_file(self, large_file: Path, strategy: ReadStrategy) -> None:
+        """Every strategy reads the whole file in order."""
+        assert b"".join(bytes(chunk) for chunk in strategy.chunks(large_file)) == large_file.read_bytes()
+
+    @pytest.mark.parametrize("strategy", [ReadStrategy(), ReadStrategy(direct=True, sequential=True)])
+    def test_chunks_from_offset(self, small_file: Path, strategy: ReadStrategy) -> None:
+        """Reading from an offset skips the beginning of the file."""
+        assert b"".join(strategy.chunks(small_file, offset=10)) == small_file.read_bytes()[10:]
+
+    @pytest.mark.parametrize(
+        "strategy", [ReadStrategy(buffer_size=7), ReadStrategy(buffer_size=None), ReadStrategy(direct=True)]
+    )
+    def test_chunks_of_range(self, large_file: Path, strategy: ReadStrategy) -> None:
+        """Reading a range stops after its size, even within a chunk."""
+        chunks = strategy.chunks(large_file, offset=10, size=25)
+        assert b"".join(bytes(chunk) for chunk in chunks) == large_file.read_bytes()[10:35]
+
+    @pytest.mark.parametrize("strategy", [ReadStrategy(buffer_size=5), ReadStrategy(reuse_buffer=False)])
+    def test_from_file_is_independent_of_strategy(
+        self, large_file: Path, large_file_stats: FileStats, strategy: ReadStrategy
+    ) -> None:
+        """Statistics do not depend on how the file is read."""
+        assert FileStats.from_file(large_file, reader=strategy) == large_file_stats
+
+    def test_reused_buffer_yields_views(self, small_file: Path) -> None:
+        """With buffer reuse, chunks are views of one preallocated buffer."""
+        chunks = list(ReadStrategy(buffer_size=10).chunks(small_file))
+        views = [chunk for chunk in chunks if isinstance(chunk, memoryview)]
+        assert len(views) == len(chunks)
+        assert len({id(view.obj) for view in views}) == 1
+
+    def test_fixed_buffer_size(self, small_file: Path) -> None:
+        """Fixed size is used as is."""
+        assert ReadStrategy().tuned_buffer_size(small_file.stat()) == DEFAULT_BUFFER_SIZE
+
+    def test_auto_buffer_size_is_bounded_by_file(self, small_file: Path) -> None:
+        """Small files get a single block buffer."""
+        st = small_file.stat()
+        assert ReadStrategy(buffer_size=None).tuned_buffer_size(st) == (st.st_blksize or DEFAULT_BUFFER_SIZE)
+
+    @pytest.mark.parametrize("block_size", [512, 4096, 3000, 2 * MAX_AUTO_BUFFER_SIZE])
+    def test_auto_buffer_size_is_bounded_by_maximum(self, block_size: int) -> None:
+        """Large files get the largest multiple of block size up to maximum, but at least one block."""
+        st = os.stat_result((0,) * 6 + (10**9,) + (0,) * 3, {"st_blksize": block_size})
+        size = ReadStrategy(buffer_size=None).tuned_buffer_size(st)
+        assert size == max(block_size, MAX_AUTO_BUFFER_SIZE // block_size * block_size)
@@ -0,0 +1,87 @@
+"""Test cases for sharded runs and merging of their partial results."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from pywc.data import FileStats
+from pywc.shard import Partial, PartialWriter, Shard, check_shards, merge_records
+
+ONE = FileStats(lines=1, words=1, chars=1, bytes=1)
+
+
+def write_partial(file: Path, shard: Shard, records: list[tuple[int, int, str]], *, complete: bool = True) -> Path:
+    """Partial file with records of (path index, file ordinal, name), each with ONE as statistics."""
+    stream = io.StringIO()
+    writer = PartialWriter(stream, shard=shard, paths=["root"])
+    for path_index, ordinal, name in records:
+        writer.recorder(path_index)((ordinal, 0), name, ONE)
+    writer.finish(sum((ONE for _ in records), FileStats()), complete=complete)
+    file.write_text(stream.getvalue())
+    return file
+
+
+class TestShard:
+    """Tests for pywc.shard.Shard."""
+
+    @pytest.mark.parametrize("value", ["1", "a/2", "0/2", "3/2", "1/0", "/"])
+    def test_parse_invalid(self, value: str) -> None:
+        """Shard must be K/N with K from 1 to N."""
+        with pytest.raises(ValueError, match=r"Shard|form"):
+            Shard.parse(value)
+
+    def test_every_file_has_exactly_one_shard(self) -> None:
+        """Shards partition files, and all of them get some."""
+        files = [Path(f"dir/file{i}.txt") for i in range(300)]
+        shards = [Shard.parse(f"{k}/3") for k in range(1, 4)]
+        owners = [[shard for shard in shards if shard.owns(file)] for file in files]
+        assert all(len(o) == 1 for o in owners)
+        assert {o[0] for o in owners} == set(shards)
+
+
+class TestPartial:
+    """Tests for pywc.shard.Partial and merging."""
+
+    def test_roundtrip(self, tmp_path: Path) -> None:
+        """Header, records and trailer are read back."""
+        file = write_partial(tmp_path / "1.jsonl", Shard(1, 2), [(0, 0, "a"), (0, 2, "c")], complete=False)
+        partial = Partial.load(file)
+        assert partial.shard == Shard(1, 2)
+        assert partial.paths == ["root"]
+        assert partial.total == ONE + ONE
+        assert not partial.complete
+        assert [(o, n) for o, n, _ in partial.records()] == [((0, 0, 0), "a"), ((0, 2, 0), "c")]
+
+    @pytest.mark.parametrize("content", ["", "{}\n", '{"version": 1, "shard": [1, 1], "paths": []}\n'])
+    def test_load_truncated(self, tmp_path: Path, content: str) -> None:
+        """Partial file without trailer is rejected."""
+        file = tmp_path / "1.jsonl"
+        file.write_text(content)
+        with pytest.raises(ValueError, match="truncated"):
+            Partial.load(file)
+
+    def test_merge_restores_single_run_order(self, tmp_path: Path) -> None:
+        """Records of all shards are merged by ordinal."""
+        first = write_partial(tmp_path / "1.jsonl", Shard(1, 2), [(0, 0, "a"), (0, 2, "c"), (1, 0, "d")])
+        second = write_partial(tmp_path / "2.jsonl", Shard(2, 2), [(0, 1, "b"), (1, 1, "e")])
+        partials = [Partial.load(second), Partial.load(first)]
+        check_shards(partials)
+        assert [name for name, _ in merge_records(partials)] == ["a", "b", "c", "d", "e"]
+
+    def test_check_shards_missing_or_repeated(self, tmp_path: Path) -> None:
+        """Every shard has to be merged exactly once."""
+        first = Partial.load(write_partial(tmp_path / "1.jsonl", Shard(1, 2), []))
+        with pytest.raises(ValueError, match="once each"):
+            check_shards([first])
+        with pytest.raises(ValueError, match="once each"):
+            check_shards([first, first])
+        with pytest.raises(ValueError, match="Nothing"):
+            check_shards([])
+
+    def test_check_shards_of_other_run(self, tmp_path: Path) -> None:
+        """Shards of runs with different shard counts are not merged."""
+        first = Partial.load(write_partial(tmp_path / "1.jsonl", Shard(1, 2), []))
+        other = Partial.load(write_partial(tmp_path / "2.jsonl", Shard(2, 3), []))
+        with pytest.raises(ValueError, match="same run"):
+            check_shards([first, other])
@@ -0,0 +1,99 @@
+"""Test cases for the columnar result store."""
+
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from pywc.data import CounterFlags, FileStats
+from pywc.navigation import process_path
+from pywc.store import COLUMNS, ResultStore
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make_store(sizes: list[int]) -> ResultStore:
+    """Store with a file per size, named after its position."""
+    store = ResultStore()
+    for i, size in enumerate(sizes):
+        store.append(f"dir/{i}.txt", FileStats(lines=size, words=size, chars=size, bytes=size, max_line_length=i))
+    return store
+
+
+class TestResultStore:
+    """Tests for pywc.store.ResultStore."""
+
+    def test_round_trip(self) -> None:
+        """Stored names and statistics come back unchanged."""
+        store = make_store([3, 1, 2])
+        assert len(store) == 3  # noqa: PLR2004
+        assert store.name(1) == "dir/1.txt"
+        assert store.stats(1) == FileStats(lines=1, words=1, chars=1, bytes=1, max_line_length=1)
+        assert [name for name, _ in store] == ["dir/0.txt", "dir/1.txt", "dir/2.txt"]
+
+    def test_undecodable_name(self) -> None:
+        """Names of files that are not valid in the file system encoding are kept."""
+        name = "bad-\udcff.txt" if sys.platform != "win32" else "bad.txt"
+        store = ResultStore()
+        store.append(name, FileStats())
+        assert store.name(0) == name
+
+    def test_total(self) -> None:
+        """Counts are summed, the longest line is the maximum."""
+        assert make_store([3, 1, 2]).total() == FileStats(lines=6, words=6, chars=6, bytes=6, max_line_length=2)
+        assert ResultStore().total() == FileStats()
+
+    def test_argsort_is_stable(self) -> None:
+        """Ties keep the order of appending."""
+        store = make_store([2, 1, 2, 3])
+        assert store.argsort("bytes") == [1, 0, 2, 3]
+        assert store.argsort("bytes", reverse=True) == [3, 0, 2, 1]
+
+    def test_top(self) -> None:
+        """Top-k is the start of the descending order."""
+        store = make_store([5, 1, 9, 7, 3])
+        assert store.top("lines", 3) == [2, 3, 0]
+        assert store.top("lines", 10) == store.argsort("lines", reverse=True)
+
+    def test_save_and_load(self, tmp_path: Path) -> None:
+        """Loaded store maps the saved columns and names."""
+        store = make_store([5, 1, 9])
+        store.save(tmp_path / "results")
+        loaded = ResultStore.load(tmp_path / "results")
+        try:
+            assert list(loaded) == list(store)
+            for column in COLUMNS:
+                assert loaded.argsort(column) == store.argsort(column)
+            assert loaded.total() == store.total()
+            with pytest.raises(TypeError, match="read-only"):
+                loaded.append("x", FileStats())
+        finally:
+            loaded.close()
+
+    def test_save_and_load_empty(self, tmp_path: Path) -> None:
+        """Empty store is a valid file."""
+        ResultStore().save(tmp_path / "results")
+        loaded = ResultStore.load(tmp_path / "results")
+        assert len(loaded) == 0
+        loaded.close()
+
+    @pytest.mark.parametrize("content", [b"", b"not a result store", None])
+    def test_load_invalid(self, tmp_path: Path, content: bytes | None) -> None:
+        """Other files and truncated stores are rejected."""
+        file = tmp_path / "results"
+        if content is None:
+            make_store([1, 2]).save(file)
+            content = file.read_bytes()[:-1]
+        file.write_bytes(content)
+        with pytest.raises(ValueError, match="not a result store"):
+            ResultStore.load(file)
+
+    def test_filled_by_process_path(self, tmp_path: Path) -> None:
+        """Every counted file is appended in traversal order."""
+        for i in range(3):
+            (tmp_path / f"{i}.txt").write_text("word " * i)
+        store = ResultStore()
+        total = process_path(tmp_path, CounterFlags(), store=store)
+        assert store.total() == total
+        assert sorted(store.name(i) for i in range(len(store))) == [str(tmp_path / f"{i}.txt") for i in range(3)]
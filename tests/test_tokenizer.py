@@ -0,0 +1,86 @@
+"""Test cases for tokenizer engines."""
+
+import copy
+from functools import partial
+
+import pytest
+
+from pywc.data import FileStats, StatsCounter
+from pywc.tokenizer import AsciiTokenizer, TokenizerFactoryT, UnicodeTokenizer, tokenizer_factory
+
+TEXT = "first line\nword\u00a0two\u2026 three\n\tlast"  # non-breaking space, ellipsis
+
+
+def count(factory: TokenizerFactoryT, data: bytes, chunk_size: int) -> FileStats:
+    """Feed data in chunks of given size."""
+    counter = StatsCounter(tokenizer=factory())
+    for i in range(0, len(data), chunk_size):
+        counter.feed(data[i : i + chunk_size])
+    return counter.stats()
+
+
+class TestAsciiTokenizer:
+    """Tests for pywc.tokenizer.AsciiTokenizer."""
+
+    def test_multibyte_bytes_are_not_whitespace(self) -> None:
+        """UTF-8 sequences containing 0x85 or 0xA0 bytes do not split words."""
+        data = "\u2026\u00e0".encode()  # e2 80 a6 c3 a0
+        assert AsciiTokenizer().count(data, in_word=False) == (0, 1, 2, True)
+
+    def test_ascii_whitespace(self) -> None:
+        """Only ASCII whitespace splits words, non-breaking space does not."""
+        result = count(AsciiTokenizer, TEXT.encode(), 2**16)
+        assert result == FileStats(lines=2, words=5, chars=len(TEXT), bytes=len(TEXT.encode()))
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5])
+    def test_chunk_boundaries(self, chunk_size: int) -> None:
+        """Counts do not depend on chunk size."""
+        data = TEXT.encode()
+        assert count(AsciiTokenizer, data, chunk_size) == count(AsciiTokenizer, data, len(data))
+
+    def test_empty_chunk_keeps_state(self) -> None:
+        """Empty chunk changes nothing."""
+        assert AsciiTokenizer().count(b"", in_word=True) == (0, 0, 0, True)
+
+
+class TestUnicodeTokenizer:
+    """Tests for pywc.tokenizer.UnicodeTokenizer."""
+
+    def test_unicode_whitespace(self) -> None:
+        """Non-breaking space splits words."""
+        result = count(UnicodeTokenizer, TEXT.encode(), 2**16)
+        assert result == FileStats(lines=2, words=6, chars=len(TEXT), bytes=len(TEXT.encode()))
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5])
+    @pytest.mark.parametrize("encoding", ["utf-8", "utf-16", "cp1251"])
+    def test_chunk_boundaries(self, chunk_size: int, encoding: str) -> None:
+        """Counts do not depend on chunk size, characters split between chunks are counted once."""
+        factory = partial(UnicodeTokenizer, encoding)
+        result = count(factory, TEXT.encode(encoding), chunk_size)
+        assert (result.lines, result.words, result.chars) == (2, 6, len(TEXT))
+
+    def test_copy_has_own_decoder(self) -> None:
+        """A copy continues a character split between chunks without changing the original."""
+        tokenizer = UnicodeTokenizer()
+        tokenizer.count(b"\xc3", in_word=False)
+        assert copy.copy(tokenizer).count(b"\xa9", in_word=False) == (0, 1, 1, True)
+        assert tokenizer.count(b"\xa9", in_word=False) == (0, 1, 1, True)
+
+
+class TestTokenizerFactory:
+    """Tests for pywc.tokenizer.tokenizer_factory."""
+
+    def test_default_is_ascii_for_utf8(self) -> None:
+        """Fast path is chosen for UTF-8."""
+        assert tokenizer_factory(None, "UTF8") is AsciiTokenizer
+
+    def test_default_is_unicode_for_other_encodings(self) -> None:
+        """Other encodings are decoded."""
+        factory = tokenizer_factory(None, "utf-16")
+        assert isinstance(factory(), UnicodeTokenizer)
+
+    @pytest.mark.parametrize(("engine", "encoding"), [("ascii", "utf-16"), ("regex", "utf-8"), (None, "no-such")])
+    def test_invalid_combinations(self, engine: str | None, encoding: str) -> None:
+        """Unknown engines and encodings, and ascii with non UTF-8 encoding are rejected."""
+        with pytest.raises(ValueError):
+            tokenizer_factory(engine, encoding)
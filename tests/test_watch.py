@@ -0,0 +1,166 @@
+"""Test cases for watching files with incremental totals."""
+
+import os
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+
+from pywc.data import FileStats
+from pywc.reader import ReadStrategy
+from pywc.tokenizer import UnicodeTokenizer
+from pywc.watch import Watcher
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@pytest.fixture
+def reader() -> MagicMock:
+    """Default read strategy, recording its calls."""
+    return MagicMock(wraps=ReadStrategy())
+
+
+class TestWatcher:
+    """Tests for pywc.watch.Watcher."""
+
+    def test_first_poll_counts_everything(self, tmp_path: Path, small_file: Path, small_file_stats: FileStats) -> None:
+        """First poll is a full pass over all files."""
+        watcher = Watcher([tmp_path])
+        updated, removed = watcher.poll()
+        assert updated == [(small_file, small_file_stats)]
+        assert removed == []
+        assert watcher.total == small_file_stats
+
+    def test_unchanged_files_are_not_recounted(self, tmp_path: Path, reader: MagicMock) -> None:
+        """Second poll without changes reads nothing."""
+        (tmp_path / "a.txt").write_text("a b c")
+        watcher = Watcher([tmp_path], reader=reader)
+        watcher.poll()
+        reader.chunks.reset_mock()
+
+        assert watcher.poll() == ([], [])
+        reader.chunks.assert_not_called()
+
+    def test_append_counts_only_tail(self, tmp_path: Path, reader: MagicMock) -> None:
+        """Appended data is read from the previous end, a word continued by the append is counted once."""
+        log = tmp_path / "app.log"
+        log.write_bytes(b"first line\nsecond")
+        watcher = Watcher([tmp_path], reader=reader)
+        watcher.poll()
+        reader.chunks.reset_mock()
+
+        with log.open("ab") as f:
+            f.write(b"_continued\nthird line\n")
+        updated, _ = watcher.poll()
+
+        reader.chunks.assert_called_once_with(log, offset=len(b"first line\nsecond"))
+        assert updated == [(log, FileStats.from_file(log))]
+        assert watcher.total == FileStats.from_file(log)
+
+    def test_rewritten_file_is_recounted(self, tmp_path: Path) -> None:
+        """Truncated or rewritten files are counted from the start."""
+        file = tmp_path / "a.txt"
+        file.write_text("one two three\n")
+        watcher = Watcher([tmp_path])
+        watcher.poll()
+
+        file.write_text("four\n")
+        watcher.poll()
+        assert watcher.total == FileStats.from_file(file)
+
+        file.write_text("five\n")
+        os.utime(file, ns=(0, 0))
+        watcher.poll()
+        assert watcher.total == FileStats.from_file(file)
+
+    def test_removed_and_new_files_update_total(self, tmp_path: Path, small_file: Path) -> None:
+        """Removed files are subtracted, new files are added."""
+        watcher = Watcher([tmp_path])
+        watcher.poll()
+
+        small_file.unlink()
+        new = tmp_path / "new.txt"
+        new.write_text("new file\n")
+        updated, removed = watcher.poll()
+
+        assert removed == [small_file]
+        assert updated == [(new, FileStats.from_file(new))]
+        assert watcher.total == FileStats.from_file(new)
+
+    def test_watch_yields_only_changes(self, tmp_path: Path) -> None:
+        """Polls without changes are not yielded, sleeping between polls."""
+        file = tmp_path / "a.txt"
+        file.write_text("a\n")
+        # first pause changes nothing, second one appends a line
+        sleep = MagicMock(side_effect=lambda _: sleep.call_count == 2 and file.write_text("a\nb\n"))  # noqa: PLR2004
+        watcher = Watcher([tmp_path])
+        polls = watcher.watch(1.0, sleep=sleep)
+
+        assert next(polls)[0] == [(file, FileStats.from_file(file))]
+        file_stats_before = watcher.total
+        assert next(polls)[0] == [(file, FileStats.from_file(file))]
+        assert sleep.call_count == 2  # noqa: PLR2004
+        assert watcher.total != file_stats_before
+
+    def test_longest_line_follows_shrunk_and_removed_files(self, tmp_path: Path) -> None:
+        """Longest line of the total is that of the files still watched, not an upper bound."""
+        long, short = tmp_path / "long.txt", tmp_path / "short.txt"
+        long.write_text("a very long line\n")
+        short.write_text("short\n")
+        watcher = Watcher([tmp_path], line_lengths=True)
+        watcher.poll()
+        assert watcher.total.max_line_length == len("a very long line")
+
+        long.write_text("long\nline\n")
+        watcher.poll()
+        assert watcher.total.max_line_length == len("short")
+
+        short.unlink()
+        watcher.poll()
+        assert watcher.total.max_line_length == len("long")
+
+    def test_unreadable_file_is_reported_and_skipped(self, tmp_path: Path, reader: MagicMock) -> None:
+        """A file that cannot be read does not stop polling, and is counted once it can be read."""
+        (tmp_path / "a.txt").write_text("a b c")
+        (tmp_path / "denied.txt").write_text("d e")
+
+        def deny(file: Path, **kwargs: int) -> object:
+            if file.name == "denied.txt":
+                raise PermissionError(13, "Permission denied", str(file))
+            return ReadStrategy().chunks(file, **kwargs)
+
+        reader.chunks.side_effect = deny
+        errors = MagicMock()
+        watcher = Watcher([tmp_path], reader=reader, on_error=errors)
+        updated, _ = watcher.poll()
+        assert [file.name for file, _ in updated] == ["a.txt"]
+        assert watcher.total == FileStats(lines=0, words=3, chars=5, bytes=5)
+        assert errors.call_args.args[0] == tmp_path / "denied.txt"
+
+        reader.chunks.side_effect = None
+        updated, _ = watcher.poll()
+        assert [file.name for file, _ in updated] == ["denied.txt"]
+        assert watcher.total == FileStats(lines=0, words=5, chars=8, bytes=8)
+
+    def test_failed_append_keeps_split_character(self, tmp_path: Path, reader: MagicMock) -> None:
+        """A read failing after the rest of a split character drops the file, which is then counted again."""
+        log = tmp_path / "app.log"
+        log.write_bytes(b"a \xc3")
+        watcher = Watcher([tmp_path], reader=reader, tokenizer=UnicodeTokenizer, on_error=MagicMock())
+        watcher.poll()
+
+        def fail(_file: Path, **_kwargs: int) -> Iterator[bytes]:
+            yield b"\xa9"
+            raise OSError(5, "Input/output error")
+
+        with log.open("ab") as f:
+            f.write(b"\xa9 b")
+        reader.chunks.side_effect = fail
+        assert watcher.poll() == ([], [log])
+        assert watcher.total == FileStats()
+
+        reader.chunks.side_effect = None
+        watcher.poll()
+        assert watcher.total == FileStats(lines=0, words=3, chars=5, bytes=6)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Throughput benchmarks for pywc internals.
+
+Usage:
+    uv run python utils/benchmark.py reader PATH [PATH ...]
+    uv run python utils/benchmark.py tokenizer PATH [PATH ...]
+    uv run python utils/benchmark.py parallel [--workers N] PATH [PATH ...]
+
+Behavior:
+    - Every suite reads files of the given PATHS with pywc traversal
+    - Results are printed as a table, one row per storage type and variant
+    - Page cache is not dropped between runs, so only O_DIRECT variants measure cold reads
+    - Threads only scale on free-threaded builds (python3.14t), the parallel suite reports whether the GIL is enabled
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import click
+
+from pywc.data import FileStats, StatsCounter
+from pywc.navigation import iter_files
+from pywc.parallel import gil_enabled, map_scheduled
+from pywc.reader import ReadStrategy
+from pywc.tokenizer import AsciiTokenizer, UnicodeTokenizer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from pywc.tokenizer import Tokenizer
+
+READ_STRATEGIES = {
+    "read, 64 KB": ReadStrategy(reuse_buffer=False),
+    "readinto, 64 KB": ReadStrategy(),
+    "readinto, auto": ReadStrategy(buffer_size=None),
+    "readinto, auto, fadvise": ReadStrategy(buffer_size=None, sequential=True),
+    "readinto, auto, O_DIRECT": ReadStrategy(buffer_size=None, direct=True),
+}
+
+TOKENIZERS = {
+    "ascii (table-driven)": AsciiTokenizer,
+    "unicode, utf-8": partial(UnicodeTokenizer, "utf-8"),
+}
+
+
+class ByteLoopTokenizer:
+    """Previous per-byte implementation, kept as a baseline."""
+
+    def count(self, chunk: bytes | memoryview, *, in_word: bool) -> tuple[int, int, int, bool]:
+        """Count the next chunk one byte at a time."""
+        lines = words = 0
+        for b in chunk:
+            if b == ord("\n"):
+                lines += 1
+            if chr(b).isspace():
+                in_word = False
+            elif not in_word:
+                words += 1
+                in_word = True
+        return lines, words, len(bytes(chunk).decode("utf-8", errors="ignore")), in_word
+
+
+def storage_type(path: Path) -> str:
+    """File system type and mount point of a path, from /proc/mounts where available."""
+    resolved = path.resolve()
+    best, fs_type = Path("/"), "unknown"
+    try:
+        mounts = Path("/proc/mounts").read_text().splitlines()
+    except OSError:
+        return fs_type
+    for line in mounts:
+        _, mount_point, mount_type, *_ = line.split()
+        mount = Path(mount_point.replace("\\040", " "))
+        if resolved.is_relative_to(mount) and len(mount.parts) >= len(best.parts):
+            best, fs_type = mount, mount_type
+    return f"{fs_type} ({best})"
+
+
+def measure(files: Iterable[Path], run: Callable[[Path], int], repeat: int) -> float:
+    """Best throughput of `run` over all files in MB/s, `run` returns number of bytes processed."""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        processed = sum(run(file) for file in files)
+        elapsed = time.perf_counter() - start
+        best = max(best, processed / 2**20 / elapsed if elapsed else 0.0)
+    return best
+
+
+def count_chunks(chunks: Iterable[bytes | memoryview], factory: Callable[[], Tokenizer]) -> int:
+    """Count chunks with a new tokenizer, returns number of bytes counted."""
+    counter = StatsCounter(tokenizer=factory())
+    for chunk in chunks:
+        counter.feed(chunk)
+    return counter.bytes
+
+
+def count_files(files: Iterable[Path], workers: int, executor: type[ThreadPoolExecutor | ProcessPoolExecutor]) -> int:
+    """Count files on a pool of workers, returns number of bytes counted."""
+    with executor(max_workers=workers) as pool:
+        return sum(stats.bytes for stats in pool.map(FileStats.from_file, files, chunksize=16))
+
+
+def count_scheduled(files: Iterable[Path], workers: int) -> int:
+    """Count files on a thread pool, largest first and small files in batches, returns number of bytes counted."""
+    scheduled = map_scheduled(FileStats.from_file, files, workers=workers, size=lambda file: file.stat().st_size)
+    return sum(stats.bytes for _, stats in scheduled)
+
+
+def print_table(rows: Iterable[tuple[str, str, float]]) -> None:
+    """Print benchmark rows of storage, variant and throughput."""
+    click.echo(f"{'storage':<30s} {'variant':<30s} {'MB/s':>10s}")
+    for storage, variant, throughput in rows:
+        click.echo(f"{storage:<30s} {variant:<30s} {throughput:10.1f}")
+
+
+@click.group()
+def cli() -> None:
+    """Throughput benchmarks for pywc internals."""
+
+
+@cli.command()
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.option("--repeat", default=3, show_default=True, help="Number of runs, the best one is reported")
+def reader(paths: Iterable[Path], repeat: int) -> None:
+    """Raw read throughput of read strategies, per storage type of PATHS."""
+    rows = []
+    for path in paths:
+        files = list(iter_files(path))
+        for name, strategy in READ_STRATEGIES.items():
+            throughput = measure(files, lambda f, s=strategy: sum(len(c) for c in s.chunks(f)), repeat)
+            rows.append((storage_type(path), name, throughput))
+    print_table(rows)
+
+
+@cli.command()
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.option("--repeat", default=3, show_default=True, help="Number of runs, the best one is reported")
+@click.option("--baseline/--no-baseline", default=True, show_default=True, help="Include per-byte loop baseline")
+def tokenizer(paths: Iterable[Path], repeat: int, *, baseline: bool) -> None:
+    """Counting throughput of tokenizer engines, with file contents already in memory."""
+    engines = {**TOKENIZERS, "per-byte loop (baseline)": ByteLoopTokenizer} if baseline else TOKENIZERS
+    rows = []
+    for path in paths:
+        contents = {file: list(ReadStrategy(reuse_buffer=False).chunks(file)) for file in iter_files(path)}
+        for name, factory in engines.items():
+            throughput = measure(contents, lambda f, c=contents, t=factory: count_chunks(c[f], t), repeat)
+            rows.append((storage_type(path), name, throughput))
+    print_table(rows)
+
+
+@cli.command()
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True, path_type=Path))
+@click.option("--repeat", default=3, show_default=True, help="Number of runs, the best one is reported")
+@click.option("--workers", default=os.cpu_count() or 1, show_default=True, help="Number of threads or processes")
+def parallel(paths: Iterable[Path], repeat: int, workers: int) -> None:
+    """Counting throughput of a serial loop, a thread pool and a process pool, with pool startup included."""
+    click.echo(f"GIL {'enabled' if gil_enabled() else 'disabled'}, {workers} workers")
+    variants: dict[str, Callable[[list[Path]], int]] = {
+        "serial": lambda files: sum(FileStats.from_file(file).bytes for file in files),
+        "threads": partial(count_files, workers=workers, executor=ThreadPoolExecutor),
+        "threads, size-aware": partial(count_scheduled, workers=workers),
+        "processes": partial(count_files, workers=workers, executor=ProcessPoolExecutor),
+    }
+    rows = []
+    for path in paths:
+        files = list(iter_files(path))
+        for name, run in variants.items():
+            throughput = measure([path], lambda _, f=files, r=run: r(f), repeat)
+            rows.append((storage_type(path), name, throughput))
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    cli()